@@ -0,0 +1,25 @@
+"""add source_row to stg_hired_employees
+
+Revision ID: 27047a234794
+Revises: bfd0ff46159b
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '27047a234794'
+down_revision: Union[str, None] = 'bfd0ff46159b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('stg_hired_employees', sa.Column('source_row', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('stg_hired_employees', 'source_row')
@@ -0,0 +1,60 @@
+"""create dim_date
+
+Revision ID: 3c1d9b7a52f4
+Revises: e696cd7730a0
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '3c1d9b7a52f4'
+down_revision: Union[str, None] = 'e696cd7730a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('dim_date',
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('quarter', sa.SmallInteger(), nullable=False),
+    sa.Column('month', sa.SmallInteger(), nullable=False),
+    sa.Column('day_of_month', sa.SmallInteger(), nullable=False),
+    sa.Column('day_of_week', sa.SmallInteger(), nullable=False),
+    sa.Column('iso_year', sa.Integer(), nullable=False),
+    sa.Column('iso_week', sa.SmallInteger(), nullable=False),
+    sa.Column('week_start', sa.Date(), nullable=False),
+    sa.PrimaryKeyConstraint('date')
+    )
+
+    # 2000 to 2035, widened to whole years around any hire already in the fact
+    op.execute("""
+        INSERT INTO dim_date (
+            date, year, quarter, month, day_of_month, day_of_week, iso_year, iso_week, week_start
+        )
+        SELECT
+            d::date,
+            EXTRACT(YEAR FROM d)::integer,
+            EXTRACT(QUARTER FROM d)::smallint,
+            EXTRACT(MONTH FROM d)::smallint,
+            EXTRACT(DAY FROM d)::smallint,
+            EXTRACT(ISODOW FROM d)::smallint,
+            EXTRACT(ISOYEAR FROM d)::integer,
+            EXTRACT(WEEK FROM d)::smallint,
+            date_trunc('week', d)::date
+        FROM (
+            SELECT
+                LEAST(date '2000-01-01', date_trunc('year', MIN(hire_datetime))) AS first,
+                GREATEST(date '2035-12-31', date_trunc('year', MAX(hire_datetime)) + interval '1 year - 1 day') AS last
+            FROM fact_hired_employees
+        ) bounds,
+        generate_series(bounds.first, bounds.last, interval '1 day') AS d
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('dim_date')
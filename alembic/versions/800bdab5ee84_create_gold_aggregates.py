@@ -0,0 +1,64 @@
+"""create gold aggregates
+
+Revision ID: 800bdab5ee84
+Revises: 27047a234794
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '800bdab5ee84'
+down_revision: Union[str, None] = '27047a234794'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('agg_hired_by_quarter',
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('id_department', sa.Integer(), nullable=False),
+    sa.Column('id_job', sa.Integer(), nullable=False),
+    sa.Column('q1', sa.Integer(), nullable=False),
+    sa.Column('q2', sa.Integer(), nullable=False),
+    sa.Column('q3', sa.Integer(), nullable=False),
+    sa.Column('q4', sa.Integer(), nullable=False),
+    sa.Column('refreshed_timestamp', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('year', 'id_department', 'id_job')
+    )
+    op.create_table('agg_department_hires',
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('id_department', sa.Integer(), nullable=False),
+    sa.Column('hired', sa.Integer(), nullable=False),
+    sa.Column('refreshed_timestamp', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('year', 'id_department')
+    )
+
+    # Backfill from the facts merged before the aggregates existed
+    op.execute("""
+        INSERT INTO agg_hired_by_quarter (year, id_department, id_job, q1, q2, q3, q4)
+        SELECT
+            EXTRACT(YEAR FROM hire_datetime)::integer,
+            id_department,
+            id_job,
+            COUNT(*) FILTER (WHERE EXTRACT(QUARTER FROM hire_datetime) = 1),
+            COUNT(*) FILTER (WHERE EXTRACT(QUARTER FROM hire_datetime) = 2),
+            COUNT(*) FILTER (WHERE EXTRACT(QUARTER FROM hire_datetime) = 3),
+            COUNT(*) FILTER (WHERE EXTRACT(QUARTER FROM hire_datetime) = 4)
+        FROM fact_hired_employees
+        GROUP BY 1, 2, 3
+    """)
+    op.execute("""
+        INSERT INTO agg_department_hires (year, id_department, hired)
+        SELECT year, id_department, SUM(q1 + q2 + q3 + q4)
+        FROM agg_hired_by_quarter
+        GROUP BY year, id_department
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('agg_department_hires')
+    op.drop_table('agg_hired_by_quarter')
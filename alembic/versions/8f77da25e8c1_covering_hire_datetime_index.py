@@ -0,0 +1,44 @@
+"""covering hire_datetime index
+
+Revision ID: 8f77da25e8c1
+Revises: 800bdab5ee84
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '8f77da25e8c1'
+down_revision: Union[str, None] = '800bdab5ee84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently so the fact table stays writable on large installs
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_fact_hired_employees_hire_datetime_tmp',
+            'fact_hired_employees',
+            ['hire_datetime'],
+            unique=False,
+            postgresql_include=['id_department', 'id_job'],
+            postgresql_concurrently=True
+        )
+        op.drop_index(
+            'ix_fact_hired_employees_hire_datetime',
+            table_name='fact_hired_employees',
+            postgresql_concurrently=True
+        )
+    op.execute(
+        "ALTER INDEX ix_fact_hired_employees_hire_datetime_tmp "
+        "RENAME TO ix_fact_hired_employees_hire_datetime"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_fact_hired_employees_hire_datetime', table_name='fact_hired_employees')
+    op.create_index('ix_fact_hired_employees_hire_datetime', 'fact_hired_employees', ['hire_datetime'], unique=False)
@@ -0,0 +1,95 @@
+"""partition fact_hired_employees by hire year
+
+Revision ID: a5e07c3f19d2
+Revises: 3c1d9b7a52f4
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'a5e07c3f19d2'
+down_revision: Union[str, None] = '3c1d9b7a52f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FACT_INDEXES = (
+    'fact_hired_employees_pkey',
+    'ix_fact_hired_employees_hire_datetime',
+    'ix_fact_hired_employees_id_department',
+    'ix_fact_hired_employees_id_job',
+)
+
+FACT_COLUMNS = "id_employee, name, hire_datetime, id_department, id_job, created_timestamp, updated_timestamp"
+
+
+def rename_fact(old: str, new: str) -> None:
+    """Rename the fact table and its indexes, freeing the names for its replacement."""
+    op.execute(f"ALTER TABLE {old} RENAME TO {new}")
+    for index in FACT_INDEXES:
+        op.execute(f"ALTER INDEX {index} RENAME TO {index.replace('fact_hired_employees', new)}")
+
+
+def create_fact(primary_key: Sequence[str], **kwargs) -> None:
+    op.create_table('fact_hired_employees',
+    sa.Column('id_employee', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('hire_datetime', sa.DateTime(), nullable=False),
+    sa.Column('id_department', sa.Integer(), nullable=False),
+    sa.Column('id_job', sa.Integer(), nullable=False),
+    sa.Column('created_timestamp', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_timestamp', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['id_department'], ['dim_departments.id_department'], name='fk_fact_hired_employees_department', ondelete='RESTRICT'),
+    sa.ForeignKeyConstraint(['id_job'], ['dim_jobs.id_job'], name='fk_fact_hired_employees_job', ondelete='RESTRICT'),
+    sa.PrimaryKeyConstraint(*primary_key, name='fact_hired_employees_pkey'),
+    **kwargs
+    )
+    op.create_index('ix_fact_hired_employees_hire_datetime', 'fact_hired_employees', ['hire_datetime'], unique=False, postgresql_include=['id_department', 'id_job'])
+    op.create_index('ix_fact_hired_employees_id_department', 'fact_hired_employees', ['id_department'], unique=False)
+    op.create_index('ix_fact_hired_employees_id_job', 'fact_hired_employees', ['id_job'], unique=False)
+
+
+def upgrade() -> None:
+    rename_fact('fact_hired_employees', 'fact_hired_employees_heap')
+    create_fact(['id_employee', 'hire_datetime'], postgresql_partition_by='RANGE (hire_datetime)')
+
+    # One partition per year between the first and last hire already loaded
+    op.execute("""
+        DO $$
+        DECLARE
+            year integer;
+        BEGIN
+            FOR year IN
+                SELECT generate_series(
+                    EXTRACT(YEAR FROM MIN(hire_datetime))::integer,
+                    EXTRACT(YEAR FROM MAX(hire_datetime))::integer
+                )
+                FROM fact_hired_employees_heap
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE fact_hired_employees_y%s PARTITION OF fact_hired_employees '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    year, make_date(year, 1, 1), make_date(year + 1, 1, 1)
+                );
+            END LOOP;
+        END $$
+    """)
+    op.execute(f"""
+        INSERT INTO fact_hired_employees ({FACT_COLUMNS})
+        SELECT {FACT_COLUMNS} FROM fact_hired_employees_heap
+        ORDER BY hire_datetime
+    """)
+    op.drop_table('fact_hired_employees_heap')
+
+
+def downgrade() -> None:
+    rename_fact('fact_hired_employees', 'fact_hired_employees_partitioned')
+    create_fact(['id_employee'])
+    op.execute(f"""
+        INSERT INTO fact_hired_employees ({FACT_COLUMNS})
+        SELECT {FACT_COLUMNS} FROM fact_hired_employees_partitioned
+    """)
+    op.drop_table('fact_hired_employees_partitioned')
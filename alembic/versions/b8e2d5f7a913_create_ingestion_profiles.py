@@ -0,0 +1,41 @@
+"""create ingestion_profiles
+
+Revision ID: b8e2d5f7a913
+Revises: f3b7c9d1a4e6
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = 'b8e2d5f7a913'
+down_revision: Union[str, None] = 'f3b7c9d1a4e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('ingestion_profiles',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('profiled_timestamp', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('table_name', sa.String(length=100), nullable=False),
+    sa.Column('source_file', sa.String(length=255), nullable=True),
+    sa.Column('rows_parsed', sa.Integer(), nullable=False),
+    sa.Column('rows_written', sa.Integer(), nullable=False),
+    sa.Column('rows_rejected', sa.Integer(), nullable=False),
+    sa.Column('min_hire_datetime', sa.DateTime(), nullable=True),
+    sa.Column('max_hire_datetime', sa.DateTime(), nullable=True),
+    sa.Column('columns', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('top_errors', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_ingestion_profiles_table_name'), 'ingestion_profiles', ['table_name'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_ingestion_profiles_table_name'), table_name='ingestion_profiles')
+    op.drop_table('ingestion_profiles')
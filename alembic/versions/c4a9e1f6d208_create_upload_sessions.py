@@ -0,0 +1,42 @@
+"""create upload_sessions
+
+Revision ID: c4a9e1f6d208
+Revises: b8e2d5f7a913
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = 'c4a9e1f6d208'
+down_revision: Union[str, None] = 'b8e2d5f7a913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('upload_sessions',
+    sa.Column('id', sa.String(length=32), nullable=False),
+    sa.Column('table_name', sa.String(length=100), nullable=False),
+    sa.Column('source_file', sa.String(length=255), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('total_bytes', sa.BigInteger(), nullable=True),
+    sa.Column('received_bytes', sa.BigInteger(), nullable=False),
+    sa.Column('rows_parsed', sa.Integer(), nullable=False),
+    sa.Column('rows_written', sa.Integer(), nullable=False),
+    sa.Column('rows_rejected', sa.Integer(), nullable=False),
+    sa.Column('pending', sa.LargeBinary(), nullable=False),
+    sa.Column('errors', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('profile_state', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('created_timestamp', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_timestamp', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('upload_sessions')
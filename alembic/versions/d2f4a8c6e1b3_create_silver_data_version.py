@@ -0,0 +1,31 @@
+"""create silver_data_version
+
+Revision ID: d2f4a8c6e1b3
+Revises: a5e07c3f19d2
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'd2f4a8c6e1b3'
+down_revision: Union[str, None] = 'a5e07c3f19d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('silver_data_version',
+    sa.Column('id', sa.SmallInteger(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('updated_timestamp', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO silver_data_version (id, version) VALUES (1, 0)")
+
+
+def downgrade() -> None:
+    op.drop_table('silver_data_version')
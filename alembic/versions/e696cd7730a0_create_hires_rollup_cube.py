@@ -0,0 +1,89 @@
+"""create hires rollup cube
+
+Revision ID: e696cd7730a0
+Revises: 8f77da25e8c1
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = 'e696cd7730a0'
+down_revision: Union[str, None] = '8f77da25e8c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('agg_hires_dept_job_period',
+    sa.Column('id_department', sa.Integer(), nullable=False),
+    sa.Column('id_job', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('quarter', sa.SmallInteger(), nullable=False),
+    sa.Column('month', sa.SmallInteger(), nullable=False),
+    sa.Column('hired', sa.Integer(), nullable=False),
+    sa.Column('refreshed_timestamp', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id_department', 'id_job', 'year', 'quarter', 'month')
+    )
+    op.create_index('ix_agg_hires_dept_job_period_year_month', 'agg_hires_dept_job_period', ['year', 'month'], unique=False)
+
+    # Backfill from the fact; the cube replaces the per-query aggregates
+    op.execute("""
+        INSERT INTO agg_hires_dept_job_period (id_department, id_job, year, quarter, month, hired)
+        SELECT
+            id_department,
+            id_job,
+            EXTRACT(YEAR FROM hire_datetime)::integer,
+            EXTRACT(QUARTER FROM hire_datetime)::smallint,
+            EXTRACT(MONTH FROM hire_datetime)::smallint,
+            COUNT(*)
+        FROM fact_hired_employees
+        GROUP BY 1, 2, 3, 4, 5
+    """)
+    op.drop_table('agg_department_hires')
+    op.drop_table('agg_hired_by_quarter')
+
+
+def downgrade() -> None:
+    op.create_table('agg_hired_by_quarter',
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('id_department', sa.Integer(), nullable=False),
+    sa.Column('id_job', sa.Integer(), nullable=False),
+    sa.Column('q1', sa.Integer(), nullable=False),
+    sa.Column('q2', sa.Integer(), nullable=False),
+    sa.Column('q3', sa.Integer(), nullable=False),
+    sa.Column('q4', sa.Integer(), nullable=False),
+    sa.Column('refreshed_timestamp', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('year', 'id_department', 'id_job')
+    )
+    op.create_table('agg_department_hires',
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('id_department', sa.Integer(), nullable=False),
+    sa.Column('hired', sa.Integer(), nullable=False),
+    sa.Column('refreshed_timestamp', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('year', 'id_department')
+    )
+    op.execute("""
+        INSERT INTO agg_hired_by_quarter (year, id_department, id_job, q1, q2, q3, q4)
+        SELECT
+            year,
+            id_department,
+            id_job,
+            COALESCE(SUM(hired) FILTER (WHERE quarter = 1), 0),
+            COALESCE(SUM(hired) FILTER (WHERE quarter = 2), 0),
+            COALESCE(SUM(hired) FILTER (WHERE quarter = 3), 0),
+            COALESCE(SUM(hired) FILTER (WHERE quarter = 4), 0)
+        FROM agg_hires_dept_job_period
+        GROUP BY year, id_department, id_job
+    """)
+    op.execute("""
+        INSERT INTO agg_department_hires (year, id_department, hired)
+        SELECT year, id_department, SUM(hired)
+        FROM agg_hires_dept_job_period
+        GROUP BY year, id_department
+    """)
+    op.drop_index('ix_agg_hires_dept_job_period_year_month', table_name='agg_hires_dept_job_period')
+    op.drop_table('agg_hires_dept_job_period')
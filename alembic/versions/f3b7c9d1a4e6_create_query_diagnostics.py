@@ -0,0 +1,37 @@
+"""create query_diagnostics
+
+Revision ID: f3b7c9d1a4e6
+Revises: d2f4a8c6e1b3
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = 'f3b7c9d1a4e6'
+down_revision: Union[str, None] = 'd2f4a8c6e1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('query_diagnostics',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('captured_timestamp', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('route', sa.String(length=200), nullable=True),
+    sa.Column('statement', sa.Text(), nullable=False),
+    sa.Column('parameters_shape', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('duration_ms', sa.Float(), nullable=False),
+    sa.Column('plan', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_query_diagnostics_captured_timestamp'), 'query_diagnostics', ['captured_timestamp'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_query_diagnostics_captured_timestamp'), table_name='query_diagnostics')
+    op.drop_table('query_diagnostics')
@@ -5,5 +5,6 @@ API package for data ingestion and transformation.
 from app.api.routes import router
 from app.api.models import (
     StgDepartments, StgJobs, StgHiredEmployees,
-    DimDepartments, DimJobs, FactHiredEmployees
+    DimDepartments, DimJobs, DimDate, FactHiredEmployees, SilverDataVersion,
+    AggHiresDeptJobPeriod, QueryDiagnostics
 ) 
\ No newline at end of file
@@ -8,32 +8,59 @@ Bronze Layer (Staging):
     - Minimal transformations
     - Original data types preserved
     - No relationships enforced
+    - Upload sessions checkpoint resumable chunked uploads
 
 Silver Layer:
     - Dimensions (dim_*): Clean, deduplicated reference data
     - Facts (fact_*): Clean, validated business events
     - Proper data types and relationships
     - Business rules enforced
+
+Gold Layer:
+    - Aggregates (agg_*): Rollup cube maintained by the fact merge
+    - Small enough to answer the gold endpoints without reading the fact
+
+Diagnostics:
+    - Execution plans of slow statements, written by the SQL profiling hook
+    - Profiles of bronze loads, computed while the rows are validated
 """
 
 # Bronze Layer (Staging Models)
 from app.api.models.bronze.stg_departments import StgDepartments
 from app.api.models.bronze.stg_jobs import StgJobs
 from app.api.models.bronze.stg_hired_employees import StgHiredEmployees
+from app.api.models.bronze.upload_session import UploadSession
 
 # Silver Layer (Dimensional Models)
 from app.api.models.silver.dim_departments import DimDepartments
 from app.api.models.silver.dim_jobs import DimJobs
+from app.api.models.silver.dim_date import DimDate
 from app.api.models.silver.fact_hired_employees import FactHiredEmployees
+from app.api.models.silver.silver_data_version import SilverDataVersion
+
+from app.api.models.gold.agg_hires_dept_job_period import AggHiresDeptJobPeriod
+
+from app.api.models.diagnostics.query_diagnostics import QueryDiagnostics
+from app.api.models.diagnostics.ingestion_profile import IngestionProfile
 
 __all__ = [
     # Bronze Layer - Staging Tables
     "StgDepartments",  # Raw department data
     "StgJobs",        # Raw job position data
     "StgHiredEmployees",  # Raw employee hiring events
+    "UploadSession",  # Resumable upload checkpoints
     
     # Silver Layer - Dimensional Model
     "DimDepartments",  # Department dimension
     "DimJobs",        # Job position dimension
-    "FactHiredEmployees"  # Employee hiring fact table
+    "DimDate",        # Calendar date dimension
+    "FactHiredEmployees",  # Employee hiring fact table
+    "SilverDataVersion",  # Committed merge counter
+    
+    # Gold Layer - Materialized Aggregates
+    "AggHiresDeptJobPeriod",  # Hires per department/job/month
+
+    # Diagnostics
+    "QueryDiagnostics",  # Plans of slow statements
+    "IngestionProfile"  # Profiles of bronze loads
 ]
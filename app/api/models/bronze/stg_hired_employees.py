@@ -5,7 +5,7 @@ This module defines the staging table for raw hired employee data from CSV.
 All fields except id are stored as strings in the bronze layer and are nullable.
 """
 
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Integer, String
 from app.core.database import base
 
 class StgHiredEmployees(base):
@@ -21,6 +21,8 @@ class StgHiredEmployees(base):
         datetime (str): Hire datetime as string from CSV (nullable)
         department_id (str): Department id reference from CSV (nullable)
         job_id (str): Job id reference from CSV (nullable)
+        source_row (int): Row number of the record in the uploaded file (nullable),
+            used to resolve duplicate employee ids before the silver merge
     
     Table name: stg_hired_employees
     """
@@ -33,6 +35,9 @@ class StgHiredEmployees(base):
     department_id = Column(String, nullable=True)
     job_id = Column(String, nullable=True)
     
+    # Load metadata
+    source_row = Column(Integer, nullable=True)
+    
     def __repr__(self):
         """Staging hired employee record repr."""
         return f"<{self.__tablename__}(id={self.id}, name={self.name})>" 
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+Upload session table (bronze layer).
+
+This module defines the table tracking resumable chunked uploads: how far
+each upload has been received, parsed and loaded, so an interrupted upload
+continues from its last committed chunk.
+"""
+
+from sqlalchemy import Column, BigInteger, Integer, LargeBinary, String, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from app.core.database import base
+
+class UploadSession(base):
+    """
+    Resumable upload session.
+
+    Every committed chunk advances the checkpoint (received_bytes, rows_parsed,
+    pending) in the same transaction as the rows it loaded into the session's
+    own copy of the staging table, which finalize swaps into staging.
+
+    Attributes:
+        id (str): Session id (Primary Key)
+        table_name (str): Staging table the upload replaces
+        source_file (str): Name of the uploaded file
+        status (str): "open" while chunks are accepted, then "finalized"
+        total_bytes (int): File size announced by the client (nullable)
+        received_bytes (int): Byte offset up to which the file has been committed
+        rows_parsed (int): Number of the last CSV row parsed
+        rows_written (int): Rows loaded into the session table
+        rows_rejected (int): Rows that failed validation
+        pending (bytes): Received bytes after the last complete record, parsed with the next chunk
+        errors (list): Validation errors, up to the first 1000
+        profile_state (dict): Checkpoint of the ingestion profiler
+        created_timestamp (datetime): When the session was created
+        updated_timestamp (datetime): When the last chunk was committed
+
+    Table name: upload_sessions
+    """
+    __tablename__ = "upload_sessions"
+
+    id = Column(String(32), primary_key=True)
+    table_name = Column(String(100), nullable=False)
+    source_file = Column(String(255), nullable=True)
+    status = Column(String(20), nullable=False, default="open")
+    total_bytes = Column(BigInteger, nullable=True)
+    received_bytes = Column(BigInteger, nullable=False, default=0)
+    rows_parsed = Column(Integer, nullable=False, default=0)
+    rows_written = Column(Integer, nullable=False, default=0)
+    rows_rejected = Column(Integer, nullable=False, default=0)
+    pending = Column(LargeBinary, nullable=False, default=b"")
+    errors = Column(JSONB, nullable=False, default=list)
+    profile_state = Column(JSONB, nullable=False)
+    created_timestamp = Column(DateTime, nullable=False, server_default=func.now())
+    updated_timestamp = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        """Upload session repr."""
+        return f"<{self.__tablename__}(id={self.id}, table_name={self.table_name}, received_bytes={self.received_bytes})>"
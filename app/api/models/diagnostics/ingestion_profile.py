@@ -0,0 +1,50 @@
+"""
+Ingestion profile model.
+
+This module defines the table storing the profile of each bronze load,
+computed while the upload validates its rows (app.api.services.ingestion_profile),
+using SQLAlchemy ORM.
+"""
+
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from app.core.database import base
+
+class IngestionProfile(base):
+    """
+    Profile of a bronze load.
+
+    Attributes:
+        id (int): Primary key
+        profiled_timestamp (datetime): When the load finished
+        table_name (str): Staging table loaded
+        source_file (str): Name of the uploaded file
+        rows_parsed (int): CSV rows read
+        rows_written (int): Rows written to the staging table
+        rows_rejected (int): Rows that failed validation
+        min_hire_datetime (datetime): Earliest valid hire datetime (hired employees only)
+        max_hire_datetime (datetime): Latest valid hire datetime (hired employees only)
+        columns (dict): Column -> nulls (field missing), empty (field blank) and
+            approx_distinct (HyperLogLog estimate of the distinct non-blank values)
+        top_errors (list): Most frequent rejection reasons, with their row counts
+
+    Table name: ingestion_profiles
+    """
+    __tablename__ = "ingestion_profiles"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    profiled_timestamp = Column(DateTime, nullable=False, server_default=func.now())
+    table_name = Column(String(100), nullable=False, index=True)
+    source_file = Column(String(255), nullable=True)
+    rows_parsed = Column(Integer, nullable=False)
+    rows_written = Column(Integer, nullable=False)
+    rows_rejected = Column(Integer, nullable=False)
+    min_hire_datetime = Column(DateTime, nullable=True)
+    max_hire_datetime = Column(DateTime, nullable=True)
+    columns = Column(JSONB, nullable=False)
+    top_errors = Column(JSONB, nullable=False)
+
+    def __repr__(self):
+        """Ingestion profile repr."""
+        return f"<{self.__tablename__}(id={self.id}, table_name={self.table_name}, rows_parsed={self.rows_parsed})>"
@@ -0,0 +1,45 @@
+"""
+Query diagnostics model.
+
+This module defines the table storing execution plans of slow statements,
+captured by the SQL profiling hook (app.core.profiling), using SQLAlchemy ORM.
+"""
+
+from sqlalchemy import Column, BigInteger, Float, String, Text, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from app.core.database import base
+
+class QueryDiagnostics(base):
+    """
+    Execution plan of a slow statement.
+
+    Written when settings.slow_query_explain is enabled and a gold or merge
+    statement runs longer than settings.slow_query_threshold_ms. The plan is
+    the JSON output of EXPLAIN (ANALYZE, BUFFERS) of the statement, run again
+    with the same parameters and rolled back.
+
+    Attributes:
+        id (int): Primary key
+        captured_timestamp (datetime): When the plan was captured
+        route (str): Route template of the request that ran the statement
+        statement (str): SQL text as sent to the database
+        parameters_shape (dict): Parameter names and types, never their values
+        duration_ms (float): Duration of the original execution
+        plan (dict): EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) output
+
+    Table name: query_diagnostics
+    """
+    __tablename__ = "query_diagnostics"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    captured_timestamp = Column(DateTime, nullable=False, server_default=func.now(), index=True)
+    route = Column(String(200), nullable=True)
+    statement = Column(Text, nullable=False)
+    parameters_shape = Column(JSONB, nullable=True)
+    duration_ms = Column(Float, nullable=False)
+    plan = Column(JSONB, nullable=False)
+
+    def __repr__(self):
+        """Query diagnostics repr."""
+        return f"<{self.__tablename__}(id={self.id}, route={self.route}, duration_ms={self.duration_ms})>"
@@ -0,0 +1,56 @@
+"""
+Hires rollup cube (gold layer).
+
+This module defines the department x job x month rollup behind the gold
+metrics. Rows are maintained incrementally by the fact_hired_employees merge.
+"""
+
+from sqlalchemy import Column, Integer, SmallInteger, DateTime, Index
+from sqlalchemy.sql import func
+from app.core.database import base
+
+class AggHiresDeptJobPeriod(base):
+    """
+    Hires rollup cube.
+
+    Number of employees hired per department, job and calendar month. Quarters
+    and years are rolled up from the months at query time. The fact merge
+    applies count deltas (+1 for the new value of every merged row, -1 for the
+    previous value of every updated row) and removes keys that drop to zero.
+
+    Attributes:
+        id_department (int): Department key (Primary Key)
+        id_job (int): Job key (Primary Key)
+        year (int): Hire year (Primary Key)
+        quarter (int): Hire quarter, 1 to 4 (Primary Key)
+        month (int): Hire month, 1 to 12 (Primary Key)
+        hired (int): Number of hires
+        refreshed_timestamp (datetime): Timestamp when the row was last changed
+
+    Table name: agg_hires_dept_job_period
+    """
+    __tablename__ = "agg_hires_dept_job_period"
+
+    # Rollup key
+    id_department = Column(Integer, primary_key=True)
+    id_job = Column(Integer, primary_key=True)
+    year = Column(Integer, primary_key=True)
+    quarter = Column(SmallInteger, primary_key=True)
+    month = Column(SmallInteger, primary_key=True)
+
+    # Measures
+    hired = Column(Integer, nullable=False, default=0)
+
+    refreshed_timestamp = Column(DateTime, nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        # Time-sliced reads filter on (year, month) across every department and job
+        Index('ix_agg_hires_dept_job_period_year_month', 'year', 'month'),
+    )
+
+    def __repr__(self):
+        """Hires rollup cube repr."""
+        return (
+            f"<{self.__tablename__}(department_id={self.id_department}, job_id={self.id_job}, "
+            f"year={self.year}, month={self.month}, hired={self.hired})>"
+        )
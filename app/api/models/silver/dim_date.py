@@ -0,0 +1,52 @@
+"""
+Calendar date dimension model.
+
+This module defines the Date dimension model using SQLAlchemy ORM.
+Part of the silver layer in the medallion architecture.
+"""
+
+from sqlalchemy import Column, Integer, SmallInteger, Date
+from app.core.database import base
+
+class DimDate(base):
+    """
+    Calendar date dimension.
+
+    One precomputed row per calendar day, so time grouping joins on the date
+    instead of extracting calendar parts from every fact row, and series can
+    be filled with days that have no hires. Rows are generated, never loaded:
+    the migration covers a default range and the fact merge extends it to
+    whole years around the merged hire dates.
+
+    Attributes:
+        date (date): Calendar day (Primary Key)
+        year (int): Calendar year
+        quarter (int): Calendar quarter, 1 to 4
+        month (int): Calendar month, 1 to 12
+        day_of_month (int): Day of the month, 1 to 31
+        day_of_week (int): ISO day of the week, 1 (Monday) to 7 (Sunday)
+        iso_year (int): ISO 8601 week-numbering year
+        iso_week (int): ISO 8601 week number, 1 to 53
+        week_start (date): Monday of the ISO week
+
+    Table name: dim_date
+    """
+    __tablename__ = "dim_date"
+
+    date = Column(Date, primary_key=True)
+
+    # Calendar attributes
+    year = Column(Integer, nullable=False)
+    quarter = Column(SmallInteger, nullable=False)
+    month = Column(SmallInteger, nullable=False)
+    day_of_month = Column(SmallInteger, nullable=False)
+    day_of_week = Column(SmallInteger, nullable=False)
+
+    # ISO week attributes
+    iso_year = Column(Integer, nullable=False)
+    iso_week = Column(SmallInteger, nullable=False)
+    week_start = Column(Date, nullable=False)
+
+    def __repr__(self):
+        """Date dimension repr."""
+        return f"<{self.__tablename__}(date={self.date}, iso_week={self.iso_year}-W{self.iso_week:02d})>"
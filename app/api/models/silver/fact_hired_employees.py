@@ -17,9 +17,9 @@ class FactHiredEmployees(base):
     Contains metrics and references to dimension tables.
     
     Attributes:
-        id_employee (int): The primary key of the employee
+        id_employee (int): Employee id (Primary Key)
         name (str): Name of the employee (max 100 characters)
-        hire_datetime (DateTime): Date and time when the employee was hired
+        hire_datetime (DateTime): Date and time when the employee was hired (Primary Key, partition key)
         id_department (int): Foreign key to dim_departments (protected from deletion)
         id_job (int): Foreign key to dim_jobs (protected from deletion)
         created_timestamp (datetime): Timestamp when the record was created
@@ -28,17 +28,23 @@ class FactHiredEmployees(base):
     Foreign Key Behavior:
         - department_id: RESTRICT - Prevents deletion of departments with employees
         - job_id: RESTRICT - Prevents deletion of jobs with employees
+
+    Partitioning:
+        RANGE partitioned on hire_datetime, one partition per hire year
+        (fact_hired_employees_y<year>, see app.api.services.fact_partitions).
+        PostgreSQL requires the partition key in the primary key; the merge
+        keeps a single row per employee id.
     
     Table name: fact_hired_employees
     """
     __tablename__ = "fact_hired_employees"
     
-    # Primary key
-    id_employee = Column(Integer, primary_key=True)
+    # Primary key (with hire_datetime, the partition key)
+    id_employee = Column(Integer, primary_key=True, autoincrement=False)
     
     # Attributes
     name = Column(String(100), nullable=False)
-    hire_datetime = Column(DateTime, nullable=False)
+    hire_datetime = Column(DateTime, primary_key=True)
     
     # Foreign keys to dimensions with delete protection
     id_department = Column(
@@ -68,7 +74,13 @@ class FactHiredEmployees(base):
     
     # Create indexes for common queries
     __table_args__ = (
-        Index('ix_fact_hired_employees_hire_datetime', 'hire_datetime'),
+        # Covering index: date-range aggregations by department/job are index-only scans
+        Index(
+            'ix_fact_hired_employees_hire_datetime',
+            'hire_datetime',
+            postgresql_include=['id_department', 'id_job']
+        ),
+        {'postgresql_partition_by': 'RANGE (hire_datetime)'},
     )
     
     def __repr__(self):
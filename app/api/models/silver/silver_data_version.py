@@ -0,0 +1,36 @@
+"""
+Silver data version model.
+
+This module defines the single-row table recording how many merges have been
+committed to the silver layer, using SQLAlchemy ORM.
+"""
+
+from sqlalchemy import Column, BigInteger, SmallInteger, DateTime
+from sqlalchemy.sql import func
+from app.core.database import base
+
+class SilverDataVersion(base):
+    """
+    Committed silver data version.
+
+    Every silver merge increments version in its own transaction, so the row
+    reaches a streaming replica in the same WAL position as the merged data.
+    Comparing the replica's version with the primary's tells whether the
+    replica has replayed the last merge yet.
+
+    Attributes:
+        id (int): Always 1 (Primary Key)
+        version (int): Number of silver merges committed
+        updated_timestamp (datetime): Commit time of the last merge
+
+    Table name: silver_data_version
+    """
+    __tablename__ = "silver_data_version"
+
+    id = Column(SmallInteger, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_timestamp = Column(DateTime, nullable=False, server_default=func.now())
+
+    def __repr__(self):
+        """Silver data version repr."""
+        return f"<{self.__tablename__}(version={self.version})>"
@@ -8,10 +8,14 @@ from fastapi import APIRouter
 from .upload.departments_csv import router as departments_upload_router
 from .upload.jobs_csv import router as jobs_upload_router
 from .upload.hired_employees_csv import router as hired_employees_upload_router
+from .upload.hired_employees_sessions import router as hired_employees_sessions_router
+from .profiles import router as profiles_router
 
 router = APIRouter()
 
 # Include the routers for the bronze layer operations
 router.include_router(departments_upload_router)
 router.include_router(jobs_upload_router)
-router.include_router(hired_employees_upload_router) 
\ No newline at end of file
+router.include_router(hired_employees_upload_router)
+router.include_router(hired_employees_sessions_router)
+router.include_router(profiles_router) 
\ No newline at end of file
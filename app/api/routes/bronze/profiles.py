@@ -0,0 +1,90 @@
+"""
+Bronze ingestion profile routes.
+
+This module exposes the profiles computed by the bronze uploads while they
+validate their rows (null and empty counts, approximate distinct counts,
+hire datetime range and top error reasons), one per load.
+"""
+
+from enum import Enum
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_read_db
+from app.api.models.diagnostics.ingestion_profile import IngestionProfile
+
+router = APIRouter(
+    prefix="/profiles",
+    tags=["bronze-layer"],
+)
+
+class StagingTable(str, Enum):
+    stg_departments = "stg_departments"
+    stg_jobs = "stg_jobs"
+    stg_hired_employees = "stg_hired_employees"
+
+def profile_to_dict(profile: IngestionProfile) -> Dict[str, Any]:
+    """Render a stored profile as a JSON-ready dict."""
+    return {
+        "id": profile.id,
+        "table": profile.table_name,
+        "source_file": profile.source_file,
+        "profiled_timestamp": profile.profiled_timestamp.isoformat(),
+        "rows_parsed": profile.rows_parsed,
+        "rows_written": profile.rows_written,
+        "rows_rejected": profile.rows_rejected,
+        "min_hire_datetime": profile.min_hire_datetime.isoformat() if profile.min_hire_datetime else None,
+        "max_hire_datetime": profile.max_hire_datetime.isoformat() if profile.max_hire_datetime else None,
+        "columns": profile.columns,
+        "top_errors": profile.top_errors,
+    }
+
+@router.get("/", response_model=List[dict])
+def list_profiles(
+    table: Optional[StagingTable] = Query(None, description="Only the loads of this staging table"),
+    limit: int = Query(20, ge=1, le=500, description="Most recent profiles returned"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Profiles of the most recent bronze loads, newest first.
+
+    Args:
+        table: Optional staging table filter
+        limit: Number of profiles returned
+        db: Database session
+
+    Returns:
+        List[dict]: Profiles, see latest_profile
+    """
+    query = db.query(IngestionProfile)
+    if table is not None:
+        query = query.filter(IngestionProfile.table_name == table.value)
+    return [profile_to_dict(profile) for profile in query.order_by(IngestionProfile.id.desc()).limit(limit)]
+
+@router.get("/{table}/latest", response_model=dict)
+def latest_profile(table: StagingTable, db: Session = Depends(get_read_db)):
+    """
+    Profile of the last load of a staging table.
+
+    Args:
+        table: Staging table
+        db: Database session
+
+    Returns:
+        dict: Row counts (parsed, written, rejected), the hire datetime range
+            (hired employees only), per column nulls (field missing), empty
+            (field blank) and approx_distinct, and the top error reasons
+
+    Raises:
+        HTTPException: 404 if the table was never loaded
+    """
+    profile = (
+        db.query(IngestionProfile)
+        .filter(IngestionProfile.table_name == table.value)
+        .order_by(IngestionProfile.id.desc())
+        .first()
+    )
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"No load of {table.value} has been profiled")
+    return profile_to_dict(profile)
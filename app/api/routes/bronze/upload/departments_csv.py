@@ -5,14 +5,17 @@ This module defines the bulk upload endpoint for departments data.
 """
 
 from typing import List, Dict
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query, status
 from sqlalchemy.orm import Session
 import csv
 import io
 from sqlalchemy import text
 from fastapi.responses import JSONResponse
 
-from app.core.database import get_db
+from app.core.table_locks import upload_session
+from app.core.metrics import record_bronze_rows
+from app.core.timing import StageTimer
+from app.api.services.ingestion_profile import LoadProfiler
 from app.api.models.bronze.stg_departments import StgDepartments
 from app.api.schemas.staging import StgDepartmentsCreate, BatchUploadResponse
 
@@ -23,14 +26,21 @@ router = APIRouter(
         201: {"description": "Created"},
         204: {"description": "No data found in file."},
         400: {"description": "Bad Request"},
+        409: {"description": "Staging table locked by another upload or merge"},
         500: {"description": "Internal Server Error"}
     },
 )
 
-@router.post("/", status_code=status.HTTP_201_CREATED, response_model=BatchUploadResponse)
+@router.post(
+    "/",
+    status_code=status.HTTP_201_CREATED,
+    response_model=BatchUploadResponse,
+    response_model_exclude_none=True
+)
 async def upload_departments(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    timings: bool = Query(False, description="Include per-stage timings in the response"),
+    db: Session = Depends(upload_session("stg_departments"))
 ):
     """
     Upload departments data from CSV file in batches.
@@ -38,6 +48,7 @@ async def upload_departments(
     
     Args:
         file: CSV file with departments data
+        timings: Whether to add the per-stage timings to the response
         db: Database session
     
     Returns:
@@ -52,18 +63,23 @@ async def upload_departments(
             detail="Only CSV files are allowed"
         )
     
+    timer = StageTimer("bronze_upload", table="stg_departments")
     try:
         # Get current count
-        result = db.execute(text("SELECT COUNT(*) FROM stg_departments")).scalar()
+        with timer.stage("count"):
+            result = db.execute(text("SELECT COUNT(*) FROM stg_departments")).scalar()
         rows_before = result if result is not None else 0
         
         # Truncate the table before loading new data
-        db.execute(text("TRUNCATE TABLE stg_departments"))
-        db.commit()
+        with timer.stage("truncate"):
+            db.execute(text("TRUNCATE TABLE stg_departments"))
+            db.commit()
         
-        content = await file.read()
-        csv_data = io.StringIO(content.decode())
-        reader = csv.reader(csv_data)
+        with timer.stage("read"):
+            content = await file.read()
+        with timer.stage("decode"):
+            csv_data = io.StringIO(content.decode())
+        reader = timer.iterate("parse", csv.reader(csv_data))
         
         batch_size = 1000
         current_batch: List[dict] = []
@@ -72,28 +88,32 @@ async def upload_departments(
         error_rows = []
         progress_messages = []
         row_count = 0
+        profiler = LoadProfiler("stg_departments", ["id", "department"])
         
         for row_num, row in enumerate(reader, 1):
             row_count += 1
             try:
-                if len(row) != 2:  # id, department
-                    error_rows.append({
-                        "row": row_num,
-                        "data": row,
-                        "error": "Invalid number of columns"
-                    })
-                    continue
-                
-                department_data = {
-                    "id": str(row[0]),
-                    "department": row[1]
-                }
+                with timer.stage("validate"):
+                    if len(row) != 2:  # id, department
+                        error_rows.append({
+                            "row": row_num,
+                            "data": row,
+                            "error": "Invalid number of columns"
+                        })
+                        profiler.observe(row, error=error_rows[-1])
+                        continue
+                    
+                    department_data = {
+                        "id": str(row[0]),
+                        "department": row[1]
+                    }
+                    profiler.observe(row, department_data)
                 
                 current_batch.append(department_data)
                 
                 # Process batch when it reaches the size limit
                 if len(current_batch) >= batch_size:
-                    await process_department_batch(current_batch, db)
+                    await process_department_batch(current_batch, db, timer)
                     total_processed += len(current_batch)
                     total_batches += 1
                     progress_messages.append(f"Processed {total_processed} rows")
@@ -108,10 +128,14 @@ async def upload_departments(
         
         # Process remaining records
         if current_batch:
-            await process_department_batch(current_batch, db)
+            await process_department_batch(current_batch, db, timer)
             total_processed += len(current_batch)
             total_batches += 1
             progress_messages.append(f"Processed {total_processed} rows (final batch)")
+        with timer.stage("profile"):
+            profiler.save(db, file.filename, total_processed)
+        record_bronze_rows("stg_departments", parsed=row_count, written=total_processed, rejected=len(error_rows))
+        timer.log(parsed=row_count, written=total_processed, rejected=len(error_rows))
         
         # New logic for status codes
         if row_count == 0:
@@ -132,7 +156,8 @@ async def upload_departments(
                 status_code=400,
                 content={
                     "message": "No valid data processed. All rows invalid.",
-                    "errors": error_rows
+                    "errors": error_rows,
+                    **({"timings": timer.report()} if timings else {})
                 }
             )
         return BatchUploadResponse(
@@ -140,7 +165,8 @@ async def upload_departments(
             total_processed=total_processed,
             total_batches=total_batches,
             progress=progress_messages,
-            errors=error_rows
+            errors=error_rows,
+            timings=timer.report() if timings else None
         )
         
     except Exception as e:
@@ -152,7 +178,8 @@ async def upload_departments(
 
 async def process_department_batch(
     batch_data: List[dict],
-    db: Session
+    db: Session,
+    timer: StageTimer
 ) -> None:
     """
     Process a batch of department records.
@@ -160,24 +187,27 @@ async def process_department_batch(
     Args:
         batch_data: List of department dictionaries
         db: Database session
+        timer: Timer of the upload, the batch adds to its write and commit stages
     """
     try:
-        for dept_data in batch_data:
-            # Check if department already exists
-            existing = db.query(StgDepartments).filter(
-                StgDepartments.id == dept_data["id"]
-            ).first()
+        with timer.stage("write"):
+            for dept_data in batch_data:
+                # Check if department already exists
+                existing = db.query(StgDepartments).filter(
+                    StgDepartments.id == dept_data["id"]
+                ).first()
             
-            if existing:
-                # Update existing record
-                for key, value in dept_data.items():
-                    setattr(existing, key, value)
-            else:
-                # Create new record
-                db_department = StgDepartments(**dept_data)
-                db.add(db_department)
-        
-        db.commit()
+                if existing:
+                    # Update existing record
+                    for key, value in dept_data.items():
+                        setattr(existing, key, value)
+                else:
+                    # Create new record
+                    db_department = StgDepartments(**dept_data)
+                    db.add(db_department)
+            db.flush()
+        with timer.stage("commit"):
+            db.commit()
     except Exception as e:
         db.rollback()
         raise e # Rollback in case of error
\ No newline at end of file
@@ -5,7 +5,7 @@ This module defines the bulk upload endpoint for hired employees data.
 """
 
 from typing import List, Dict, Optional, Tuple
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query, status
 from sqlalchemy.orm import Session
 import csv
 import io
@@ -13,7 +13,10 @@ from datetime import datetime
 from sqlalchemy import text
 from fastapi.responses import JSONResponse
 
-from app.core.database import get_db
+from app.core.table_locks import upload_session
+from app.core.metrics import record_bronze_rows
+from app.core.timing import StageTimer
+from app.api.services.ingestion_profile import LoadProfiler
 from app.api.models.bronze.stg_hired_employees import StgHiredEmployees
 
 router = APIRouter(
@@ -23,6 +26,7 @@ router = APIRouter(
         201: {"description": "Created"},
         204: {"description": "No data found in file."},
         400: {"description": "Bad Request"},
+        409: {"description": "Staging table locked by another upload or merge"},
         500: {"description": "Internal Server Error"}
     },
 )
@@ -103,21 +107,27 @@ def validate_row(row: List[str], row_num: int) -> Tuple[Optional[Dict], Optional
 @router.post("/", status_code=status.HTTP_201_CREATED)
 async def upload_hired_employees(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    timings: bool = Query(False, description="Include per-stage timings in the response"),
+    db: Session = Depends(upload_session("stg_hired_employees"))
 ):
     if not file.filename.endswith('.csv'):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Only CSV files are allowed"
         )
+    timer = StageTimer("bronze_upload", table="stg_hired_employees")
     try:
-        result = db.execute(text("SELECT COUNT(*) FROM stg_hired_employees")).scalar()
+        with timer.stage("count"):
+            result = db.execute(text("SELECT COUNT(*) FROM stg_hired_employees")).scalar()
         rows_before = result if result is not None else 0
-        db.execute(text("TRUNCATE TABLE stg_hired_employees"))
-        db.commit()
-        content = await file.read()
-        csv_data = io.StringIO(content.decode())
-        reader = csv.reader(csv_data)
+        with timer.stage("truncate"):
+            db.execute(text("TRUNCATE TABLE stg_hired_employees"))
+            db.commit()
+        with timer.stage("read"):
+            content = await file.read()
+        with timer.stage("decode"):
+            csv_data = io.StringIO(content.decode())
+        reader = timer.iterate("parse", csv.reader(csv_data))
         batch_size = 1000
         current_batch = []
         total_processed = 0
@@ -125,24 +135,34 @@ async def upload_hired_employees(
         error_rows = []
         progress_messages = []
         row_count = 0
+        profiler = LoadProfiler(
+            "stg_hired_employees", ["id", "name", "datetime", "department_id", "job_id"], datetime_column="datetime"
+        )
         for row_num, row in enumerate(reader, 1):
             row_count += 1
-            data, error = validate_row(row, row_num)
+            with timer.stage("validate"):
+                data, error = validate_row(row, row_num)
+                profiler.observe(row, data, error)
             if error:
                 error_rows.append(error)
                 continue
+            data["source_row"] = row_num
             current_batch.append(data)
             if len(current_batch) >= batch_size:
-                await process_employee_batch(current_batch, db)
+                await process_employee_batch(current_batch, db, timer)
                 total_processed += len(current_batch)
                 total_batches += 1
                 progress_messages.append(f"Processed {total_processed} rows")
                 current_batch = []
         if current_batch:
-            await process_employee_batch(current_batch, db)
+            await process_employee_batch(current_batch, db, timer)
             total_processed += len(current_batch)
             total_batches += 1
             progress_messages.append(f"Processed {total_processed} rows (final batch)")
+        with timer.stage("profile"):
+            profiler.save(db, file.filename, total_processed)
+        record_bronze_rows("stg_hired_employees", parsed=row_count, written=total_processed, rejected=len(error_rows))
+        timer.log(parsed=row_count, written=total_processed, rejected=len(error_rows))
         # New logic for status codes
         if row_count == 0:
             return JSONResponse(
@@ -160,7 +180,8 @@ async def upload_hired_employees(
                 status_code=400,
                 content={
                     "message": "No valid data processed. All rows invalid.",
-                    "errors": error_rows
+                    "errors": error_rows,
+                    **({"timings": timer.report()} if timings else {})
                 }
             )
         return {
@@ -168,7 +189,8 @@ async def upload_hired_employees(
             "total_processed": total_processed,
             "total_batches": total_batches,
             "progress": progress_messages,
-            "errors": error_rows
+            "errors": error_rows,
+            **({"timings": timer.report()} if timings else {})
         }
     except Exception as e:
         db.rollback()
@@ -179,32 +201,41 @@ async def upload_hired_employees(
 
 async def process_employee_batch(
     batch_data: List[dict],
-    db: Session
+    db: Session,
+    timer: StageTimer
 ) -> None:
     """
     Process a batch of hired employee records.
-    
+
+    stg_hired_employees holds one row per id, so an id repeated in the file
+    keeps its last row: earlier batches are committed and found by the
+    lookup, and repeats within the batch are collapsed before it.
+
     Args:
         batch_data: List of employee dictionaries
         db: Database session
+        timer: Timer of the upload, the batch adds to its write and commit stages
     """
     try:
-        for employee_data in batch_data:
-            # Check if employee already exists
-            existing = db.query(StgHiredEmployees).filter(
-                StgHiredEmployees.id == employee_data["id"]
-            ).first()
+        with timer.stage("write"):
+            latest = {employee_data["id"]: employee_data for employee_data in batch_data}
+            for employee_data in latest.values():
+                # Check if employee already exists
+                existing = db.query(StgHiredEmployees).filter(
+                    StgHiredEmployees.id == employee_data["id"]
+                ).first()
             
-            if existing:
-                # Update existing record
-                for key, value in employee_data.items():
-                    setattr(existing, key, value)
-            else:
-                # Create new record
-                db_employee = StgHiredEmployees(**employee_data)
-                db.add(db_employee)
-        
-        db.commit()
+                if existing:
+                    # Update existing record
+                    for key, value in employee_data.items():
+                        setattr(existing, key, value)
+                else:
+                    # Create new record
+                    db_employee = StgHiredEmployees(**employee_data)
+                    db.add(db_employee)
+            db.flush()
+        with timer.stage("commit"):
+            db.commit()
     except Exception as e:
         db.rollback()
         raise e # Rollback in case of error
\ No newline at end of file
@@ -0,0 +1,437 @@
+"""
+Bronze hired employees resumable upload module.
+
+This module defines a chunked upload protocol for very large hired
+employees files, so an upload interrupted after gigabytes does not have to
+be sent again:
+
+    POST   /sessions                   create a session, returns its id
+    PUT    /sessions/{id}?offset=N     send the bytes of the file from offset N
+    GET    /sessions/{id}              committed offset and row counts, to resume
+    POST   /sessions/{id}/finalize     replace stg_hired_employees with the upload
+    DELETE /sessions/{id}              abandon the upload
+
+Each chunk is parsed, validated and loaded as it arrives into a table of
+the session (a copy of stg_hired_employees), and the session's checkpoint
+(byte offset, last row number, trailing partial line and profiler state)
+is committed in the same transaction. After a failure the client asks for
+the offset and sends the file again from there; bytes already committed
+are skipped. stg_hired_employees itself is only replaced at finalize, in a
+single transaction, so it is never left half-loaded.
+
+A session with no chunk committed for settings.upload_session_ttl_seconds
+is expired: its row and table are dropped when the next session is created.
+"""
+
+import csv
+import io
+import uuid
+from datetime import timedelta
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.orm import Session
+from sqlalchemy import func, text
+
+from app.core.config import settings
+from app.core.database import get_ingest_db
+from app.core.table_locks import upload_session
+from app.core.metrics import record_bronze_rows
+from app.core.timing import StageTimer
+from app.api.models.bronze.upload_session import UploadSession
+from app.api.routes.bronze.upload.hired_employees_csv import validate_row
+from app.api.schemas.staging import UploadSessionCreate, UploadSessionStatus
+from app.api.services.ingestion_profile import LoadProfiler
+
+router = APIRouter(
+    prefix="/upload/hired_employees_csv/sessions",
+    tags=["bronze-layer"],
+    responses={
+        400: {"description": "Bad Request"},
+        404: {"description": "Upload session not found"},
+        409: {"description": "Offset mismatch, session finalized, or staging table locked"},
+        413: {"description": "Chunk larger than upload_chunk_max_bytes"},
+        500: {"description": "Internal Server Error"}
+    },
+)
+
+TABLE = "stg_hired_employees"
+COLUMNS = ["id", "name", "datetime", "department_id", "job_id"]
+
+# Validation errors kept per session
+MAX_SESSION_ERRORS = 1000
+
+def session_table(session: UploadSession) -> str:
+    """Name of the table the chunks of a session are loaded into."""
+    return f"{TABLE}_upload_{session.id}"
+
+def session_status(session: UploadSession) -> UploadSessionStatus:
+    """Progress of a session, as returned by every session endpoint."""
+    return UploadSessionStatus(
+        session_id=session.id,
+        table=session.table_name,
+        source_file=session.source_file,
+        status=session.status,
+        offset=session.received_bytes,
+        total_bytes=session.total_bytes,
+        rows_parsed=session.rows_parsed,
+        rows_written=session.rows_written,
+        rows_rejected=session.rows_rejected
+    )
+
+def record_end(data: bytes) -> int:
+    """
+    Length of the complete CSV records at the start of data.
+
+    A line break ends a record only outside a quoted field, i.e. after an
+    even number of double quotes (an escaped quote counts twice), so a
+    quoted field spanning lines is never split between chunks.
+    """
+    total = data.count(b'"')
+    quotes_after = 0
+    end = len(data)
+    while True:
+        newline = data.rfind(b"\n", 0, end)
+        if newline < 0:
+            return 0
+        quotes_after += data.count(b'"', newline, end)
+        if (total - quotes_after) % 2 == 0:
+            return newline + 1
+        end = newline
+
+async def read_chunk(request: Request) -> bytes:
+    """
+    Read the body of a chunk request, up to settings.upload_chunk_max_bytes.
+
+    An announced Content-Length over the limit is refused before the body is
+    read; a body without one is read until it passes the limit.
+
+    Raises:
+        HTTPException: 413 if the chunk is larger than upload_chunk_max_bytes
+    """
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Chunks are limited to {settings.upload_chunk_max_bytes} bytes"
+    )
+    announced = request.headers.get("content-length")
+    if announced and announced.isdigit() and int(announced) > settings.upload_chunk_max_bytes:
+        raise too_large
+    chunk = bytearray()
+    async for part in request.stream():
+        chunk += part
+        if len(chunk) > settings.upload_chunk_max_bytes:
+            raise too_large
+    return bytes(chunk)
+
+def expire_sessions(db: Session) -> int:
+    """
+    Drop the open sessions, and their tables, idle for longer than settings.upload_session_ttl_seconds.
+
+    Sessions whose row is locked by a chunk being applied are skipped.
+
+    Returns:
+        int: Number of sessions expired, committed by the caller
+    """
+    expired = db.query(UploadSession).filter(
+        UploadSession.status == "open",
+        UploadSession.updated_timestamp < func.now() - timedelta(seconds=settings.upload_session_ttl_seconds)
+    ).with_for_update(skip_locked=True).all()
+    for session in expired:
+        db.execute(text(f"DROP TABLE IF EXISTS {session_table(session)}"))
+        db.delete(session)
+    return len(expired)
+
+def get_session_for_update(db: Session, session_id: str) -> UploadSession:
+    """
+    Load a session and lock its row until commit, so chunks of a session are applied one at a time.
+
+    Raises:
+        HTTPException: 404 if the session does not exist, 409 if it is finalized
+    """
+    session = db.query(UploadSession).filter(UploadSession.id == session_id).with_for_update().first()
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Upload session {session_id} not found")
+    if session.status != "open":
+        raise HTTPException(status_code=409, detail=f"Upload session {session_id} is {session.status}")
+    return session
+
+def load_lines(db: Session, session: UploadSession, lines: bytes, timer: StageTimer) -> None:
+    """
+    Parse, validate, profile and load complete CSV lines into the session table.
+
+    Rows are numbered after the rows_parsed of the session. Employee ids seen
+    in an earlier chunk are updated, the last loaded row wins, as in the
+    one-shot upload.
+
+    Args:
+        db: Database session, committed by the caller
+        session: Locked upload session, whose counters and profile are advanced
+        lines: Complete lines of the file
+        timer: Timer of the request
+    """
+    with timer.stage("decode"):
+        csv_data = io.StringIO(lines.decode())
+    profiler = LoadProfiler.from_state(session.profile_state)
+    errors = list(session.errors)
+    batch: List[dict] = []
+    rejected = 0
+    row_num = session.rows_parsed
+    for row in timer.iterate("parse", csv.reader(csv_data)):
+        row_num += 1
+        with timer.stage("validate"):
+            data, error = validate_row(row, row_num)
+            profiler.observe(row, data, error)
+        if error:
+            rejected += 1
+            if len(errors) < MAX_SESSION_ERRORS:
+                errors.append(error)
+            continue
+        data["source_row"] = row_num
+        batch.append(data)
+    if batch:
+        with timer.stage("write"):
+            db.execute(
+                text(
+                    f"INSERT INTO {session_table(session)} (id, name, datetime, department_id, job_id, source_row) "
+                    "VALUES (:id, :name, :datetime, :department_id, :job_id, :source_row) "
+                    "ON CONFLICT (id) DO UPDATE SET name = EXCLUDED.name, datetime = EXCLUDED.datetime, "
+                    "department_id = EXCLUDED.department_id, job_id = EXCLUDED.job_id, source_row = EXCLUDED.source_row"
+                ),
+                batch
+            )
+    session.rows_parsed = row_num
+    session.rows_written += len(batch)
+    session.rows_rejected += rejected
+    session.errors = errors
+    session.profile_state = profiler.state()
+
+@router.post("/", status_code=status.HTTP_201_CREATED, response_model=UploadSessionStatus)
+async def create_upload_session(
+    request: UploadSessionCreate,
+    db: Session = Depends(get_ingest_db)
+):
+    """
+    Start a resumable upload of a hired employees CSV file.
+
+    Sessions left idle past upload_session_ttl_seconds are expired first.
+
+    Args:
+        request: File name and, optionally, its size in bytes; finalize then
+            refuses an upload that has not received all of them
+        db: Database session
+
+    Returns:
+        UploadSessionStatus: The new session, at offset 0
+    """
+    if not request.filename.endswith('.csv'):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only CSV files are allowed"
+        )
+    session = UploadSession(
+        id=uuid.uuid4().hex,
+        table_name=TABLE,
+        source_file=request.filename,
+        status="open",
+        total_bytes=request.total_bytes,
+        received_bytes=0,
+        rows_parsed=0,
+        rows_written=0,
+        rows_rejected=0,
+        pending=b"",
+        errors=[],
+        profile_state=LoadProfiler(TABLE, COLUMNS, datetime_column="datetime").state()
+    )
+    expire_sessions(db)
+    db.add(session)
+    db.execute(text(f"CREATE TABLE {session_table(session)} (LIKE {TABLE} INCLUDING ALL)"))
+    db.commit()
+    return session_status(session)
+
+@router.get("/{session_id}", response_model=UploadSessionStatus)
+async def get_upload_session(session_id: str, db: Session = Depends(get_ingest_db)):
+    """
+    Progress of an upload session.
+
+    offset is the number of bytes of the file committed so far: an
+    interrupted upload resumes by sending the file from there.
+    """
+    session = db.get(UploadSession, session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Upload session {session_id} not found")
+    return session_status(session)
+
+@router.put("/{session_id}", response_model=UploadSessionStatus)
+async def upload_chunk(
+    session_id: str,
+    request: Request,
+    response: Response,
+    offset: int = Query(..., ge=0, description="Byte offset of the chunk in the file"),
+    db: Session = Depends(get_ingest_db)
+):
+    """
+    Append a chunk of the file, sent as the raw request body.
+
+    The complete records of the chunk are loaded into the session table and
+    the checkpoint advanced in one transaction; a trailing partial record
+    (including a quoted field spanning lines) is kept and parsed with the
+    next chunk. A chunk starting before the
+    committed offset (a retry) has its already committed bytes skipped.
+
+    Args:
+        session_id: Upload session
+        request: Request whose body is the chunk
+        response: Response, carrying the committed offset in Upload-Offset
+        offset: Byte offset of the chunk in the file
+        db: Database session
+
+    Returns:
+        UploadSessionStatus: Progress after the chunk
+
+    Raises:
+        HTTPException: 409 with Upload-Offset if offset is past the committed
+            offset, 413 if the chunk is larger than upload_chunk_max_bytes
+    """
+    chunk = await read_chunk(request)
+    timer = StageTimer("bronze_chunk", table=TABLE, session=session_id)
+    with timer.stage("lock"):
+        session = get_session_for_update(db, session_id)
+    if offset > session.received_bytes:
+        received = session.received_bytes
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": f"Chunk starts at byte {offset} but only {received} bytes were received",
+                "hint": "Send the file from the offset in the Upload-Offset header"
+            },
+            headers={"Upload-Offset": str(received)}
+        )
+    skip = session.received_bytes - offset
+    end = session.received_bytes + len(chunk) - skip
+    if session.total_bytes is not None and end > session.total_bytes:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Chunk ends at byte {end}, past the announced size of {session.total_bytes} bytes"
+        )
+    if skip < len(chunk):
+        try:
+            data = session.pending + chunk[skip:]
+            complete = record_end(data)
+            if len(data) - complete > settings.upload_chunk_max_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"No record end within {settings.upload_chunk_max_bytes} bytes"
+                )
+            load_lines(db, session, data[:complete], timer)
+            session.pending = data[complete:]
+            session.received_bytes = end
+            with timer.stage("commit"):
+                db.commit()
+        except HTTPException:
+            db.rollback()
+            raise
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error processing chunk: {str(e)}"
+            )
+        timer.log(offset=session.received_bytes, rows_parsed=session.rows_parsed)
+    else:
+        db.rollback()
+    response.headers["Upload-Offset"] = str(session.received_bytes)
+    return session_status(session)
+
+@router.post("/{session_id}/finalize", response_model=dict)
+async def finalize_upload_session(
+    session_id: str,
+    timings: bool = Query(False, description="Include per-stage timings in the response"),
+    db: Session = Depends(upload_session(TABLE))
+):
+    """
+    Replace stg_hired_employees with the rows of a completed upload session.
+
+    The last line (if the file does not end with a line break) is loaded,
+    then stg_hired_employees is truncated and filled from the session table,
+    the ingestion profile stored and the session closed, all in one
+    transaction.
+
+    Args:
+        session_id: Upload session
+        timings: Whether to add the per-stage timings to the response
+        db: Database session, holding the lock of stg_hired_employees
+
+    Returns:
+        dict: Message, rows loaded, validation errors and the final session progress
+
+    Raises:
+        HTTPException: 409 with Upload-Offset if fewer bytes than announced were
+            received, 400 if no valid row was received (staging is left as is)
+    """
+    timer = StageTimer("bronze_finalize", table=TABLE, session=session_id)
+    with timer.stage("lock"):
+        session = get_session_for_update(db, session_id)
+    if session.total_bytes is not None and session.received_bytes != session.total_bytes:
+        received = session.received_bytes
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": f"Only {received} of {session.total_bytes} bytes were received",
+                "hint": "Send the rest of the file from the offset in the Upload-Offset header"
+            },
+            headers={"Upload-Offset": str(received)}
+        )
+    try:
+        if session.pending:
+            load_lines(db, session, session.pending, timer)
+            session.pending = b""
+        if session.rows_written == 0:
+            errors = session.errors
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"message": "No valid data received. All rows invalid.", "errors": errors}
+            )
+        with timer.stage("swap"):
+            rows_before = db.execute(text(f"SELECT COUNT(*) FROM {TABLE}")).scalar() or 0
+            db.execute(text(f"TRUNCATE TABLE {TABLE}"))
+            db.execute(text(
+                f"INSERT INTO {TABLE} (id, name, datetime, department_id, job_id, source_row) "
+                f"SELECT id, name, datetime, department_id, job_id, source_row FROM {session_table(session)}"
+            ))
+            db.execute(text(f"DROP TABLE {session_table(session)}"))
+        session.status = "finalized"
+        with timer.stage("commit"):
+            LoadProfiler.from_state(session.profile_state).save(db, session.source_file, session.rows_written)
+    except HTTPException:
+        raise
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error finalizing upload: {str(e)}"
+        )
+    record_bronze_rows(TABLE, parsed=session.rows_parsed, written=session.rows_written, rejected=session.rows_rejected)
+    timer.log(parsed=session.rows_parsed, written=session.rows_written, rejected=session.rows_rejected)
+    return {
+        "message": f"Table {TABLE} replaced ({rows_before} rows removed) by upload session {session.id}",
+        "total_processed": session.rows_written,
+        "errors": session.errors,
+        "session": session_status(session).model_dump(),
+        **({"timings": timer.report()} if timings else {})
+    }
+
+@router.delete("/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def abort_upload_session(session_id: str, db: Session = Depends(get_ingest_db)):
+    """
+    Abandon an open upload session and drop the rows it loaded.
+
+    stg_hired_employees is left as it was.
+    """
+    session = get_session_for_update(db, session_id)
+    db.execute(text(f"DROP TABLE IF EXISTS {session_table(session)}"))
+    db.delete(session)
+    db.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
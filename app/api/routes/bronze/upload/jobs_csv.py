@@ -5,14 +5,17 @@ This module defines the bulk upload endpoint for jobs data.
 """
 
 from typing import List, Dict
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query, status
 from sqlalchemy.orm import Session
 import csv
 import io
 from sqlalchemy import text
 from fastapi.responses import JSONResponse
 
-from app.core.database import get_db
+from app.core.table_locks import upload_session
+from app.core.metrics import record_bronze_rows
+from app.core.timing import StageTimer
+from app.api.services.ingestion_profile import LoadProfiler
 from app.api.models.bronze.stg_jobs import StgJobs
 from app.api.schemas.staging import StgJobsCreate
 
@@ -23,6 +26,7 @@ router = APIRouter(
         201: {"description": "Created"},
         204: {"description": "No data found in file."},
         400: {"description": "Bad Request"},
+        409: {"description": "Staging table locked by another upload or merge"},
         500: {"description": "Internal Server Error"}
     },
 )
@@ -30,7 +34,8 @@ router = APIRouter(
 @router.post("/", status_code=status.HTTP_201_CREATED)
 async def upload_jobs(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    timings: bool = Query(False, description="Include per-stage timings in the response"),
+    db: Session = Depends(upload_session("stg_jobs"))
 ):
     """
     Upload jobs data from CSV file in batches.
@@ -38,6 +43,7 @@ async def upload_jobs(
     
     Args:
         file: CSV file with jobs data
+        timings: Whether to add the per-stage timings to the response
         db: Database session
     
     Returns:
@@ -52,18 +58,23 @@ async def upload_jobs(
             detail="Only CSV files are allowed"
         )
     
+    timer = StageTimer("bronze_upload", table="stg_jobs")
     try:
         # Get current count
-        result = db.execute(text("SELECT COUNT(*) FROM stg_jobs")).scalar()
+        with timer.stage("count"):
+            result = db.execute(text("SELECT COUNT(*) FROM stg_jobs")).scalar()
         rows_before = result if result is not None else 0
         
         # Truncate the table before loading new data
-        db.execute(text("TRUNCATE TABLE stg_jobs"))
-        db.commit()
+        with timer.stage("truncate"):
+            db.execute(text("TRUNCATE TABLE stg_jobs"))
+            db.commit()
         
-        content = await file.read()
-        csv_data = io.StringIO(content.decode())
-        reader = csv.reader(csv_data)
+        with timer.stage("read"):
+            content = await file.read()
+        with timer.stage("decode"):
+            csv_data = io.StringIO(content.decode())
+        reader = timer.iterate("parse", csv.reader(csv_data))
         
         batch_size = 1000
         current_batch: List[dict] = []
@@ -72,28 +83,32 @@ async def upload_jobs(
         error_rows = []
         progress_messages = []
         row_count = 0
+        profiler = LoadProfiler("stg_jobs", ["id", "job"])
         
         for row_num, row in enumerate(reader, 1):
             row_count += 1
             try:
-                if len(row) != 2:  # id, job
-                    error_rows.append({
-                        "row": row_num,
-                        "data": row,
-                        "error": "Invalid number of columns"
-                    })
-                    continue
-                
-                job_data = {
-                    "id": str(row[0]),
-                    "job": row[1]
-                }
+                with timer.stage("validate"):
+                    if len(row) != 2:  # id, job
+                        error_rows.append({
+                            "row": row_num,
+                            "data": row,
+                            "error": "Invalid number of columns"
+                        })
+                        profiler.observe(row, error=error_rows[-1])
+                        continue
+                    
+                    job_data = {
+                        "id": str(row[0]),
+                        "job": row[1]
+                    }
+                    profiler.observe(row, job_data)
                 
                 current_batch.append(job_data)
                 
                 # Process batch when it reaches the size limit
                 if len(current_batch) >= batch_size:
-                    await process_job_batch(current_batch, db)
+                    await process_job_batch(current_batch, db, timer)
                     total_processed += len(current_batch)
                     total_batches += 1
                     progress_messages.append(f"Processed {total_processed} rows")
@@ -108,10 +123,14 @@ async def upload_jobs(
         
         # Process remaining records
         if current_batch:
-            await process_job_batch(current_batch, db)
+            await process_job_batch(current_batch, db, timer)
             total_processed += len(current_batch)
             total_batches += 1
             progress_messages.append(f"Processed {total_processed} rows (final batch)")
+        with timer.stage("profile"):
+            profiler.save(db, file.filename, total_processed)
+        record_bronze_rows("stg_jobs", parsed=row_count, written=total_processed, rejected=len(error_rows))
+        timer.log(parsed=row_count, written=total_processed, rejected=len(error_rows))
         
         # New logic for status codes
         if row_count == 0:
@@ -130,7 +149,8 @@ async def upload_jobs(
                 status_code=400,
                 content={
                     "message": "No valid data processed. All rows invalid.",
-                    "errors": error_rows
+                    "errors": error_rows,
+                    **({"timings": timer.report()} if timings else {})
                 }
             )
         return {
@@ -138,7 +158,8 @@ async def upload_jobs(
             "total_processed": total_processed,
             "total_batches": total_batches,
             "progress": progress_messages,
-            "errors": error_rows
+            "errors": error_rows,
+            **({"timings": timer.report()} if timings else {})
         }
         
     except Exception as e:
@@ -150,7 +171,8 @@ async def upload_jobs(
 
 async def process_job_batch(
     batch_data: List[dict],
-    db: Session
+    db: Session,
+    timer: StageTimer
 ) -> None:
     """
     Process a batch of job records.
@@ -158,24 +180,27 @@ async def process_job_batch(
     Args:
         batch_data: List of job dictionaries
         db: Database session
+        timer: Timer of the upload, the batch adds to its write and commit stages
     """
     try:
-        for job_data in batch_data:
-            # Check if job already exists
-            existing = db.query(StgJobs).filter(
-                StgJobs.id == job_data["id"]
-            ).first()
+        with timer.stage("write"):
+            for job_data in batch_data:
+                # Check if job already exists
+                existing = db.query(StgJobs).filter(
+                    StgJobs.id == job_data["id"]
+                ).first()
             
-            if existing:
-                # Update existing record
-                for key, value in job_data.items():
-                    setattr(existing, key, value)
-            else:
-                # Create new record
-                db_job = StgJobs(**job_data)
-                db.add(db_job)
-        
-        db.commit()
+                if existing:
+                    # Update existing record
+                    for key, value in job_data.items():
+                        setattr(existing, key, value)
+                else:
+                    # Create new record
+                    db_job = StgJobs(**job_data)
+                    db.add(db_job)
+            db.flush()
+        with timer.stage("commit"):
+            db.commit()
     except Exception as e:
         db.rollback()
         raise e # Rollback in case of error
\ No newline at end of file
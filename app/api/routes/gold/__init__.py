@@ -1,5 +1,11 @@
 from fastapi import APIRouter
 from .metrics import router as metrics_router
+from .export import router as export_router
+from .query import router as query_router
+from .timeseries import router as timeseries_router
 
 router = APIRouter()
-router.include_router(metrics_router) 
\ No newline at end of file
+router.include_router(metrics_router)
+router.include_router(query_router)
+router.include_router(timeseries_router)
+router.include_router(export_router)
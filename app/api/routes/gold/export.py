@@ -0,0 +1,54 @@
+"""
+Gold Layer Export Routes
+
+This module exposes the gold metrics as downloadable Arrow IPC, Parquet or CSV
+streams for BI tools that load results straight into dataframes.
+"""
+
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, Query
+from app.api.routes.gold.metrics import (
+    MetricWindow, metric_window, hired_by_quarter_source, departments_above_mean_source
+)
+from app.api.services.export import FORMATS, negotiate_format, export_response
+
+router = APIRouter(
+    prefix="/export",
+    tags=["gold-export"]
+)
+
+EXPORT_RESPONSES = {
+    200: {"content": {media_type: {} for media_type in FORMATS.values()}},
+    406: {"description": "Requested format not supported"}
+}
+
+HIRED_BY_QUARTER_COLUMNS = [
+    ("department", "str"), ("job", "str"),
+    ("q1", "int"), ("q2", "int"), ("q3", "int"), ("q4", "int")
+]
+
+DEPARTMENTS_ABOVE_MEAN_COLUMNS = [
+    ("id", "int"), ("department", "str"), ("hired", "int")
+]
+
+@router.get("/hired_by_quarter", responses=EXPORT_RESPONSES)
+def export_hired_by_quarter(
+    window: MetricWindow = Depends(metric_window),
+    format: Optional[str] = Query(None, description="arrow, parquet or csv (overrides the Accept header)"),
+    accept: Optional[str] = Header(None)
+):
+    """Export hires by quarter in the negotiated columnar format."""
+    chosen = negotiate_format(format, accept)
+    sql, params = hired_by_quarter_source(window)
+    return export_response(sql, params, HIRED_BY_QUARTER_COLUMNS, chosen, "hired_by_quarter")
+
+@router.get("/departments_above_mean", responses=EXPORT_RESPONSES)
+def export_departments_above_mean(
+    window: MetricWindow = Depends(metric_window),
+    format: Optional[str] = Query(None, description="arrow, parquet or csv (overrides the Accept header)"),
+    accept: Optional[str] = Header(None)
+):
+    """Export departments above mean in the negotiated columnar format."""
+    chosen = negotiate_format(format, accept)
+    sql, params = departments_above_mean_source(window)
+    return export_response(sql, params, DEPARTMENTS_ABOVE_MEAN_COLUMNS, chosen, "departments_above_mean")
@@ -1,68 +1,454 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from typing import List
-from app.core.database import get_db
-from app.api.schemas.gold.metrics import HiredByQuarterResponse, DepartmentAboveMeanResponse
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+import base64
+import json
+from app.core.cache import cached_json_response
+from app.core.config import settings
+from app.core.database import get_read_db, open_read_session
+from app.api.services.columnar import columnar_engine
+from app.api.schemas.gold.metrics import (
+    HiredByQuarterResponse, DepartmentAboveMeanResponse,
+    HiredByQuarterPage, DepartmentAboveMeanPage
+)
 
 router = APIRouter(
     prefix="/metrics",
     tags=["gold-metrics"]
 )
 
+# Month-aligned windows are served from the rollup cube maintained by the fact merge
+HIRED_BY_QUARTER_AGG_SQL = '''
+    SELECT
+        d.department AS department,
+        j.job AS job,
+        COALESCE(SUM(a.hired) FILTER (WHERE a.quarter = 1), 0) AS q1,
+        COALESCE(SUM(a.hired) FILTER (WHERE a.quarter = 2), 0) AS q2,
+        COALESCE(SUM(a.hired) FILTER (WHERE a.quarter = 3), 0) AS q3,
+        COALESCE(SUM(a.hired) FILTER (WHERE a.quarter = 4), 0) AS q4
+    FROM agg_hires_dept_job_period a
+    JOIN dim_departments d ON a.id_department = d.id_department
+    JOIN dim_jobs j ON a.id_job = j.id_job
+    WHERE (a.year, a.month) >= (:start_year, :start_month)
+        AND (a.year, a.month) < (:end_year, :end_month)
+    GROUP BY d.department, j.job
+    ORDER BY d.department ASC, j.job ASC
+'''
+
+# Arbitrary date ranges hit the fact with a sargable half-open range predicate;
+# quarters come from dim_date, which the fact merge extends to every hire year
+HIRED_BY_QUARTER_RANGE_SQL = '''
+    SELECT
+        d.department AS department,
+        j.job AS job,
+        COUNT(*) FILTER (WHERE t.quarter = 1) AS q1,
+        COUNT(*) FILTER (WHERE t.quarter = 2) AS q2,
+        COUNT(*) FILTER (WHERE t.quarter = 3) AS q3,
+        COUNT(*) FILTER (WHERE t.quarter = 4) AS q4
+    FROM fact_hired_employees f
+    JOIN dim_date t ON t.date = f.hire_datetime::date
+    JOIN dim_departments d ON f.id_department = d.id_department
+    JOIN dim_jobs j ON f.id_job = j.id_job
+    WHERE f.hire_datetime >= :start AND f.hire_datetime < :end
+    GROUP BY d.department, j.job
+    ORDER BY d.department ASC, j.job ASC
+'''
+
+DEPARTMENTS_ABOVE_MEAN_AGG_SQL = '''
+    WITH hires_per_department AS (
+        SELECT
+            d.id_department,
+            d.department,
+            SUM(a.hired) AS hired
+        FROM agg_hires_dept_job_period a
+        JOIN dim_departments d ON a.id_department = d.id_department
+        WHERE (a.year, a.month) >= (:start_year, :start_month)
+            AND (a.year, a.month) < (:end_year, :end_month)
+        GROUP BY d.id_department, d.department
+    ),
+    mean_hired AS (
+        SELECT AVG(hired) AS mean_hired FROM hires_per_department
+    )
+    SELECT
+        h.id_department AS id,
+        h.department,
+        h.hired
+    FROM hires_per_department h, mean_hired m
+    WHERE h.hired > m.mean_hired
+    ORDER BY h.hired DESC, h.id_department ASC
+'''
+
+DEPARTMENTS_ABOVE_MEAN_RANGE_SQL = '''
+    WITH hires_per_department AS (
+        SELECT
+            d.id_department,
+            d.department,
+            COUNT(*) AS hired
+        FROM fact_hired_employees f
+        JOIN dim_departments d ON f.id_department = d.id_department
+        WHERE f.hire_datetime >= :start AND f.hire_datetime < :end
+        GROUP BY d.id_department, d.department
+    ),
+    mean_hired AS (
+        SELECT AVG(hired) AS mean_hired FROM hires_per_department
+    )
+    SELECT
+        h.id_department AS id,
+        h.department,
+        h.hired
+    FROM hires_per_department h, mean_hired m
+    WHERE h.hired > m.mean_hired
+    ORDER BY h.hired DESC, h.id_department ASC
+'''
+
+# Sort keys of the queries above, applied by the wrappers below
+HIRED_BY_QUARTER_ORDER = "q.department ASC, q.job ASC"
+DEPARTMENTS_ABOVE_MEAN_ORDER = "q.hired DESC, q.id ASC"
+
+# Keyset pages wrap the queries above (each page re-runs the aggregate); the cursor is the last row's sort key
+HIRED_BY_QUARTER_PAGE_SQL = '''
+    SELECT * FROM ({source}) q
+    {where}
+    ORDER BY {order_by}
+    LIMIT :limit
+'''
+HIRED_BY_QUARTER_AFTER = "WHERE (q.department, q.job) > (:after_department, :after_job)"
+
+DEPARTMENTS_ABOVE_MEAN_PAGE_SQL = '''
+    SELECT * FROM ({source}) q
+    {where}
+    ORDER BY {order_by}
+    LIMIT :limit
+'''
+DEPARTMENTS_ABOVE_MEAN_AFTER = "WHERE q.hired < :after_hired OR (q.hired = :after_hired AND q.id > :after_id)"
+
+# Database-rendered response body (settings.gold_json_renderer = "database")
+JSON_ARRAY_SQL = '''
+    SELECT COALESCE(json_agg(q ORDER BY {order_by}), '[]')::text
+    FROM ({source}) q
+'''
+
+# Rows fetched per round trip by the server-side cursor of streaming endpoints
+STREAM_BATCH_SIZE = 1000
+
+@dataclass
+class MetricWindow:
+    """Half-open hire datetime window requested for a gold metric."""
+    year: int
+    start: datetime
+    end: datetime
+
+    @property
+    def whole_months(self) -> bool:
+        """Whether both bounds are month starts, so the rollup cube can answer the window."""
+        return self.start.day == 1 and self.end.day == 1
+
+def rollup_params(window: MetricWindow) -> Dict[str, Any]:
+    """Bind a month-aligned window as (year, month) bounds of the rollup cube."""
+    return {
+        "start_year": window.start.year, "start_month": window.start.month,
+        "end_year": window.end.year, "end_month": window.end.month
+    }
+
+# Bounds of the hire dates accepted by the gold endpoints
+MIN_HIRE_DATE = date(1900, 1, 1)
+MAX_HIRE_DATE = date(2100, 12, 31)
+
+def resolve_window(
+    year: Optional[int],
+    start_date: Optional[date],
+    end_date: Optional[date],
+    single_year: bool
+) -> MetricWindow:
+    """
+    Turn the year / date range parameters into a half-open datetime window.
+
+    year defaults to the year of start_date (or end_date), else 2021. A
+    missing start_date or end_date defaults to the bound of that year.
+
+    Raises:
+        HTTPException: If the window is empty, or leaves year when single_year is set
+    """
+    if year is None:
+        year = (start_date or end_date).year if start_date or end_date else 2021
+    year_start = datetime(year, 1, 1)
+    year_end = datetime(year + 1, 1, 1)
+    start = datetime.combine(start_date, datetime.min.time()) if start_date else year_start
+    end = datetime.combine(end_date, datetime.min.time()) + timedelta(days=1) if end_date else year_end
+    if start >= end:
+        raise HTTPException(
+            status_code=400,
+            detail="start_date must be on or before end_date"
+        )
+    if single_year and (start < year_start or end > year_end):
+        raise HTTPException(
+            status_code=400,
+            detail=f"start_date and end_date must be within {year}"
+        )
+    return MetricWindow(year, start, end)
+
+def metric_window(
+    year: Optional[int] = Query(None, ge=1900, le=2100, description="Hire year (defaults to the year of start_date or end_date, else 2021)"),
+    start_date: Optional[date] = Query(None, ge=MIN_HIRE_DATE, le=MAX_HIRE_DATE, description="First hire date included (defaults to January 1st of year)"),
+    end_date: Optional[date] = Query(None, ge=MIN_HIRE_DATE, le=MAX_HIRE_DATE, description="Last hire date included (defaults to December 31st of year)")
+) -> MetricWindow:
+    """
+    Window of a per-year metric: start_date and end_date narrow the year's
+    bounds and must both fall within it, since quarters of different years
+    would otherwise be added up.
+    """
+    return resolve_window(year, start_date, end_date, single_year=True)
+
+def metric_range(
+    year: Optional[int] = Query(None, ge=1900, le=2100, description="Hire year (defaults to the year of start_date or end_date, else 2021)"),
+    start_date: Optional[date] = Query(None, ge=MIN_HIRE_DATE, le=MAX_HIRE_DATE, description="First hire date included (defaults to January 1st of year)"),
+    end_date: Optional[date] = Query(None, ge=MIN_HIRE_DATE, le=MAX_HIRE_DATE, description="Last hire date included (defaults to December 31st of year)")
+) -> MetricWindow:
+    """Window of a period-bucketed metric, which may span several years."""
+    return resolve_window(year, start_date, end_date, single_year=False)
+
+def hired_by_quarter_source(window: MetricWindow) -> Tuple[str, Dict[str, Any]]:
+    """Pick the hires by quarter query, from the rollup cube when the window is month-aligned."""
+    if window.whole_months:
+        return HIRED_BY_QUARTER_AGG_SQL, rollup_params(window)
+    return HIRED_BY_QUARTER_RANGE_SQL, {"start": window.start, "end": window.end}
+
+def departments_above_mean_source(window: MetricWindow) -> Tuple[str, Dict[str, Any]]:
+    """Pick the departments above mean query, from the rollup cube when the window is month-aligned."""
+    if window.whole_months:
+        return DEPARTMENTS_ABOVE_MEAN_AGG_SQL, rollup_params(window)
+    return DEPARTMENTS_ABOVE_MEAN_RANGE_SQL, {"start": window.start, "end": window.end}
+
+def hired_by_quarter_row(row) -> HiredByQuarterResponse:
+    return HiredByQuarterResponse(
+        department=row[0], job=row[1], q1=row[2], q2=row[3], q3=row[4], q4=row[5]
+    )
+
+def department_above_mean_row(row) -> DepartmentAboveMeanResponse:
+    return DepartmentAboveMeanResponse(id=row[0], department=row[1], hired=row[2])
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode the sort key of the last returned row as an opaque cursor."""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+def decode_cursor(cursor: str, types: Tuple[type, ...]) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor, rejecting malformed values.
+
+    Each value must have the type of its sort key column, so a forged cursor
+    is a 400 rather than a database error.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        values = None
+    if (
+        not isinstance(values, list)
+        or len(values) != len(types)
+        or any(type(value) is not expected for value, expected in zip(values, types))
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+def render_json(db: Session, source: Tuple[str, Dict[str, Any]], order_by: str) -> bytes:
+    """
+    Have PostgreSQL render a query as a JSON array body.
+
+    row_to_json uses the select list names, which match the response models,
+    so the body is returned without building a model per row.
+    """
+    sql, params = source
+    body = db.execute(text(JSON_ARRAY_SQL.format(source=sql, order_by=order_by)), params).scalar()
+    return body.encode()
+
+def stream_ndjson(
+    source: Tuple[str, Dict[str, Any]],
+    to_model: Callable[[Any], Any]
+) -> StreamingResponse:
+    """
+    Stream a query as newline-delimited JSON from a server-side cursor.
+
+    The session is opened inside the generator because request-scoped
+    dependencies are closed before a streaming body is sent. Rows are fetched
+    STREAM_BATCH_SIZE at a time, so memory stays flat regardless of result size.
+    """
+    sql, params = source
+
+    def generate() -> Iterator[bytes]:
+        db = open_read_session()
+        try:
+            result = db.execute(
+                text(sql), params, execution_options={"yield_per": STREAM_BATCH_SIZE}
+            )
+            for partition in result.partitions(STREAM_BATCH_SIZE):
+                yield b"".join(
+                    to_model(row).model_dump_json().encode() + b"\n" for row in partition
+                )
+        finally:
+            db.close()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
 @router.get("/hired_by_quarter", response_model=List[HiredByQuarterResponse])
-def get_hired_by_quarter(db: Session = Depends(get_db)):
+def get_hired_by_quarter(
+    request: Request,
+    window: MetricWindow = Depends(metric_window),
+    db: Session = Depends(get_read_db)
+):
+    try:
+        return cached_json_response(
+            request,
+            "hired_by_quarter",
+            {"start": window.start, "end": window.end},
+            lambda: query_hired_by_quarter(db, window)
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def query_hired_by_quarter(db: Session, window: MetricWindow) -> Union[List[HiredByQuarterResponse], bytes]:
+    """Run the hires by quarter query for the requested window."""
+    if settings.gold_engine == "columnar":
+        rows = columnar_engine.hired_by_quarter(db, window.start, window.end)
+    elif settings.gold_json_renderer == "database":
+        return render_json(db, hired_by_quarter_source(window), HIRED_BY_QUARTER_ORDER)
+    else:
+        sql, params = hired_by_quarter_source(window)
+        rows = db.execute(text(sql), params).fetchall()
+    return [hired_by_quarter_row(row) for row in rows]
+
+@router.get("/hired_by_quarter/page", response_model=HiredByQuarterPage)
+def get_hired_by_quarter_page(
+    request: Request,
+    window: MetricWindow = Depends(metric_window),
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum number of rows per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor returned by the previous page"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Keyset-paginated hires by quarter, ordered by department and job.
+
+    Each page resumes strictly after the (department, job) encoded in the
+    cursor, so pages stay consistent without an OFFSET. Every page still
+    runs the whole aggregate for the window before filtering it.
+    """
+    after = decode_cursor(cursor, (str, str)) if cursor else None
     try:
-        query = text('''
-            SELECT
-                d.department AS department,
-                j.job AS job,
-                SUM(CASE WHEN EXTRACT(QUARTER FROM f.hire_datetime) = 1 THEN 1 ELSE 0 END) AS q1,
-                SUM(CASE WHEN EXTRACT(QUARTER FROM f.hire_datetime) = 2 THEN 1 ELSE 0 END) AS q2,
-                SUM(CASE WHEN EXTRACT(QUARTER FROM f.hire_datetime) = 3 THEN 1 ELSE 0 END) AS q3,
-                SUM(CASE WHEN EXTRACT(QUARTER FROM f.hire_datetime) = 4 THEN 1 ELSE 0 END) AS q4
-            FROM fact_hired_employees f
-            JOIN dim_departments d ON f.id_department = d.id_department
-            JOIN dim_jobs j ON f.id_job = j.id_job
-            WHERE EXTRACT(YEAR FROM f.hire_datetime) = 2021
-            GROUP BY d.department, j.job
-            ORDER BY d.department ASC, j.job ASC;
-        ''')
-        result = db.execute(query)
-        rows = result.fetchall()
-        return [HiredByQuarterResponse(
-            department=row[0], job=row[1], q1=row[2], q2=row[3], q3=row[4], q4=row[5]
-        ) for row in rows]
+        return cached_json_response(
+            request,
+            "hired_by_quarter/page",
+            {"start": window.start, "end": window.end, "limit": limit, "cursor": cursor},
+            lambda: query_hired_by_quarter_page(db, window, limit, after)
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def query_hired_by_quarter_page(
+    db: Session,
+    window: MetricWindow,
+    limit: int,
+    after: Optional[List[Any]]
+) -> HiredByQuarterPage:
+    """Fetch one keyset page of hires by quarter (one extra row detects the next page)."""
+    source, params = hired_by_quarter_source(window)
+    params = dict(params, limit=limit + 1)
+    if after:
+        params.update(after_department=after[0], after_job=after[1])
+    sql = HIRED_BY_QUARTER_PAGE_SQL.format(
+        source=source,
+        where=HIRED_BY_QUARTER_AFTER if after else "",
+        order_by=HIRED_BY_QUARTER_ORDER
+    )
+    rows = db.execute(text(sql), params).fetchall()
+    items = [hired_by_quarter_row(row) for row in rows[:limit]]
+    next_cursor = encode_cursor([items[-1].department, items[-1].job]) if len(rows) > limit else None
+    return HiredByQuarterPage(items=items, next_cursor=next_cursor)
+
+@router.get(
+    "/hired_by_quarter/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}}
+)
+def stream_hired_by_quarter(window: MetricWindow = Depends(metric_window)):
+    """Stream hires by quarter as NDJSON, one HiredByQuarterResponse per line."""
+    return stream_ndjson(hired_by_quarter_source(window), hired_by_quarter_row)
+
 @router.get("/departments_above_mean", response_model=List[DepartmentAboveMeanResponse])
-def get_departments_above_mean(db: Session = Depends(get_db)):
+def get_departments_above_mean(
+    request: Request,
+    window: MetricWindow = Depends(metric_window),
+    db: Session = Depends(get_read_db)
+):
     try:
-        query = text('''
-            WITH hires_per_department AS (
-                SELECT
-                    d.id_department,
-                    d.department,
-                    COUNT(*) AS hired
-                FROM fact_hired_employees f
-                JOIN dim_departments d ON f.id_department = d.id_department
-                WHERE EXTRACT(YEAR FROM f.hire_datetime) = 2021
-                GROUP BY d.id_department, d.department
-            ),
-            mean_hired AS (
-                SELECT AVG(hired) AS mean_hired FROM hires_per_department
-            )
-            SELECT
-                h.id_department AS id,
-                h.department,
-                h.hired
-            FROM hires_per_department h, mean_hired m
-            WHERE h.hired > m.mean_hired
-            ORDER BY h.hired DESC;
-        ''')
-        result = db.execute(query)
-        rows = result.fetchall()
-        return [DepartmentAboveMeanResponse(id=row[0], department=row[1], hired=row[2]) for row in rows]
+        return cached_json_response(
+            request,
+            "departments_above_mean",
+            {"start": window.start, "end": window.end},
+            lambda: query_departments_above_mean(db, window)
+        )
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+def query_departments_above_mean(db: Session, window: MetricWindow) -> Union[List[DepartmentAboveMeanResponse], bytes]:
+    """Run the departments above mean query for the requested window."""
+    if settings.gold_engine == "columnar":
+        rows = columnar_engine.departments_above_mean(db, window.start, window.end)
+    elif settings.gold_json_renderer == "database":
+        return render_json(db, departments_above_mean_source(window), DEPARTMENTS_ABOVE_MEAN_ORDER)
+    else:
+        sql, params = departments_above_mean_source(window)
+        rows = db.execute(text(sql), params).fetchall()
+    return [department_above_mean_row(row) for row in rows]
+
+@router.get("/departments_above_mean/page", response_model=DepartmentAboveMeanPage)
+def get_departments_above_mean_page(
+    request: Request,
+    window: MetricWindow = Depends(metric_window),
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum number of rows per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor returned by the previous page"),
+    db: Session = Depends(get_read_db)
+):
+    """Keyset-paginated departments above mean, ordered by hires (descending) and id."""
+    after = decode_cursor(cursor, (int, int)) if cursor else None
+    try:
+        return cached_json_response(
+            request,
+            "departments_above_mean/page",
+            {"start": window.start, "end": window.end, "limit": limit, "cursor": cursor},
+            lambda: query_departments_above_mean_page(db, window, limit, after)
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def query_departments_above_mean_page(
+    db: Session,
+    window: MetricWindow,
+    limit: int,
+    after: Optional[List[Any]]
+) -> DepartmentAboveMeanPage:
+    """Fetch one keyset page of departments above mean (one extra row detects the next page)."""
+    source, params = departments_above_mean_source(window)
+    params = dict(params, limit=limit + 1)
+    if after:
+        params.update(after_hired=after[0], after_id=after[1])
+    sql = DEPARTMENTS_ABOVE_MEAN_PAGE_SQL.format(
+        source=source,
+        where=DEPARTMENTS_ABOVE_MEAN_AFTER if after else "",
+        order_by=DEPARTMENTS_ABOVE_MEAN_ORDER
+    )
+    rows = db.execute(text(sql), params).fetchall()
+    items = [department_above_mean_row(row) for row in rows[:limit]]
+    next_cursor = encode_cursor([items[-1].hired, items[-1].id]) if len(rows) > limit else None
+    return DepartmentAboveMeanPage(items=items, next_cursor=next_cursor)
+
+@router.get(
+    "/departments_above_mean/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}}
+)
+def stream_departments_above_mean(window: MetricWindow = Depends(metric_window)):
+    """Stream departments above mean as NDJSON, one DepartmentAboveMeanResponse per line."""
+    return stream_ndjson(departments_above_mean_source(window), department_above_mean_row)
@@ -0,0 +1,82 @@
+"""
+Gold Layer Metric Query Routes
+
+This module exposes a generic hires metric: the caller picks the dimensions to
+group by, the time grain, the date window and id filters, and the request is
+compiled into a single parameterized aggregate over the fact table.
+"""
+
+from enum import Enum
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+from app.core.cache import cached_json_response
+from app.core.config import settings
+from app.core.database import get_read_db
+from app.api.routes.gold.metrics import MetricWindow, metric_range, rollup_params, render_json
+from app.api.schemas.gold.metrics import MetricQueryRow
+from app.api.services.metric_query import DIMENSIONS, ROLLUP_PERIODS, ORDER_BY_COLUMNS, compile_metric_query
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["gold-metrics"]
+)
+
+class MetricDimension(str, Enum):
+    department = "department"
+    job = "job"
+
+class TimeGrain(str, Enum):
+    day = "day"
+    month = "month"
+    quarter = "quarter"
+    year = "year"
+
+@router.get("/query", response_model=List[MetricQueryRow])
+def query_hires(
+    request: Request,
+    dimensions: List[MetricDimension] = Query([], description="Dimensions to group by"),
+    grain: Optional[TimeGrain] = Query(None, description="Time bucket; omit to aggregate the whole window"),
+    department_id: Optional[List[int]] = Query(None, description="Only count these departments"),
+    job_id: Optional[List[int]] = Query(None, description="Only count these jobs"),
+    window: MetricWindow = Depends(metric_range),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Count hires grouped by any combination of dimensions and a time grain.
+
+    Rows are ordered by period, then by dimension name. Dimensions that were
+    not requested are null, as is period when no grain is given.
+
+    Example: /metrics/query?dimensions=department&grain=month&job_id=3&year=2021
+    """
+    # Canonical order, so equivalent requests share the compiled statement and cache entry
+    requested = {dimension.value for dimension in dimensions}
+    shape_dimensions = tuple(name for name in DIMENSIONS if name in requested)
+    filter_ids = {"department": department_id, "job": job_id}
+    shape_filters = tuple(name for name in DIMENSIONS if filter_ids[name])
+    grain_name = grain.value if grain else None
+    ids = {f"{name}_ids": sorted(set(filter_ids[name])) for name in shape_filters}
+    # Month-aligned windows at month grain or coarser are answered by the rollup cube
+    rollup = window.whole_months and (grain_name is None or grain_name in ROLLUP_PERIODS)
+    window_params = rollup_params(window) if rollup else {"start": window.start, "end": window.end}
+
+    try:
+        return cached_json_response(
+            request,
+            "query",
+            dict(ids, start=window.start, end=window.end, dimensions=shape_dimensions, grain=grain_name),
+            lambda: run_metric_query(
+                db, compile_metric_query(shape_dimensions, grain_name, shape_filters, rollup),
+                dict(ids, **window_params)
+            )
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def run_metric_query(db: Session, statement, params) -> Union[List[MetricQueryRow], bytes]:
+    """Execute a compiled metric statement."""
+    if settings.gold_json_renderer == "database":
+        return render_json(db, (statement.text, params), ORDER_BY_COLUMNS)
+    rows = db.execute(statement, params).mappings()
+    return [MetricQueryRow(**row) for row in rows]
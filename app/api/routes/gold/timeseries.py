@@ -0,0 +1,102 @@
+"""
+Gold Layer Time Series Routes
+
+This module exposes hires as a daily or weekly series over any date window,
+spanning several years if needed, with rolling and cumulative metrics
+computed by window functions over the calendar dimension dim_date.
+"""
+
+from datetime import timedelta
+from enum import Enum
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+from app.core.cache import cached_json_response
+from app.core.config import settings
+from app.core.database import get_read_db
+from app.api.routes.gold.metrics import MetricWindow, metric_range, render_json
+from app.api.schemas.gold.metrics import TimeSeriesPoint
+from app.api.services.date_dimension import missing_buckets
+from app.api.services.metric_query import DIMENSIONS, SERIES_PERIODS, compile_timeseries_query
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["gold-metrics"]
+)
+
+class SeriesGrain(str, Enum):
+    day = "day"
+    week = "week"
+
+# Longest rolling window, in buckets
+MAX_ROLLING_PERIODS = 366
+
+@router.get("/timeseries", response_model=List[TimeSeriesPoint])
+def hires_timeseries(
+    request: Request,
+    grain: SeriesGrain = Query(SeriesGrain.day, description="Bucket: calendar day or ISO week"),
+    rolling_periods: int = Query(
+        7, ge=1, le=MAX_ROLLING_PERIODS,
+        description="Buckets in the rolling window, ending at each bucket"
+    ),
+    department_id: Optional[List[int]] = Query(None, description="Only count these departments"),
+    job_id: Optional[List[int]] = Query(None, description="Only count these jobs"),
+    window: MetricWindow = Depends(metric_range),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Hires per day or ISO week with rolling sum, rolling average and running total.
+
+    Every bucket of the window is returned, zero when nothing was hired. The
+    rolling metrics cover the current bucket and the rolling_periods - 1
+    before it, including buckets before the window start; the running total
+    starts at the window start. Weekly buckets are labelled by their Monday
+    and the window is widened to whole weeks. A window, lookback included,
+    with buckets that have no day in dim_date is rejected with 400 instead
+    of returning a series with holes.
+
+    Example: /metrics/timeseries?grain=week&rolling_periods=4&start_date=2020-01-01&end_date=2021-12-31
+    """
+    filter_ids = {"department": department_id, "job": job_id}
+    shape_filters = tuple(name for name in DIMENSIONS if filter_ids[name])
+    ids = {f"{name}_ids": sorted(set(filter_ids[name])) for name in shape_filters}
+    start, end, step = window.start, window.end, timedelta(days=1)
+    if grain == SeriesGrain.week:
+        step = timedelta(weeks=1)
+        start -= timedelta(days=start.weekday())
+        end += timedelta(days=-end.weekday() % 7)
+    params = dict(
+        ids, start=start, end=end, preceding=rolling_periods - 1,
+        lookback_start=start - step * (rolling_periods - 1)
+    )
+
+    try:
+        return cached_json_response(
+            request,
+            "timeseries",
+            dict(ids, start=start, end=end, grain=grain.value, rolling_periods=rolling_periods),
+            lambda: run_timeseries_query(db, grain, compile_timeseries_query(grain.value, shape_filters), params)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+def run_timeseries_query(db: Session, grain: SeriesGrain, statement, params) -> Union[List[TimeSeriesPoint], bytes]:
+    """
+    Execute a compiled time series statement.
+
+    Raises:
+        HTTPException: 400 if buckets of the window, lookback included, have no day in dim_date
+    """
+    first, end = params["lookback_start"].date(), params["end"].date()
+    step = timedelta(weeks=1) if grain == SeriesGrain.week else timedelta(days=1)
+    if missing_buckets(db, SERIES_PERIODS[grain.value], first, end, step):
+        raise HTTPException(
+            status_code=400,
+            detail=f"The calendar (dim_date) does not cover {first} to {end - timedelta(days=1)}; narrow the window or the rolling periods"
+        )
+    if settings.gold_json_renderer == "database":
+        return render_json(db, (statement.text, params), "q.period")
+    rows = db.execute(statement, params).mappings()
+    return [TimeSeriesPoint(**row) for row in rows]
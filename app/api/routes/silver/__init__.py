@@ -9,6 +9,7 @@ from fastapi import APIRouter
 from .merge.dim_departments import router as departments_router
 from .merge.dim_jobs import router as jobs_router
 from .merge.fact_hired_employees import router as hired_employees_router
+from .export import router as export_router
 
 router = APIRouter()
 
@@ -29,4 +30,10 @@ router.include_router(
     hired_employees_router,
     prefix="/merge/fact_hired_employees",
     tags=["silver-layer"]
-) 
\ No newline at end of file
+)
+
+router.include_router(
+    export_router,
+    prefix="/export",
+    tags=["silver-layer"]
+)
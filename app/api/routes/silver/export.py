@@ -0,0 +1,52 @@
+"""
+Silver Layer Export Routes
+
+This module exposes the dimensional model tables as downloadable Arrow IPC,
+Parquet or CSV streams, read batch by batch in primary key order.
+"""
+
+from enum import Enum
+from typing import Optional
+from fastapi import APIRouter, Header, Query
+from app.api.routes.gold.export import EXPORT_RESPONSES
+from app.api.services.export import negotiate_format, export_response
+
+router = APIRouter()
+
+class SilverTable(str, Enum):
+    dim_departments = "dim_departments"
+    dim_jobs = "dim_jobs"
+    fact_hired_employees = "fact_hired_employees"
+
+# Table -> (primary key, exported columns)
+SILVER_EXPORTS = {
+    SilverTable.dim_departments: ("id_department", [
+        ("id_department", "int"), ("department", "str"),
+        ("created_timestamp", "datetime"), ("updated_timestamp", "datetime")
+    ]),
+    SilverTable.dim_jobs: ("id_job", [
+        ("id_job", "int"), ("job", "str"),
+        ("created_timestamp", "datetime"), ("updated_timestamp", "datetime")
+    ]),
+    SilverTable.fact_hired_employees: ("id_employee", [
+        ("id_employee", "int"), ("name", "str"), ("hire_datetime", "datetime"),
+        ("id_department", "int"), ("id_job", "int"),
+        ("created_timestamp", "datetime"), ("updated_timestamp", "datetime")
+    ]),
+}
+
+@router.get("/{table}", responses=EXPORT_RESPONSES)
+def export_silver_table(
+    table: SilverTable,
+    format: Optional[str] = Query(None, description="arrow, parquet or csv (overrides the Accept header)"),
+    accept: Optional[str] = Header(None)
+):
+    """
+    Export a silver table in the negotiated columnar format.
+
+    Rows are streamed in primary key order from a server-side cursor.
+    """
+    chosen = negotiate_format(format, accept)
+    primary_key, columns = SILVER_EXPORTS[table]
+    sql = f"SELECT {', '.join(name for name, _ in columns)} FROM {table.value} ORDER BY {primary_key}"
+    return export_response(sql, {}, columns, chosen, table.value)
@@ -5,34 +5,43 @@ This module handles the transformation of department data
 from bronze (staging) to silver (dimensional) layer.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from app.core.database import get_db
+from app.core.replica import record_data_version, replica_guard
+from app.core.table_locks import merge_session
+from app.core.metrics import record_merge
+from app.core.timing import StageTimer
+from app.api.services.columnar import columnar_engine
 from app.api.models import StgDepartments, DimDepartments
 
 router = APIRouter()
 
 @router.post("/merge", response_model=dict)
-async def merge_departments(db: Session = Depends(get_db)):
+async def merge_departments(
+    timings: bool = Query(False, description="Include per-stage timings in the response"),
+    db: Session = Depends(merge_session("stg_departments"))
+):
     """
     Merge departments from staging to dimensional model.
     
     This endpoint:
     1. Transforms staging data to match dimensional model
-    2. Performs upsert operation
-    3. Returns merge statistics
+    2. Performs upsert operation (INSERT ... ON CONFLICT)
+    3. Returns exact inserted/updated/unchanged counts from the same statement
+    
+    Args:
+        timings: Whether to add the per-stage timings to the response
+        db: Database session
     
     Returns:
         dict: Statistics about the merge operation
     """
+    timer = StageTimer("silver_merge", table="dim_departments", operation="merge")
     try:
-        # Get initial count
-        initial_count = db.execute(
-            text("SELECT COUNT(*) FROM dim_departments")
-        ).scalar()
-
-        # Perform MERGE operation
+        # Upsert and count in a single statement: xmax = 0 only for freshly
+        # inserted tuples, and the DO UPDATE ... WHERE clause skips rows whose
+        # department did not change, so they are never returned.
         merge_query = """
         WITH staging_data AS (
             SELECT DISTINCT
@@ -40,55 +49,49 @@ async def merge_departments(db: Session = Depends(get_db)):
                 department
             FROM stg_departments
             WHERE id IS NOT NULL
-        )
-        MERGE INTO dim_departments AS target
-        USING staging_data AS source
-        ON target.id_department = source.id_department
-        WHEN MATCHED AND target.department IS DISTINCT FROM source.department THEN
-            UPDATE SET 
-                department = source.department,
+        ),
+        upserted AS (
+            INSERT INTO dim_departments AS target (id_department, department, created_timestamp, updated_timestamp)
+            SELECT id_department, department, CURRENT_TIMESTAMP, NULL
+            FROM staging_data
+            ON CONFLICT (id_department) DO UPDATE SET
+                department = EXCLUDED.department,
                 updated_timestamp = CURRENT_TIMESTAMP
-        WHEN NOT MATCHED THEN
-            INSERT (id_department, department, created_timestamp, updated_timestamp)
-            VALUES (
-                source.id_department, 
-                source.department,
-                CURRENT_TIMESTAMP,
-                NULL
-            );
+            WHERE target.department IS DISTINCT FROM EXCLUDED.department
+            RETURNING (xmax = 0) AS inserted
+        )
+        SELECT
+            (SELECT COUNT(*) FROM staging_data) AS total_processed,
+            COUNT(*) FILTER (WHERE inserted) AS inserted,
+            COUNT(*) FILTER (WHERE NOT inserted) AS updated
+        FROM upserted
         """
         
-        db.execute(text(merge_query))
-        
-        # Get statistics
-        stats_query = """
-        SELECT 
-            (SELECT COUNT(*) FROM dim_departments) as final_count,
-            (SELECT COUNT(*) FROM stg_departments) as total_processed,
-            (
-                SELECT COUNT(*) 
-                FROM dim_departments d
-                WHERE EXISTS (
-                    SELECT 1 FROM stg_departments s
-                    WHERE s.id::integer = d.id_department
-                )
-            ) as matched_count
-        """
+        with timer.stage("merge"):
+            stats = db.execute(text(merge_query)).fetchone()
         
-        stats = db.execute(text(stats_query)).fetchone()
+        # Replicas serve reads again once they have replayed this version
+        with timer.stage("commit"):
+            persisted_version = record_data_version(db)
+            db.commit()
         
-        db.commit()
+        # Invalidate this worker's cached gold responses built from the previous data
+        replica_guard.note_merge(persisted_version)
+        record_merge("dim_departments", "merge", timer.elapsed(), stats.inserted + stats.updated)
+        timer.log(rows=stats.inserted + stats.updated)
+        columnar_engine.invalidate_dimensions()
         
         return {
             "message": "Departments merged successfully",
             "statistics": {
-                "initial_count": initial_count,
-                "final_count": stats.final_count,
                 "total_processed": stats.total_processed,
-                "inserted": stats.final_count - initial_count,
-                "updated": stats.matched_count
+                "inserted": stats.inserted,
+                "updated": stats.updated,
+                "unchanged": stats.total_processed - stats.inserted - stats.updated
             },
-            "status": "success"
+            "data_version": persisted_version,
+            "status": "success",
+            **({"timings": timer.report()} if timings else {})
         }
         
     except Exception as e:
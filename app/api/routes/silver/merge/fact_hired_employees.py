@@ -5,74 +5,180 @@ This module handles the transformation of hired employees data
 from bronze (staging) to silver (fact) layer, ensuring referential integrity.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.replica import record_data_version, replica_guard
+from app.core.table_locks import merge_session
+from app.core.metrics import record_merge
+from app.core.timing import StageTimer
 from app.api.models import StgHiredEmployees, FactHiredEmployees
+from app.api.services.gold_aggregates import record_gold_deltas, apply_gold_deltas
+from app.api.services.fact_partitions import ensure_fact_partitions, load_fact_year, swap_fact_year
+from app.api.services.columnar import columnar_engine
 
 router = APIRouter()
 
+# Window ordering applied per employee id; the first row of each partition wins.
+DEDUP_RULES = {
+    "last_loaded": "source_row DESC NULLS LAST",
+    "first_loaded": "source_row ASC NULLS LAST",
+    "latest_hire_datetime": "hire_datetime DESC, source_row DESC NULLS LAST",
+}
+
+# Valid staging rows, ranked per employee id by a dedup rule; occurrence = 1 is kept
+STAGE_QUERY = """
+CREATE TEMPORARY TABLE tmp_hired_employees_merge ON COMMIT DROP AS
+WITH valid_staging AS (
+    SELECT 
+        id::integer as id_employee,
+        name,
+        datetime::timestamp as hire_datetime,
+        department_id::integer as id_department,
+        job_id::integer as id_job,
+        source_row
+    FROM stg_hired_employees s
+    WHERE 
+        id IS NOT NULL 
+        AND department_id IS NOT NULL 
+        AND job_id IS NOT NULL
+        AND datetime IS NOT NULL
+        AND EXISTS (
+            SELECT 1 FROM dim_departments d 
+            WHERE d.id_department = s.department_id::integer
+        )
+        AND EXISTS (
+            SELECT 1 FROM dim_jobs j 
+            WHERE j.id_job = s.job_id::integer
+        )
+)
+SELECT
+    id_employee, name, hire_datetime, id_department, id_job,
+    ROW_NUMBER() OVER (
+        PARTITION BY id_employee
+        ORDER BY {order_by}
+    ) AS occurrence
+FROM valid_staging
+"""
+
+# Deduplicated rows of tmp_hired_employees_merge
+MERGE_SOURCE = """(
+    SELECT id_employee, name, hire_datetime, id_department, id_job
+    FROM tmp_hired_employees_merge
+    WHERE occurrence = 1
+)"""
+
+def resolve_dedup_rule(dedup_rule: Optional[str]) -> str:
+    """
+    Return the requested dedup rule, or the configured one.
+
+    Raises:
+        HTTPException: If the rule is unknown
+    """
+    rule = dedup_rule or settings.hired_employees_dedup_rule
+    if rule not in DEDUP_RULES:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": f"Unknown dedup rule '{rule}'",
+                "hint": f"Use one of: {', '.join(DEDUP_RULES)}"
+            }
+        )
+    return rule
+
+def stage_hired_employees(db: Session, rule: str) -> int:
+    """
+    Stage the valid staging rows into tmp_hired_employees_merge.
+
+    Returns:
+        int: Number of rows in stg_hired_employees
+
+    Raises:
+        HTTPException: If the staging table is empty
+    """
+    staging_count = db.execute(
+        text("SELECT COUNT(*) FROM stg_hired_employees")
+    ).scalar()
+
+    if staging_count == 0:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": "No data found in staging table",
+                "hint": "Please load data into stg_hired_employees before attempting merge"
+            }
+        )
+
+    # Stage valid records once, ranked per employee id by the dedup rule.
+    # The temporary table feeds the MERGE, the gold refresh and the statistics.
+    db.execute(text(STAGE_QUERY.format(order_by=DEDUP_RULES[rule])))
+    # Temporary tables are never analyzed by autovacuum; the joins against
+    # every hire year partition need real row counts to pick hash joins
+    db.execute(text("ANALYZE tmp_hired_employees_merge"))
+    return staging_count
+
 @router.post("/merge", response_model=dict)
-async def merge_hired_employees(db: Session = Depends(get_db)):
+async def merge_hired_employees(
+    dedup_rule: Optional[str] = Query(
+        None,
+        description="Rule used to keep one staging row per employee id "
+                    "(last_loaded, first_loaded, latest_hire_datetime). "
+                    "Defaults to the configured rule."
+    ),
+    timings: bool = Query(False, description="Include per-stage timings in the response"),
+    db: Session = Depends(merge_session("stg_hired_employees"))
+):
     """
     Merge hired employees from staging to fact table.
     
     This endpoint:
     1. Validates all foreign keys exist in dimension tables
     2. Transforms staging data to match fact table schema
-    3. Performs upsert operation with strict referential integrity
-    4. Returns detailed merge statistics
+    3. Keeps a single staging row per employee id according to the dedup rule
+    4. Performs upsert operation with strict referential integrity
+    5. Applies the merge's count deltas to the gold rollup cube
+    6. Returns detailed merge statistics
+    
+    Staging ids are raw strings, so values such as "7" and "07" both resolve to
+    employee 7. Without the dedup stage MERGE would fail with "MERGE command
+    cannot affect row a second time" and roll back the whole load.
+    
+    Args:
+        dedup_rule: Optional override of settings.hired_employees_dedup_rule
+        timings: Whether to add the per-stage timings to the response
+        db: Database session
     
     Returns:
         dict: Statistics about the merge operation
     """
+    rule = resolve_dedup_rule(dedup_rule)
+    timer = StageTimer("silver_merge", table="fact_hired_employees", operation="merge")
+
     try:
-        # First, check if staging table has data
-        staging_count = db.execute(
-            text("SELECT COUNT(*) FROM stg_hired_employees")
-        ).scalar()
-
-        if staging_count == 0:
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    "message": "No data found in staging table",
-                    "hint": "Please load data into stg_hired_employees before attempting merge"
-                }
-            )
+        with timer.stage("stage"):
+            staging_count = stage_hired_employees(db, rule)
 
         # Get initial count
-        initial_count = db.execute(
-            text("SELECT COUNT(*) FROM fact_hired_employees")
-        ).scalar() or 0
+        with timer.stage("count"):
+            initial_count = db.execute(
+                text("SELECT COUNT(*) FROM fact_hired_employees")
+            ).scalar() or 0
+
+        # Rows can only be written to the hire year partitions that exist
+        with timer.stage("partitions"):
+            ensure_fact_partitions(db, MERGE_SOURCE)
 
-        # Perform MERGE operation only with valid records
+        # Record the gold cube deltas while the fact still holds the
+        # previous values of the rows the MERGE will update
+        with timer.stage("gold_deltas"):
+            record_gold_deltas(db, MERGE_SOURCE)
+
+        # Perform MERGE operation only with valid, deduplicated records
         merge_query = """
-        WITH valid_staging AS (
-            SELECT 
-                id::integer as id_employee,
-                name,
-                datetime::timestamp as hire_datetime,
-                department_id::integer as id_department,
-                job_id::integer as id_job
-            FROM stg_hired_employees s
-            WHERE 
-                id IS NOT NULL 
-                AND department_id IS NOT NULL 
-                AND job_id IS NOT NULL
-                AND datetime IS NOT NULL
-                AND EXISTS (
-                    SELECT 1 FROM dim_departments d 
-                    WHERE d.id_department = s.department_id::integer
-                )
-                AND EXISTS (
-                    SELECT 1 FROM dim_jobs j 
-                    WHERE j.id_job = s.job_id::integer
-                )
-        )
         MERGE INTO fact_hired_employees f
-        USING valid_staging s ON f.id_employee = s.id_employee
+        USING {source} s ON f.id_employee = s.id_employee
         WHEN MATCHED THEN
             UPDATE SET 
                 name = s.name,
@@ -88,34 +194,52 @@ async def merge_hired_employees(db: Session = Depends(get_db)):
                 s.id_department, 
                 s.id_job
             );
-        """
-        db.execute(text(merge_query))
-        db.commit()
+        """.format(source=MERGE_SOURCE)
+        with timer.stage("merge"):
+            merged_rows = db.execute(text(merge_query)).rowcount
+
+        # Apply the deltas to the gold rollup cube in the same transaction
+        with timer.stage("gold_deltas"):
+            gold_keys_refreshed = apply_gold_deltas(db)
 
         # Get final statistics
-        final_count = db.execute(
-            text("SELECT COUNT(*) FROM fact_hired_employees")
-        ).scalar() or 0
-
-        valid_records = db.execute(
-            text("""
-                SELECT COUNT(*) FROM stg_hired_employees s
-                WHERE 
-                    id IS NOT NULL 
-                    AND department_id IS NOT NULL 
-                    AND job_id IS NOT NULL
-                    AND datetime IS NOT NULL
-                    AND EXISTS (
-                        SELECT 1 FROM dim_departments d 
-                        WHERE d.id_department = s.department_id::integer
-                    )
-                    AND EXISTS (
-                        SELECT 1 FROM dim_jobs j 
-                        WHERE j.id_job = s.job_id::integer
-                    )
-            """)
-        ).scalar() or 0
+        with timer.stage("count"):
+            final_count = db.execute(
+                text("SELECT COUNT(*) FROM fact_hired_employees")
+            ).scalar() or 0
+
+        with timer.stage("stats"):
+            validation = db.execute(
+                text("""
+                    SELECT
+                        COUNT(*) AS valid_records,
+                        COUNT(*) FILTER (WHERE occurrence > 1) AS duplicate_records
+                    FROM tmp_hired_employees_merge
+                """)
+            ).fetchone()
+
+        # Capture the merged rows for the in-memory columnar engine, if loaded
+        columnar_delta = None
+        if columnar_engine.loaded:
+            with timer.stage("columnar_delta"):
+                columnar_delta = columnar_engine.read_delta(
+                    db, "tmp_hired_employees_merge", "occurrence = 1"
+                )
+
+        # Replicas serve reads again once they have replayed this version
+        with timer.stage("commit"):
+            persisted_version = record_data_version(db)
+            db.commit()
 
+        # Invalidate this worker's cached gold responses built from the previous data
+        replica_guard.note_merge(persisted_version)
+        record_merge("fact_hired_employees", "merge", timer.elapsed(), merged_rows)
+        timer.log(rows=merged_rows)
+        if columnar_delta is not None:
+            columnar_engine.apply_delta(columnar_delta)
+
+        valid_records = validation.valid_records
+        duplicate_records = validation.duplicate_records
         invalid_records = staging_count - valid_records
 
         return {
@@ -125,9 +249,14 @@ async def merge_hired_employees(db: Session = Depends(get_db)):
                 "final_count": final_count,
                 "total_processed": staging_count,
                 "valid_records": valid_records,
-                "invalid_records": invalid_records
+                "invalid_records": invalid_records,
+                "duplicate_records": duplicate_records,
+                "dedup_rule": rule,
+                "gold_keys_refreshed": gold_keys_refreshed
             },
-            "status": "success"
+            "data_version": persisted_version,
+            "status": "success",
+            **({"timings": timer.report()} if timings else {})
         }
     except Exception as e:
         db.rollback()
@@ -138,4 +267,95 @@ async def merge_hired_employees(db: Session = Depends(get_db)):
                 "error": str(e),
                 "hint": "Check validation details for specific issues"
             }
-        ) 
\ No newline at end of file
+        )
+
+@router.post("/replace_year", response_model=dict)
+async def replace_hired_employees_year(
+    year: int = Query(..., ge=1900, le=2100, description="Hire year to replace"),
+    dedup_rule: Optional[str] = Query(
+        None,
+        description="Rule used to keep one staging row per employee id "
+                    "(last_loaded, first_loaded, latest_hire_datetime). "
+                    "Defaults to the configured rule."
+    ),
+    timings: bool = Query(False, description="Include per-stage timings in the response"),
+    db: Session = Depends(merge_session("stg_hired_employees"))
+):
+    """
+    Replace a whole hire year of the fact table with the staging data.
+
+    The valid, deduplicated staging rows hired in that year are bulk loaded
+    into a new table that replaces the year's partition (detach, drop,
+    attach), instead of updating the existing rows one by one. Hires of the
+    year missing from staging are removed; staging rows of other years are
+    ignored. Employees loaded into the year are removed from any other year.
+    The gold rollup cube is adjusted in the same transaction.
+
+    Everything but the swap runs first: DETACH locks the fact against
+    readers until commit, so only the swap and the version record run
+    under that lock.
+
+    Args:
+        year: Hire year to replace
+        dedup_rule: Optional override of settings.hired_employees_dedup_rule
+        timings: Whether to add the per-stage timings to the response
+        db: Database session
+
+    Returns:
+        dict: Statistics about the replacement
+    """
+    rule = resolve_dedup_rule(dedup_rule)
+    timer = StageTimer("silver_merge", table="fact_hired_employees", operation="replace_year", year=year)
+
+    try:
+        with timer.stage("stage"):
+            staging_count = stage_hired_employees(db, rule)
+        with timer.stage("load"):
+            swap = load_fact_year(db, year, MERGE_SOURCE)
+        with timer.stage("gold_deltas"):
+            gold_keys_refreshed = apply_gold_deltas(db)
+        with timer.stage("stats"):
+            valid_records = db.execute(
+                text("SELECT COUNT(*) FROM tmp_hired_employees_merge WHERE occurrence = 1")
+            ).scalar()
+        with timer.stage("swap"):
+            swap_fact_year(db, year)
+
+        # Replicas serve reads again once they have replayed this version
+        with timer.stage("commit"):
+            persisted_version = record_data_version(db)
+            db.commit()
+
+        # Rows were removed as well as written, so the columnar engine reloads
+        replica_guard.note_merge(persisted_version)
+        rows = swap["loaded"] + swap["replaced"] + swap["moved"]
+        record_merge("fact_hired_employees", "replace_year", timer.elapsed(), rows)
+        timer.log(rows=rows)
+        columnar_engine.clear()
+
+        return {
+            "message": f"Hire year {year} replaced successfully",
+            "statistics": {
+                "year": year,
+                "total_processed": staging_count,
+                "loaded_records": swap["loaded"],
+                "replaced_records": swap["replaced"],
+                "moved_records": swap["moved"],
+                "other_year_records": valid_records - swap["loaded"],
+                "dedup_rule": rule,
+                "gold_keys_refreshed": gold_keys_refreshed
+            },
+            "data_version": persisted_version,
+            "status": "success",
+            **({"timings": timer.report()} if timings else {})
+        }
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "message": "Error during year replacement",
+                "error": str(e),
+                "hint": "Check validation details for specific issues"
+            }
+        )
@@ -1,6 +1,17 @@
-from .metrics import HiredByQuarterResponse, DepartmentAboveMeanResponse
+from .metrics import (
+    HiredByQuarterResponse,
+    DepartmentAboveMeanResponse,
+    HiredByQuarterPage,
+    DepartmentAboveMeanPage,
+    MetricQueryRow,
+    TimeSeriesPoint
+)
 
 __all__ = [
     "HiredByQuarterResponse",
-    "DepartmentAboveMeanResponse"
-] 
\ No newline at end of file
+    "DepartmentAboveMeanResponse",
+    "HiredByQuarterPage",
+    "DepartmentAboveMeanPage",
+    "MetricQueryRow",
+    "TimeSeriesPoint"
+]
@@ -1,3 +1,5 @@
+from datetime import date
+from typing import List, Optional
 from pydantic import BaseModel
 
 class HiredByQuarterResponse(BaseModel):
@@ -11,4 +13,27 @@ class HiredByQuarterResponse(BaseModel):
 class DepartmentAboveMeanResponse(BaseModel):
     id: int
     department: str
-    hired: int 
\ No newline at end of file
+    hired: int
+
+class HiredByQuarterPage(BaseModel):
+    items: List[HiredByQuarterResponse]
+    next_cursor: Optional[str] = None
+
+class DepartmentAboveMeanPage(BaseModel):
+    items: List[DepartmentAboveMeanResponse]
+    next_cursor: Optional[str] = None
+
+class MetricQueryRow(BaseModel):
+    period: Optional[date] = None
+    department_id: Optional[int] = None
+    department: Optional[str] = None
+    job_id: Optional[int] = None
+    job: Optional[str] = None
+    hired: int
+
+class TimeSeriesPoint(BaseModel):
+    period: date
+    hired: int
+    rolling_hired: int
+    rolling_average: float
+    cumulative_hired: int
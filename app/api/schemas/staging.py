@@ -5,7 +5,7 @@ This module defines the Pydantic models for staging data validation.
 Only validates field names and stores everything as strings for the bronze layer.
 """
 
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from pydantic import BaseModel, ConfigDict
 
 class StgDepartmentsBase(BaseModel):
@@ -51,5 +51,24 @@ class BatchUploadResponse(BaseModel):
     total_batches: int
     progress: List[str]
     errors: List[dict] = []
+    timings: Optional[Dict[str, Any]] = None
 
-    model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True) 
+class UploadSessionCreate(BaseModel):
+    """Schema for creating a resumable upload session."""
+    filename: str
+    total_bytes: Optional[int] = None
+
+class UploadSessionStatus(BaseModel):
+    """Schema for the progress of a resumable upload session."""
+    session_id: str
+    table: str
+    source_file: Optional[str] = None
+    status: str
+    offset: int
+    total_bytes: Optional[int] = None
+    rows_parsed: int
+    rows_written: int
+    rows_rejected: int
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,10 @@
+"""
+Services package.
+
+Shared database routines used by more than one layer's routes.
+"""
+
+from app.api.services.gold_aggregates import (
+    record_gold_deltas, apply_gold_deltas, rebuild_gold_aggregates
+)
+from app.api.services.columnar import columnar_engine
@@ -0,0 +1,363 @@
+"""
+In-process columnar gold engine.
+
+This module keeps fact_hired_employees in worker memory as compact NumPy
+arrays and answers the gold metrics with vectorized bincount group-bys, with
+no database round trip. It is enabled with settings.gold_engine = "columnar".
+
+Memory layout (21 bytes per fact row), sorted by hire time so a date window
+is a contiguous slice found by binary search:
+    hire_epoch (int64): Hire datetime as seconds since 1970-01-01
+    quarter (int8): Hire quarter, 0 to 3
+    ids (int32): Employee ids, used to apply merge deltas
+    department (int32): Department id
+    job (int32): Job id
+
+The fact table is read with COPY ... (FORMAT binary) and decoded straight into
+arrays. Department and job names live in small dictionary arrays. The fact
+merge applies its merged rows as a delta after committing and the dimension
+merges mark the dictionaries stale. Like the response cache, each worker holds
+its own copy, so changes made through another worker are picked up by a full
+reload once settings.gold_columnar_max_age_seconds has elapsed.
+
+Classes:
+    ColumnarGoldEngine: Columnar copy of the fact table and the gold computations.
+
+Variables:
+    columnar_engine: Process-wide engine used by the gold router
+"""
+
+import io
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+FACT_COLUMNS_SQL = '''
+    COPY (
+        SELECT
+            id_employee::int4,
+            EXTRACT(EPOCH FROM hire_datetime)::int8,
+            id_department::int4,
+            id_job::int4
+        FROM {table}
+        {where}
+    ) TO STDOUT (FORMAT binary)
+'''
+
+# One COPY binary row of FACT_COLUMNS_SQL: field count, then (length, value) per field
+COPY_HEADER_SIZE = 19
+DECODE_BUFFER_SIZE = 4 * 1024 * 1024
+COPY_ROW = np.dtype([
+    ("fields", ">i2"),
+    ("id_length", ">i4"), ("id", ">i4"),
+    ("epoch_length", ">i4"), ("epoch", ">i8"),
+    ("department_length", ">i4"), ("department", ">i4"),
+    ("job_length", ">i4"), ("job", ">i4"),
+])
+
+# Dimensions whose ids are all below this use a dense id -> index lookup array
+DENSE_LOOKUP_MAX_ID = 1 << 20
+
+EPOCH = datetime(1970, 1, 1)
+
+def to_epoch(value: datetime) -> int:
+    """Convert a naive datetime to the epoch seconds stored in hire_epoch."""
+    return int((value - EPOCH).total_seconds())
+
+def hire_quarter(hire_epoch: np.ndarray) -> np.ndarray:
+    """Return the 0-based calendar quarter of each epoch second."""
+    months = hire_epoch.astype("datetime64[s]").astype("datetime64[M]").astype(np.int64)
+    return ((months % 12) // 3).astype(np.int8)
+
+@dataclass(frozen=True)
+class FactColumns:
+    """Immutable snapshot of the fact table; replaced as a whole on every change."""
+    hire_epoch: np.ndarray
+    quarter: np.ndarray
+    ids: np.ndarray
+    department: np.ndarray
+    job: np.ndarray
+
+    @classmethod
+    def from_arrays(cls, ids, hire_epoch, department, job) -> "FactColumns":
+        order = np.argsort(hire_epoch, kind="stable")
+        hire_epoch = hire_epoch[order]
+        return cls(
+            hire_epoch=hire_epoch,
+            quarter=hire_quarter(hire_epoch),
+            ids=ids[order],
+            department=department[order],
+            job=job[order]
+        )
+
+    def window(self, start: datetime, end: datetime) -> slice:
+        """Slice of the rows hired within [start, end)."""
+        bounds = np.searchsorted(self.hire_epoch, [to_epoch(start), to_epoch(end)])
+        return slice(int(bounds[0]), int(bounds[1]))
+
+@dataclass(frozen=True)
+class Dimension:
+    """
+    Dictionary arrays of a dimension: sorted ids, and the rank of each id's name.
+
+    index_by_id maps an id straight to its index when ids are small enough for
+    a dense lookup array, which is much faster than a binary search per row.
+    Ids missing from the dimension map to -1.
+
+    Names are ranked in the order PostgreSQL sorts them (its collation), so
+    both gold engines return rows in the same order.
+    """
+    ids: np.ndarray
+    names: np.ndarray
+    name_rank: np.ndarray
+    index_by_id: Optional[np.ndarray]
+
+    @classmethod
+    def from_rows(cls, rows: List[Tuple[int, str, int]]) -> "Dimension":
+        """Build from (id, name, dense rank of the name in database order) rows."""
+        rows = sorted(rows)
+        ids = np.array([row[0] for row in rows], dtype=np.int32)
+        name_rank = np.array([row[2] for row in rows], dtype=np.int64)
+        # Rows are grouped and ordered by name, like the SQL queries do
+        names = np.empty(int(name_rank.max()) + 1 if len(rows) else 0, dtype=object)
+        names[name_rank] = [row[1] for row in rows]
+        index_by_id = None
+        if len(ids) and 0 <= ids[0] and ids[-1] < DENSE_LOOKUP_MAX_ID:
+            index_by_id = np.full(ids[-1] + 1, -1, dtype=np.intp)
+            index_by_id[ids] = np.arange(len(ids))
+        return cls(ids, names, name_rank, index_by_id)
+
+    def encode(self, values: np.ndarray) -> np.ndarray:
+        """Map dimension ids to dense indexes into ids / name_rank, -1 for ids missing from the dimension."""
+        if not len(self.ids):
+            return np.full(len(values), -1, dtype=np.intp)
+        if self.index_by_id is not None:
+            inside = (values >= 0) & (values < len(self.index_by_id))
+            return np.where(inside, self.index_by_id[np.where(inside, values, 0)], -1)
+        positions = np.minimum(np.searchsorted(self.ids, values), len(self.ids) - 1)
+        return np.where(self.ids[positions] == values, positions, -1)
+
+class ColumnarGoldEngine:
+    """
+    Columnar copy of fact_hired_employees and the gold computations over it.
+
+    Queries work on immutable snapshots, so a delta or reload never changes
+    arrays a running query is reading; loads and deltas are serialized by a lock.
+
+    Attributes:
+        loaded_at (float): time.monotonic() of the last full load, or None
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._facts: Optional[FactColumns] = None
+        self._dimensions: Optional[Tuple[Dimension, Dimension]] = None
+        self.loaded_at: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._facts is not None
+
+    def __len__(self) -> int:
+        return 0 if self._facts is None else len(self._facts.ids)
+
+    def load(self, db: Session) -> None:
+        """Read the whole fact table and both dimensions into memory."""
+        with self._lock:
+            self._facts = FactColumns.from_arrays(*_read_fact_columns(db, "fact_hired_employees"))
+            self._dimensions = _read_dimensions(db)
+            self.loaded_at = time.monotonic()
+
+    def invalidate_dimensions(self) -> None:
+        """Mark the name dictionaries stale; they are reloaded before the next query."""
+        self._dimensions = None
+
+    def clear(self) -> None:
+        """Drop everything; the next query performs a full load."""
+        with self._lock:
+            self._facts = None
+            self._dimensions = None
+            self.loaded_at = None
+
+    def read_delta(self, db: Session, table: str, where: str = "") -> Tuple[np.ndarray, ...]:
+        """
+        Read merged rows (id_employee, hire_datetime, id_department, id_job) from table.
+
+        Called by the fact merge before committing, while its staging table
+        still exists; the result is passed to apply_delta after the commit.
+        """
+        return _read_fact_columns(db, table, where)
+
+    def apply_delta(self, delta: Tuple[np.ndarray, ...]) -> None:
+        """
+        Upsert merged rows by employee id, mirroring the MERGE that produced them.
+
+        Previous versions of the merged ids are dropped and the new rows are
+        inserted at their hire time position. Does nothing until the engine
+        has been loaded.
+        """
+        with self._lock:
+            current = self._facts
+            if current is None or len(delta[0]) == 0:
+                return
+            changes = FactColumns.from_arrays(*delta)
+            keep = ~np.isin(current.ids, changes.ids)
+            position = np.searchsorted(current.hire_epoch[keep], changes.hire_epoch, side="right")
+            self._facts = FactColumns(**{
+                name: np.insert(getattr(current, name)[keep], position, getattr(changes, name))
+                for name in ("hire_epoch", "quarter", "ids", "department", "job")
+            })
+
+    def hired_by_quarter(self, db: Session, start: datetime, end: datetime) -> List[Tuple[str, str, int, int, int, int]]:
+        """
+        Hires per (department, job) and quarter within [start, end).
+
+        Returns:
+            list: (department, job, q1, q2, q3, q4) ordered by department and job
+        """
+        facts, _ = self._snapshot(db)
+        rows = facts.window(start, end)
+        (departments, jobs), (department_index, job_index) = self._encode(
+            db, facts.department[rows], facts.job[rows]
+        )
+        # Hires whose department or job is missing are left out, as by the joins of the SQL engine
+        known = (department_index >= 0) & (job_index >= 0)
+        n_jobs = len(jobs.names)
+        key = (
+            departments.name_rank[department_index[known]] * n_jobs
+            + jobs.name_rank[job_index[known]]
+        ) * 4 + facts.quarter[rows][known]
+        grid = np.bincount(key, minlength=len(departments.names) * n_jobs * 4).reshape(-1, 4)
+        return [
+            (departments.names[group // n_jobs], jobs.names[group % n_jobs], *map(int, grid[group]))
+            for group in np.flatnonzero(grid.sum(axis=1))
+        ]
+
+    def departments_above_mean(self, db: Session, start: datetime, end: datetime) -> List[Tuple[int, str, int]]:
+        """
+        Departments that hired more than the mean of all hiring departments within [start, end).
+
+        Returns:
+            list: (id, department, hired) ordered by hired (descending) and id
+        """
+        facts, _ = self._snapshot(db)
+        rows = facts.window(start, end)
+        (departments, _), (department_index,) = self._encode(db, facts.department[rows])
+        hired = np.bincount(department_index[department_index >= 0], minlength=len(departments.ids))
+        hiring = hired > 0
+        if not hiring.any():
+            return []
+        above = np.flatnonzero(hired > hired[hiring].mean())
+        above = above[np.lexsort((departments.ids[above], -hired[above]))]
+        return [
+            (int(departments.ids[i]), departments.names[departments.name_rank[i]], int(hired[i]))
+            for i in above
+        ]
+
+    def _snapshot(self, db: Session) -> Tuple[FactColumns, Tuple[Dimension, Dimension]]:
+        """Return consistent fact and dimension snapshots, loading whatever is missing or expired."""
+        with self._lock:
+            expired = (
+                self.loaded_at is None
+                or time.monotonic() - self.loaded_at > settings.gold_columnar_max_age_seconds
+            )
+            if expired:
+                self.load(db)
+            elif self._dimensions is None:
+                self._dimensions = _read_dimensions(db)
+            return self._facts, self._dimensions
+
+    def _encode(self, db: Session, departments: np.ndarray, jobs: Optional[np.ndarray] = None):
+        """
+        Encode department (and job) ids with the current dimensions.
+
+        A fact row can reference a dimension id this worker has not loaded
+        yet, e.g. when another worker merged the dimension before a fact delta
+        was applied here; the dimensions are then reloaded once.
+
+        Returns:
+            tuple: The dimensions used, and the encoded arrays (-1 for ids still missing)
+        """
+        for attempt in range(2):
+            with self._lock:
+                if attempt or self._dimensions is None:
+                    self._dimensions = _read_dimensions(db)
+                dimensions = self._dimensions
+            encoded = (dimensions[0].encode(departments),) + (() if jobs is None else (dimensions[1].encode(jobs),))
+            if all((codes >= 0).all() for codes in encoded):
+                break
+        return dimensions, encoded
+
+class _CopyDecoder(io.RawIOBase):
+    """
+    Write-only file object decoding COPY_ROW records.
+
+    psycopg2 writes one row per call, so rows are buffered and decoded with
+    np.frombuffer once DECODE_BUFFER_SIZE bytes have arrived.
+    """
+
+    def __init__(self) -> None:
+        self._buffer: List[bytes] = []
+        self._buffered = 0
+        self._header_skipped = False
+        self.chunks: List[np.ndarray] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer.append(data)
+        self._buffered += len(data)
+        if self._buffered >= DECODE_BUFFER_SIZE:
+            self.flush()
+        return len(data)
+
+    def flush(self) -> None:
+        buffer = b"".join(self._buffer)
+        offset = 0
+        if not self._header_skipped and len(buffer) >= COPY_HEADER_SIZE:
+            offset, self._header_skipped = COPY_HEADER_SIZE, True
+        count = (len(buffer) - offset) // COPY_ROW.itemsize if self._header_skipped else 0
+        if count:
+            self.chunks.append(np.frombuffer(buffer, dtype=COPY_ROW, count=count, offset=offset))
+        # Whatever is left is a partial row or the 2-byte trailer
+        rest = buffer[offset + count * COPY_ROW.itemsize:]
+        self._buffer, self._buffered = [rest], len(rest)
+
+def _read_fact_columns(db: Session, table: str, where: str = "") -> Tuple[np.ndarray, ...]:
+    """Read (id, hire epoch, department, job) columns from a fact-shaped table."""
+    decoder = _CopyDecoder()
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            FACT_COLUMNS_SQL.format(table=table, where=f"WHERE {where}" if where else ""),
+            decoder
+        )
+        decoder.flush()
+    finally:
+        cursor.close()
+    rows = np.concatenate(decoder.chunks) if decoder.chunks else np.empty(0, dtype=COPY_ROW)
+    return (
+        rows["id"].astype(np.int32),
+        rows["epoch"].astype(np.int64),
+        rows["department"].astype(np.int32),
+        rows["job"].astype(np.int32)
+    )
+
+def _read_dimensions(db: Session) -> Tuple[Dimension, Dimension]:
+    # Name ranks come from PostgreSQL so the order follows the database collation, as in the SQL engine
+    departments = db.execute(text(
+        "SELECT id_department, department, DENSE_RANK() OVER (ORDER BY department) - 1 FROM dim_departments"
+    )).fetchall()
+    jobs = db.execute(text("SELECT id_job, job, DENSE_RANK() OVER (ORDER BY job) - 1 FROM dim_jobs")).fetchall()
+    return Dimension.from_rows(departments), Dimension.from_rows(jobs)
+
+columnar_engine = ColumnarGoldEngine()
@@ -0,0 +1,101 @@
+"""
+Calendar date dimension maintenance.
+
+dim_date is generated rather than loaded: every calendar attribute is
+computed once here, when a day is added, so queries join on the date instead
+of extracting calendar parts per fact row. The migration fills
+DEFAULT_DATE_RANGE and the fact merge extends the table to whole years around
+the hire dates it writes, so every fact row has its day.
+
+Functions:
+    extend_dim_date: Add the days of a date range that are missing.
+    cover_hire_dates: Extend dim_date to the whole years of a set of hires.
+    missing_buckets: Count the buckets of a date range without any day in dim_date.
+"""
+
+from datetime import date, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Days generated by the migration, inclusive
+DEFAULT_DATE_RANGE = (date(2000, 1, 1), date(2035, 12, 31))
+
+DIM_DATE_INSERT_SQL = """
+    INSERT INTO dim_date (
+        date, year, quarter, month, day_of_month, day_of_week, iso_year, iso_week, week_start
+    )
+    SELECT
+        d::date,
+        EXTRACT(YEAR FROM d)::integer,
+        EXTRACT(QUARTER FROM d)::smallint,
+        EXTRACT(MONTH FROM d)::smallint,
+        EXTRACT(DAY FROM d)::smallint,
+        EXTRACT(ISODOW FROM d)::smallint,
+        EXTRACT(ISOYEAR FROM d)::integer,
+        EXTRACT(WEEK FROM d)::smallint,
+        date_trunc('week', d)::date
+    FROM generate_series(CAST(:first AS date), CAST(:last AS date), interval '1 day') AS d
+    ON CONFLICT (date) DO NOTHING
+"""
+
+def extend_dim_date(db: Session, first: date, last: date) -> int:
+    """
+    Add the days between first and last (inclusive) missing from dim_date.
+
+    The caller owns the transaction and must commit.
+
+    Args:
+        db: Database session
+        first: First day to cover
+        last: Last day to cover
+
+    Returns:
+        int: Number of days added
+    """
+    return db.execute(text(DIM_DATE_INSERT_SQL), {"first": first, "last": last}).rowcount
+
+def cover_hire_dates(db: Session, source: str) -> int:
+    """
+    Extend dim_date to the whole years spanned by the hire dates of source.
+
+    Whole years keep calendar series of those years gap-free even on days
+    before the first or after the last hire.
+
+    Args:
+        db: Database session
+        source: Relation (or subquery) with a hire_datetime column
+
+    Returns:
+        int: Number of days added
+    """
+    bounds = db.execute(text(f"""
+        SELECT MIN(hire_datetime), MAX(hire_datetime)
+        FROM {source} s
+    """)).fetchone()
+    if bounds[0] is None:
+        return 0
+    return extend_dim_date(db, date(bounds[0].year, 1, 1), date(bounds[1].year, 12, 31))
+
+def missing_buckets(db: Session, column: str, first: date, end: date, step: timedelta) -> int:
+    """
+    Count the buckets of a half-open range that have no day in dim_date.
+
+    Series built on dim_date have a hole instead of a zero for such buckets,
+    so readers check their window first.
+
+    Args:
+        db: Database session
+        column: dim_date column labelling the bucket of a day ("date" or "week_start")
+        first: Start of the first bucket
+        end: End of the last bucket (exclusive)
+        step: Length of a bucket
+
+    Returns:
+        int: Number of buckets without any dim_date row
+    """
+    covered = db.execute(
+        text(f"SELECT COUNT(DISTINCT {column}) FROM dim_date WHERE date >= :first AND date < :end"),
+        {"first": first, "end": end}
+    ).scalar()
+    return (end - first) // step - covered
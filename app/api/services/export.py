@@ -0,0 +1,224 @@
+"""
+Columnar export of query results.
+
+This module streams the result of a SQL query as Arrow IPC, Parquet or CSV,
+built batch by batch from a server-side cursor so memory stays flat regardless
+of result size. CSV uses the standard library; Arrow IPC and Parquet require
+the optional pyarrow dependency.
+
+Functions:
+    negotiate_format: Pick the export format from the format parameter or Accept header.
+    export_response: Build a StreamingResponse for a query in the given format.
+"""
+
+import csv
+import io
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import text
+
+from app.core.database import open_read_session
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pa = None
+    pq = None
+
+# Export format -> media type
+FORMATS = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+    "csv": "text/csv",
+}
+DEFAULT_FORMAT = "csv"
+
+# Rows fetched per round trip and written per Arrow batch / Parquet row group
+EXPORT_BATCH_SIZE = 10000
+
+# Column kind -> pyarrow type factory
+ARROW_TYPES = {
+    "int": lambda: pa.int64(),
+    "str": lambda: pa.string(),
+    "datetime": lambda: pa.timestamp("us"),
+}
+
+def negotiate_format(format: Optional[str], accept: Optional[str]) -> str:
+    """
+    Pick the export format.
+
+    An explicit format parameter wins. Otherwise the Accept header is matched
+    against the supported media types by quality; */* or no header selects CSV.
+
+    Args:
+        format: Value of the format query parameter
+        accept: Value of the Accept header
+
+    Returns:
+        str: One of the FORMATS keys
+
+    Raises:
+        HTTPException: 406 if no supported format is acceptable, or if pyarrow
+            is needed but not installed
+    """
+    if format:
+        chosen = format.lower()
+        if chosen not in FORMATS:
+            raise HTTPException(
+                status_code=406,
+                detail=f"Unsupported format '{format}'. Use one of: {', '.join(FORMATS)}"
+            )
+    else:
+        chosen = _match_accept(accept)
+    if chosen in ("arrow", "parquet") and pa is None:
+        raise HTTPException(
+            status_code=406,
+            detail=f"Format '{chosen}' requires pyarrow, which is not installed"
+        )
+    return chosen
+
+def _match_accept(accept: Optional[str]) -> str:
+    """Return the best supported format for an Accept header."""
+    if not accept:
+        return DEFAULT_FORMAT
+    by_media_type = {media_type: name for name, media_type in FORMATS.items()}
+    candidates: List[Tuple[float, int, str]] = []
+    for position, item in enumerate(accept.split(",")):
+        media_type, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        media_type = media_type.strip().lower()
+        if quality <= 0:
+            continue
+        if media_type in by_media_type:
+            candidates.append((quality, -position, by_media_type[media_type]))
+        elif media_type in ("*/*", "text/*", "application/*"):
+            fallback = "csv" if media_type != "application/*" else "arrow"
+            candidates.append((quality - 0.001, -position, fallback))
+    if not candidates:
+        raise HTTPException(
+            status_code=406,
+            detail=f"None of the requested media types are supported: {', '.join(FORMATS.values())}"
+        )
+    return max(candidates)[2]
+
+def export_response(
+    sql: str,
+    params: Dict[str, Any],
+    columns: List[Tuple[str, str]],
+    format: str,
+    filename: str
+) -> StreamingResponse:
+    """
+    Stream a query result in the requested format.
+
+    The session is opened inside the generator because request-scoped
+    dependencies are closed before a streaming body is sent.
+
+    Args:
+        sql: Query to export; its select list must match columns
+        params: Bound parameters of the query
+        columns: (name, kind) pairs, kind being one of "int", "str", "datetime"
+        format: One of the FORMATS keys, see negotiate_format
+        filename: Download name without extension
+
+    Returns:
+        StreamingResponse: The encoded result, with a Content-Disposition header
+    """
+    writers = {"arrow": _arrow_stream, "parquet": _parquet_stream, "csv": _csv_stream}
+    body = writers[format](_fetch_batches(sql, params), columns)
+    extension = {"arrow": "arrows", "parquet": "parquet", "csv": "csv"}[format]
+    return StreamingResponse(
+        body,
+        media_type=FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{extension}"'}
+    )
+
+def _fetch_batches(sql: str, params: Dict[str, Any]) -> Iterator[List[Any]]:
+    """Yield lists of rows from a server-side cursor."""
+    db = open_read_session()
+    try:
+        result = db.execute(
+            text(sql), params, execution_options={"yield_per": EXPORT_BATCH_SIZE}
+        )
+        for partition in result.partitions(EXPORT_BATCH_SIZE):
+            yield partition
+    finally:
+        db.close()
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object collecting what pyarrow writes until drained."""
+
+    def __init__(self) -> None:
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+def _arrow_schema(columns: List[Tuple[str, str]]):
+    return pa.schema([(name, ARROW_TYPES[kind]()) for name, kind in columns])
+
+def _record_batch(rows: List[Any], schema):
+    """Transpose a list of rows into an Arrow record batch."""
+    arrays = [
+        pa.array([row[i] for row in rows], type=field.type)
+        for i, field in enumerate(schema)
+    ]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+def _arrow_stream(batches: Iterator[List[Any]], columns: List[Tuple[str, str]]) -> Iterator[bytes]:
+    schema = _arrow_schema(columns)
+    sink = _ChunkSink()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for rows in batches:
+            writer.write_batch(_record_batch(rows, schema))
+            yield sink.drain()
+    yield sink.drain()
+
+def _parquet_stream(batches: Iterator[List[Any]], columns: List[Tuple[str, str]]) -> Iterator[bytes]:
+    schema = _arrow_schema(columns)
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for rows in batches:
+            # One row group per batch
+            writer.write_batch(_record_batch(rows, schema))
+            yield sink.drain()
+    yield sink.drain()
+
+def _csv_stream(batches: Iterator[List[Any]], columns: List[Tuple[str, str]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in columns])
+    for rows in batches:
+        writer.writerows(
+            [value.isoformat() if hasattr(value, "isoformat") else value for value in row]
+            for row in rows
+        )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue().encode()
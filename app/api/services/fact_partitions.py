@@ -0,0 +1,190 @@
+"""
+Hire year partitions of fact_hired_employees.
+
+fact_hired_employees is RANGE partitioned on hire_datetime with one partition
+per calendar year, named fact_hired_employees_y<year>. Queries with a
+hire_datetime range only read the partitions of the years they cover.
+
+There is no default partition: rows may only be written once the partition of
+their year exists, which the fact merge ensures before its MERGE. Loaders that
+bypass the merge must call ensure_fact_partitions first.
+
+PostgreSQL requires the partition key in every unique constraint, so the
+primary key is (id_employee, hire_datetime). A single row per employee id is
+kept by the merge, which matches on id_employee across all years, and by
+load_fact_year, which removes the employees it loads from other years.
+
+Functions:
+    fact_partition_years: List the years that have a partition.
+    ensure_fact_partitions: Create the partitions of the years spanned by a set of hires.
+    load_fact_year: Build the replacement partition of a year from a set of hires.
+    swap_fact_year: Swap the partition of a year for the one built by load_fact_year.
+"""
+
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.api.services.gold_aggregates import record_gold_deltas
+
+FACT_TABLE = "fact_hired_employees"
+
+# Index name suffix -> definition of every index of the fact, built on replacement partitions
+PARTITION_INDEXES = {
+    "pkey": "PRIMARY KEY (id_employee, hire_datetime)",
+    "hire_datetime_idx": "(hire_datetime) INCLUDE (id_department, id_job)",
+    "id_department_idx": "(id_department)",
+    "id_job_idx": "(id_job)",
+}
+
+def partition_name(year: int) -> str:
+    """Name of the partition holding the hires of year."""
+    return f"{FACT_TABLE}_y{int(year)}"
+
+def year_bounds(year: int) -> str:
+    """FOR VALUES clause of the partition of year."""
+    return f"FROM ('{int(year):04d}-01-01') TO ('{int(year) + 1:04d}-01-01')"
+
+def year_predicate(year: int, alias: str = "") -> str:
+    """hire_datetime range predicate of year, on the relation aliased alias if given."""
+    column = f"{alias}.hire_datetime" if alias else "hire_datetime"
+    start, end = datetime(year, 1, 1).isoformat(), datetime(year + 1, 1, 1).isoformat()
+    return f"{column} >= '{start}' AND {column} < '{end}'"
+
+def fact_partition_years(db: Session) -> List[int]:
+    """
+    List the years that have a partition attached to the fact table.
+
+    Args:
+        db: Database session
+
+    Returns:
+        List[int]: Years in ascending order
+    """
+    names = db.execute(text("""
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = CAST(:table AS regclass)
+    """), {"table": FACT_TABLE}).scalars()
+    prefix = f"{FACT_TABLE}_y"
+    return sorted(int(name[len(prefix):]) for name in names if name.startswith(prefix))
+
+def create_fact_partition(db: Session, year: int) -> None:
+    """Create the (empty) partition of year if it does not exist."""
+    db.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {partition_name(year)} "
+        f"PARTITION OF {FACT_TABLE} FOR VALUES {year_bounds(year)}"
+    ))
+
+def ensure_fact_partitions(db: Session, source: str) -> List[int]:
+    """
+    Create the missing partitions of every year between the first and last
+    hire of source.
+
+    The caller owns the transaction and must commit.
+
+    Args:
+        db: Database session
+        source: Relation (or subquery) with a hire_datetime column
+
+    Returns:
+        List[int]: Years whose partition was created
+    """
+    bounds = db.execute(text(f"""
+        SELECT MIN(hire_datetime), MAX(hire_datetime)
+        FROM {source} s
+    """)).fetchone()
+    if bounds[0] is None:
+        return []
+    existing = set(fact_partition_years(db))
+    created = [year for year in range(bounds[0].year, bounds[1].year + 1) if year not in existing]
+    for year in created:
+        create_fact_partition(db, year)
+    return created
+
+def load_fact_year(db: Session, year: int, source: str) -> Dict[str, int]:
+    """
+    Build the replacement of the partition of year from the hires of source in that year.
+
+    The new rows are bulk loaded into a standalone table, indexed like the
+    fact and analyzed, without locking the fact for readers. Employees of
+    source found in other years are removed from those years, and the gold
+    rollup cube deltas are recorded before any change.
+
+    The caller owns the transaction. It should run apply_gold_deltas and any
+    other work of the transaction before swap_fact_year, since the exclusive
+    lock taken by the swap is held until commit.
+
+    Args:
+        db: Database session
+        year: Hire year to replace
+        source: Relation (or subquery) with one row per employee id and
+            id_employee, name, hire_datetime, id_department and id_job columns
+
+    Returns:
+        Dict[str, int]: loaded (rows of source in year), replaced (rows of the
+            previous partition) and moved (rows removed from other years)
+    """
+    partition, staged = partition_name(year), f"{partition_name(year)}_load"
+    rows = f"(SELECT * FROM {source} s WHERE {year_predicate(year, 's')})"
+
+    create_fact_partition(db, year)
+    record_gold_deltas(db, rows, replaced=year_predicate(year, "f"))
+
+    # Build the replacement outside the partition tree; the CHECK constraint
+    # proves the bounds, so ATTACH PARTITION skips its validation scan
+    db.execute(text(f"DROP TABLE IF EXISTS {staged}"))
+    db.execute(text(f"""
+        CREATE TABLE {staged} (
+            LIKE {FACT_TABLE} INCLUDING DEFAULTS,
+            CONSTRAINT {staged}_bounds CHECK ({year_predicate(year)})
+        )
+    """))
+    loaded = db.execute(text(f"""
+        INSERT INTO {staged} (id_employee, name, hire_datetime, id_department, id_job)
+        SELECT id_employee, name, hire_datetime, id_department, id_job
+        FROM {rows} s
+        ORDER BY hire_datetime
+    """)).rowcount
+    # Same definitions as the fact's indexes, so ATTACH adopts them instead of building
+    for suffix, definition in PARTITION_INDEXES.items():
+        if suffix == "pkey":
+            db.execute(text(f"ALTER TABLE {staged} ADD CONSTRAINT {staged}_{suffix} {definition}"))
+        else:
+            db.execute(text(f"CREATE INDEX {staged}_{suffix} ON {staged} {definition}"))
+    # Statistics belong to the table, so they survive the rename and attach
+    db.execute(text(f"ANALYZE {staged}"))
+
+    moved = db.execute(text(f"""
+        DELETE FROM {FACT_TABLE} f
+        USING {staged} s
+        WHERE f.id_employee = s.id_employee
+            AND NOT ({year_predicate(year, "f")})
+    """)).rowcount
+    replaced = db.execute(text(f"SELECT COUNT(*) FROM {partition}")).scalar()
+
+    return {"loaded": loaded, "replaced": replaced, "moved": moved}
+
+def swap_fact_year(db: Session, year: int) -> None:
+    """
+    Replace the partition of year with the table built by load_fact_year.
+
+    DETACH PARTITION takes an ACCESS EXCLUSIVE lock on the fact, which
+    blocks every reader until the caller commits, so the caller should
+    commit right after.
+
+    Args:
+        db: Database session
+        year: Hire year to replace
+    """
+    partition, staged = partition_name(year), f"{partition_name(year)}_load"
+    db.execute(text(f"ALTER TABLE {FACT_TABLE} DETACH PARTITION {partition}"))
+    db.execute(text(f"DROP TABLE {partition}"))
+    db.execute(text(f"ALTER TABLE {staged} RENAME TO {partition}"))
+    for suffix in PARTITION_INDEXES:
+        db.execute(text(f"ALTER INDEX {staged}_{suffix} RENAME TO {partition}_{suffix}"))
+    db.execute(text(f"ALTER TABLE {FACT_TABLE} ATTACH PARTITION {partition} FOR VALUES {year_bounds(year)}"))
+    db.execute(text(f"ALTER TABLE {partition} DROP CONSTRAINT {staged}_bounds"))
@@ -0,0 +1,135 @@
+"""
+Gold aggregate maintenance.
+
+This module keeps the rollup cube agg_hires_dept_job_period in sync with
+fact_hired_employees.
+
+Before its MERGE, the fact merge records signed count deltas in the temporary
+table DELTAS_TABLE: +1 on the (department, job, month) of every merged row and
+-1 on the current key of every fact row it will update. apply_gold_deltas then
+adds them to the cube, in the same transaction as the merge, so the cost is
+proportional to the merged rows rather than to the fact.
+
+Calendar keys come from dim_date, joined on the hire date, which both
+functions first extend to cover the hires they read.
+
+Functions:
+    record_gold_deltas: Compute the cube deltas of a pending merge.
+    apply_gold_deltas: Add the recorded deltas to the cube.
+    rebuild_gold_aggregates: Recompute the whole cube from the fact table.
+"""
+
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.api.services.date_dimension import cover_hire_dates
+
+# Temporary table (id_department, id_job, year, quarter, month, delta) filled before the MERGE
+DELTAS_TABLE = "tmp_gold_deltas"
+
+# Cube key of hires aliased c, read from their day in dim_date
+CUBE_KEY_SELECT = "c.id_department, c.id_job, d.year, d.quarter, d.month"
+DATE_JOIN = "JOIN dim_date d ON d.date = c.hire_datetime::date"
+
+def record_gold_deltas(db: Session, source: str, replaced: Optional[str] = None) -> None:
+    """
+    Compute the cube deltas of a merge that has not run yet.
+
+    Must be called before the MERGE, while the fact still holds the previous
+    values of the rows being updated. Rows whose key does not change cancel out.
+
+    Args:
+        db: Database session
+        source: Relation (or subquery) of the rows about to be merged, with
+            id_employee, hire_datetime, id_department and id_job columns
+        replaced: Optional predicate on the fact (aliased f) selecting rows
+            that will be removed even if source does not contain them
+    """
+    # Previous rows of the merged employees, plus every replaced row. The
+    # replaced predicate is kept out of the join so the fact can prune on it.
+    updated, removed = "", ""
+    if replaced:
+        updated = f"WHERE NOT ({replaced})"
+        removed = f"""
+            UNION ALL
+            SELECT f.hire_datetime, f.id_department, f.id_job, -1 AS delta
+            FROM fact_hired_employees f
+            WHERE {replaced}
+        """
+    cover_hire_dates(db, source)
+    db.execute(text(f"""
+        CREATE TEMPORARY TABLE {DELTAS_TABLE} ON COMMIT DROP AS
+        SELECT {CUBE_KEY_SELECT}, SUM(c.delta)::integer AS delta
+        FROM (
+            SELECT s.hire_datetime, s.id_department, s.id_job, 1 AS delta
+            FROM {source} s
+            UNION ALL
+            SELECT f.hire_datetime, f.id_department, f.id_job, -1 AS delta
+            FROM fact_hired_employees f
+            JOIN {source} s ON s.id_employee = f.id_employee
+            {updated}
+            {removed}
+        ) c
+        {DATE_JOIN}
+        GROUP BY 1, 2, 3, 4, 5
+        HAVING SUM(c.delta) <> 0
+    """))
+
+def apply_gold_deltas(db: Session) -> int:
+    """
+    Add the deltas recorded by record_gold_deltas to the cube.
+
+    Keys whose count drops to zero are removed. The caller owns the
+    transaction and must commit.
+
+    Args:
+        db: Database session holding the deltas temporary table
+
+    Returns:
+        int: Number of cube keys changed
+    """
+    changed = db.execute(text(f"""
+        INSERT INTO agg_hires_dept_job_period (id_department, id_job, year, quarter, month, hired)
+        SELECT id_department, id_job, year, quarter, month, delta
+        FROM {DELTAS_TABLE}
+        ORDER BY 1, 2, 3, 4, 5
+        ON CONFLICT (id_department, id_job, year, quarter, month) DO UPDATE
+        SET hired = agg_hires_dept_job_period.hired + EXCLUDED.hired,
+            refreshed_timestamp = now()
+    """)).rowcount
+    db.execute(text(f"""
+        DELETE FROM agg_hires_dept_job_period a
+        USING {DELTAS_TABLE} d
+        WHERE a.id_department = d.id_department
+            AND a.id_job = d.id_job
+            AND a.year = d.year
+            AND a.quarter = d.quarter
+            AND a.month = d.month
+            AND a.hired <= 0
+    """))
+    return changed
+
+def rebuild_gold_aggregates(db: Session) -> int:
+    """
+    Recompute the whole cube from fact_hired_employees.
+
+    Used to backfill the cube, e.g. after loading the fact table outside of
+    the merge endpoint. The caller owns the transaction and must commit.
+
+    Args:
+        db: Database session
+
+    Returns:
+        int: Number of cube keys written
+    """
+    cover_hire_dates(db, "fact_hired_employees")
+    db.execute(text("TRUNCATE TABLE agg_hires_dept_job_period"))
+    return db.execute(text(f"""
+        INSERT INTO agg_hires_dept_job_period (id_department, id_job, year, quarter, month, hired)
+        SELECT {CUBE_KEY_SELECT}, COUNT(*)
+        FROM fact_hired_employees c
+        {DATE_JOIN}
+        GROUP BY 1, 2, 3, 4, 5
+    """)).rowcount
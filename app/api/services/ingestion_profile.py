@@ -0,0 +1,213 @@
+"""
+Single-pass profiling of bronze loads.
+
+A LoadProfiler is fed every CSV row of an upload in the same loop that
+validates it, so checking a load (null rates, distinct ids, hire date range,
+why rows were rejected) needs no further scan of the staging table. Memory
+stays constant whatever the file size: distinct values are estimated with a
+HyperLogLog sketch per column instead of being kept.
+
+The profile of each load is stored in ingestion_profiles and served by
+GET /api/v1/bronze/profiles. A load spread over several requests (a
+resumable upload session) checkpoints the profiler with state() and
+resumes it with LoadProfiler.from_state().
+
+Classes:
+    ApproxDistinct: HyperLogLog estimate of the number of distinct values.
+    LoadProfiler: Column statistics, hire datetime range and error reasons of a load.
+"""
+
+import base64
+import hashlib
+import math
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.api.models.diagnostics.ingestion_profile import IngestionProfile
+
+# Most frequent error reasons kept per load
+TOP_ERRORS = 5
+
+DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def format_datetime(value: Optional[datetime]) -> Optional[str]:
+    """Checkpoint form of a tracked datetime, zero-padded in DATETIME_FORMAT."""
+    return value.strftime(DATETIME_FORMAT) if value else None
+
+
+def parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Tracked datetime of a checkpoint written by format_datetime."""
+    return datetime.strptime(value, DATETIME_FORMAT) if value else None
+
+
+class ApproxDistinct:
+    """
+    HyperLogLog sketch of the distinct values added to it.
+
+    With the default precision of 12 (4096 one-byte registers) the standard
+    error of the estimate is about 1.6%; small counts are exact in practice
+    thanks to the linear counting correction.
+
+    Values are hashed with BLAKE2b rather than the built-in hash, which is
+    salted per process, so a sketch checkpointed by one worker can be
+    resumed by another.
+    """
+
+    def __init__(self, precision: int = 12) -> None:
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+        self._width = 64 - precision
+
+    def add(self, value: str) -> None:
+        """Add a value to the sketch."""
+        hashed = int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "little")
+        index = hashed & (len(self.registers) - 1)
+        rank = self._width - (hashed >> self.precision).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def estimate(self) -> int:
+        """Estimated number of distinct values added."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        empty = self.registers.count(0)
+        if raw <= 2.5 * m and empty:
+            return round(m * math.log(m / empty))
+        return round(raw)
+
+
+class LoadProfiler:
+    """
+    Profile of one bronze load, built row by row.
+
+    Attributes:
+        table (str): Staging table loaded
+        columns (Sequence[str]): CSV columns, in file order
+        datetime_column (Optional[str]): Key of the validated rows whose range is tracked
+        rows (int): CSV rows observed
+        accepted (int): Rows that passed validation
+        nulls (List[int]): Rows missing each column (too few fields)
+        empty (List[int]): Rows with each column present but blank
+        distinct (List[ApproxDistinct]): Distinct non-blank values of each column
+        errors (Counter): Error reason -> rejected rows
+    """
+
+    def __init__(self, table: str, columns: Sequence[str], datetime_column: Optional[str] = None) -> None:
+        self.table = table
+        self.columns = list(columns)
+        self.datetime_column = datetime_column
+        self.rows = 0
+        self.accepted = 0
+        self.nulls = [0] * len(self.columns)
+        self.empty = [0] * len(self.columns)
+        self.distinct = [ApproxDistinct() for _ in self.columns]
+        self.errors: Counter = Counter()
+        self.min_datetime: Optional[datetime] = None
+        self.max_datetime: Optional[datetime] = None
+
+    def observe(self, row: List[str], data: Optional[Dict] = None, error: Optional[Dict] = None) -> None:
+        """
+        Add a CSV row and the outcome of its validation to the profile.
+
+        Args:
+            row: Fields of the CSV row
+            data: Validated row, when it was accepted
+            error: Error dict (with an "error" reason), when it was rejected
+        """
+        self.rows += 1
+        for position, value in enumerate(row[:len(self.columns)]):
+            if value.strip():
+                self.distinct[position].add(value)
+            else:
+                self.empty[position] += 1
+        for position in range(len(row), len(self.columns)):
+            self.nulls[position] += 1
+        if error is not None:
+            self.errors[error["error"]] += 1
+        elif data is not None:
+            self.accepted += 1
+            if self.datetime_column:
+                # strptime accepts fields without zero padding, so compare parsed values
+                value = datetime.strptime(data[self.datetime_column], DATETIME_FORMAT)
+                if self.min_datetime is None or value < self.min_datetime:
+                    self.min_datetime = value
+                if self.max_datetime is None or value > self.max_datetime:
+                    self.max_datetime = value
+
+    def state(self) -> Dict:
+        """JSON-ready state of the profiler, restored by from_state."""
+        return {
+            "table": self.table,
+            "columns": self.columns,
+            "datetime_column": self.datetime_column,
+            "rows": self.rows,
+            "accepted": self.accepted,
+            "nulls": self.nulls,
+            "empty": self.empty,
+            "registers": [base64.b64encode(sketch.registers).decode() for sketch in self.distinct],
+            "errors": dict(self.errors),
+            "min_datetime": format_datetime(self.min_datetime),
+            "max_datetime": format_datetime(self.max_datetime),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "LoadProfiler":
+        """Profiler resumed from a state() checkpoint."""
+        profiler = cls(state["table"], state["columns"], state["datetime_column"])
+        profiler.rows = state["rows"]
+        profiler.accepted = state["accepted"]
+        profiler.nulls = list(state["nulls"])
+        profiler.empty = list(state["empty"])
+        for sketch, registers in zip(profiler.distinct, state["registers"]):
+            sketch.registers = bytearray(base64.b64decode(registers))
+        profiler.errors = Counter(state["errors"])
+        profiler.min_datetime = parse_datetime(state["min_datetime"])
+        profiler.max_datetime = parse_datetime(state["max_datetime"])
+        return profiler
+
+    def summary(self) -> Dict:
+        """Per-column null, empty and approximate distinct counts, and the top error reasons."""
+        return {
+            "columns": {
+                column: {
+                    "nulls": self.nulls[position],
+                    "empty": self.empty[position],
+                    "approx_distinct": self.distinct[position].estimate(),
+                }
+                for position, column in enumerate(self.columns)
+            },
+            "top_errors": [{"error": reason, "rows": count} for reason, count in self.errors.most_common(TOP_ERRORS)],
+        }
+
+    def save(self, db: Session, source_file: Optional[str], written: int) -> IngestionProfile:
+        """
+        Store the profile of the load in ingestion_profiles and commit it.
+
+        Args:
+            db: Session of the upload
+            source_file: Name of the uploaded file
+            written: Rows written to the staging table
+
+        Returns:
+            IngestionProfile: The stored profile
+        """
+        summary = self.summary()
+        profile = IngestionProfile(
+            table_name=self.table,
+            source_file=source_file,
+            rows_parsed=self.rows,
+            rows_written=written,
+            rows_rejected=sum(self.errors.values()),
+            min_hire_datetime=self.min_datetime,
+            max_hire_datetime=self.max_datetime,
+            columns=summary["columns"],
+            top_errors=summary["top_errors"],
+        )
+        db.add(profile)
+        db.commit()
+        return profile
@@ -0,0 +1,200 @@
+"""
+Generic hires metric query compiler.
+
+This module turns a metric query (dimensions, time grain, filters) into one
+parameterized SQL aggregate. Month-aligned windows at month grain or coarser
+are read from the rollup cube agg_hires_dept_job_period; anything else reads
+fact_hired_employees under the sargable hire_datetime range predicate served
+by the covering index. Either source is aggregated by ids first, and the
+dimension names are joined to the grouped rows only.
+
+Only whitelisted identifiers are ever interpolated into the SQL; every value
+(date range, filter ids) is a bound parameter. The statement therefore depends
+on the query shape alone and is compiled once per shape.
+
+Time series are built on the calendar dimension dim_date instead: the fact
+is counted per hire date, left-joined from every day of the window so days
+without hires count as zero, bucketed by the day or ISO week precomputed in
+dim_date, and the rolling metrics are window functions over those buckets.
+
+Functions:
+    compile_metric_query: Build (and cache) the statement for a query shape.
+    compile_timeseries_query: Build (and cache) the statement for a time series shape.
+"""
+
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
+
+# Dimension -> (fact column, dimension table, dimension id column, name column)
+DIMENSIONS = {
+    "department": ("id_department", "dim_departments", "id_department", "department"),
+    "job": ("id_job", "dim_jobs", "id_job", "job"),
+}
+
+GRAINS = ("day", "month", "quarter", "year")
+
+# Grains the rollup cube can answer -> period expression over its (year, quarter, month) key
+ROLLUP_PERIODS = {
+    "month": "make_date(s.year, s.month, 1)",
+    "quarter": "make_date(s.year, s.quarter * 3 - 2, 1)",
+    "year": "make_date(s.year, 1, 1)",
+}
+
+# Filter -> predicate on either source, bound to a list of ids
+FILTERS = {
+    "department": "s.id_department = ANY(:department_ids)",
+    "job": "s.id_job = ANY(:job_ids)",
+}
+
+# Time series grain -> bucket column of dim_date
+SERIES_PERIODS = {
+    "day": "date",
+    "week": "week_start",
+}
+
+# Sort key of every compiled statement, by output column name
+ORDER_BY_COLUMNS = "q.period, q.department, q.department_id, q.job, q.job_id"
+
+# Distinct query shapes kept compiled
+COMPILED_QUERY_CACHE_SIZE = 128
+
+@lru_cache(maxsize=COMPILED_QUERY_CACHE_SIZE)
+def compile_metric_query(
+    dimensions: Tuple[str, ...],
+    grain: Optional[str],
+    filters: Tuple[str, ...],
+    rollup: bool = False
+) -> TextClause:
+    """
+    Build the aggregate statement for a query shape.
+
+    Callers must pass dimensions and filters in canonical (DIMENSIONS) order
+    so equivalent shapes share one cache entry.
+
+    Args:
+        dimensions: Dimensions to group by, subset of DIMENSIONS
+        grain: Time bucket, one of GRAINS, or None for the whole range
+        filters: Dimensions filtered by id, subset of FILTERS
+        rollup: Read the rollup cube instead of the fact; only valid for
+            month-aligned windows and grains in ROLLUP_PERIODS (or None)
+
+    Returns:
+        TextClause: Statement with one :<dimension>_ids parameter per filter
+            and the window bound as :start / :end, or for the rollup as
+            :start_year, :start_month, :end_year, :end_month. Returns
+            (period, department_id, department, job_id, job, hired), with
+            null for the dimensions not grouped by
+    """
+    unknown = (set(dimensions) - set(DIMENSIONS)) | (set(filters) - set(FILTERS))
+    if unknown or (grain is not None and grain not in GRAINS) or \
+            (rollup and grain is not None and grain not in ROLLUP_PERIODS):
+        raise ValueError(f"Unsupported metric query shape: {dimensions}, {grain}, {filters}, {rollup}")
+
+    if rollup:
+        source, measure = "agg_hires_dept_job_period", "COALESCE(SUM(s.hired), 0)"
+        period = ROLLUP_PERIODS.get(grain)
+        predicates = [
+            "(s.year, s.month) >= (:start_year, :start_month)",
+            "(s.year, s.month) < (:end_year, :end_month)",
+        ]
+    else:
+        source, measure = "fact_hired_employees", "COUNT(*)"
+        period = f"date_trunc('{grain}', s.hire_datetime)::date"
+        predicates = ["s.hire_datetime >= :start", "s.hire_datetime < :end"]
+
+    keys, outer_columns, joins, order_by = [], [], [], []
+    if grain:
+        keys.append(f"{period} AS period")
+        outer_columns.append("h.period")
+        order_by.append("h.period")
+    else:
+        outer_columns.append("NULL::date AS period")
+    for dimension, (fact_column, table, id_column, name_column) in DIMENSIONS.items():
+        if dimension not in dimensions:
+            # Every shape returns the same columns, null when not grouped by
+            outer_columns += [f"NULL::integer AS {dimension}_id", f"NULL::text AS {dimension}"]
+            continue
+        alias = dimension[0]
+        keys.append(f"s.{fact_column}")
+        outer_columns += [f"h.{fact_column} AS {dimension}_id", f"{alias}.{name_column} AS {dimension}"]
+        joins.append(f"JOIN {table} {alias} ON {alias}.{id_column} = h.{fact_column}")
+        order_by += [f"{alias}.{name_column}", f"h.{fact_column}"]
+
+    predicates += [FILTERS[name] for name in filters]
+    group_by = f"GROUP BY {', '.join(str(i + 1) for i in range(len(keys)))}" if keys else ""
+    sql = f'''
+        WITH hires AS (
+            SELECT {''.join(key + ', ' for key in keys)}{measure} AS hired
+            FROM {source} s
+            WHERE {' AND '.join(predicates)}
+            {group_by}
+        )
+        SELECT {', '.join(outer_columns)}, h.hired
+        FROM hires h
+        {' '.join(joins)}
+        {'ORDER BY ' + ', '.join(order_by) if order_by else ''}
+    '''
+    return text(sql)
+
+@lru_cache(maxsize=COMPILED_QUERY_CACHE_SIZE)
+def compile_timeseries_query(grain: str, filters: Tuple[str, ...]) -> TextClause:
+    """
+    Build the rolling time series statement for a grain and filter shape.
+
+    Buckets are counted from :lookback_start so the rolling window of the
+    first returned bucket is complete; only buckets from :start on are returned,
+    and the cumulative count starts there. Days missing from dim_date are
+    missing from the series.
+
+    Args:
+        grain: Bucket, one of SERIES_PERIODS
+        filters: Dimensions filtered by id, subset of FILTERS, in canonical order
+
+    Returns:
+        TextClause: Statement bound to :lookback_start, :start, :end (bucket
+            aligned datetimes), :preceding (rolling window size minus one) and
+            one :<dimension>_ids parameter per filter. Returns (period, hired,
+            rolling_hired, rolling_average, cumulative_hired) ordered by period
+    """
+    if grain not in SERIES_PERIODS or set(filters) - set(FILTERS):
+        raise ValueError(f"Unsupported time series shape: {grain}, {filters}")
+
+    predicates = ["s.hire_datetime >= :lookback_start", "s.hire_datetime < :end"]
+    predicates += [FILTERS[name] for name in filters]
+    sql = f'''
+        WITH daily AS (
+            SELECT s.hire_datetime::date AS date, COUNT(*) AS hired
+            FROM fact_hired_employees s
+            WHERE {' AND '.join(predicates)}
+            GROUP BY 1
+        ),
+        series AS (
+            SELECT d.{SERIES_PERIODS[grain]} AS period, COALESCE(SUM(h.hired), 0) AS hired
+            FROM dim_date d
+            LEFT JOIN daily h ON h.date = d.date
+            WHERE d.date >= :lookback_start AND d.date < :end
+            GROUP BY 1
+        ),
+        rolling AS (
+            SELECT
+                period,
+                hired,
+                SUM(hired) OVER w AS rolling_hired,
+                AVG(hired) OVER w AS rolling_average
+            FROM series
+            WINDOW w AS (ORDER BY period ROWS BETWEEN :preceding PRECEDING AND CURRENT ROW)
+        )
+        SELECT
+            period,
+            hired::integer AS hired,
+            rolling_hired::integer AS rolling_hired,
+            round(rolling_average, 4)::float8 AS rolling_average,
+            (SUM(hired) OVER (ORDER BY period))::integer AS cumulative_hired
+        FROM rolling
+        WHERE period >= :start
+        ORDER BY period
+    '''
+    return text(sql)
@@ -0,0 +1,244 @@
+"""
+Upload admission control module for the Globant Data Migration API.
+
+Bronze uploads are buffered and parsed in the worker, and each holds an
+ingest connection until its last batch is committed. A burst of large
+uploads would exhaust worker memory and the ingest pool at once and slow
+every other request on the box down, so each worker admits at most:
+
+    settings.upload_max_concurrent uploads at a time, and
+    settings.upload_max_inflight_bytes of upload bodies at a time
+
+The check runs in an ASGI middleware, from the Content-Length header, before
+the body is read. A request whose body size is not announced (chunked
+transfer encoding) is charged as its bytes arrive, and stopped with 503 as
+soon as they would take the worker over its byte budget. An upload larger
+than the whole byte budget is admitted when it is the only one in flight.
+
+A request over budget waits up to settings.upload_admission_wait_seconds in
+a queue of at most settings.upload_admission_queue_size requests, then gets
+503 Service Unavailable with a Retry-After header, without its body being
+read. Other requests are never queued.
+
+Classes:
+    UploadAdmission: Budget of the uploads in flight in this worker.
+    UploadAdmissionMiddleware: ASGI middleware admitting or rejecting uploads.
+
+Variables:
+    upload_admission: Budget of this worker, reported by GET /health/admission
+"""
+
+import asyncio
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.metrics import CallbackMetric, Counter, Histogram, registry
+
+# Interval between two admission attempts of a queued upload
+POLL_SECONDS = 0.05
+
+
+class UploadAdmission:
+    """
+    Uploads and upload bytes in flight in this worker, and uploads queued for admission.
+
+    Attributes:
+        in_flight (int): Admitted uploads not finished yet
+        bytes_in_flight (int): Body bytes charged to the admitted uploads
+        queued (int): Uploads waiting for admission
+        admitted (int): Uploads admitted since startup
+    """
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.bytes_in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self, size: int) -> bool:
+        """Admit an upload of size bytes if the budget allows it; return whether it was admitted."""
+        with self._lock:
+            if self.in_flight >= settings.upload_max_concurrent:
+                return False
+            if self.in_flight and self.bytes_in_flight + size > settings.upload_max_inflight_bytes:
+                return False
+            self.in_flight += 1
+            self.bytes_in_flight += size
+            self.admitted += 1
+            return True
+
+    def charge(self, size: int) -> bool:
+        """
+        Charge size more bytes to an admitted upload, as its unannounced body arrives.
+
+        Returns:
+            bool: False, charging nothing, if the bytes would take the worker
+                over budget while other uploads are in flight
+        """
+        with self._lock:
+            if self.in_flight > 1 and self.bytes_in_flight + size > settings.upload_max_inflight_bytes:
+                return False
+            self.bytes_in_flight += size
+            return True
+
+    def release(self, size: int) -> None:
+        """Return an admitted upload and the size bytes charged to it."""
+        with self._lock:
+            self.in_flight -= 1
+            self.bytes_in_flight -= size
+
+    async def acquire(self, size: int) -> Optional[str]:
+        """
+        Admit an upload of size bytes, queueing it while the worker is over budget.
+
+        Returns:
+            Optional[str]: None once admitted, or why it was rejected ("queue_full" or "timeout")
+        """
+        if self.try_acquire(size):
+            return None
+        with self._lock:
+            if self.queued >= settings.upload_admission_queue_size:
+                return "queue_full"
+            self.queued += 1
+        started = time.monotonic()
+        try:
+            while not self.try_acquire(size):
+                if time.monotonic() - started >= settings.upload_admission_wait_seconds:
+                    return "timeout"
+                await asyncio.sleep(POLL_SECONDS)
+            admission_wait.observe(time.monotonic() - started)
+            return None
+        finally:
+            with self._lock:
+                self.queued -= 1
+
+    def status(self) -> Dict[str, Any]:
+        """Budget and current usage of this worker."""
+        return {
+            "max_concurrent": settings.upload_max_concurrent,
+            "max_inflight_bytes": settings.upload_max_inflight_bytes,
+            "queue_size": settings.upload_admission_queue_size,
+            "in_flight": self.in_flight,
+            "bytes_in_flight": self.bytes_in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected": {
+                reason: admission_rejections.value(reason=reason) for reason in ("queue_full", "timeout", "over_budget")
+            },
+        }
+
+
+class UploadAdmissionMiddleware:
+    """
+    ASGI middleware admitting bronze uploads within the budget of upload_admission.
+
+    Only POST and PUT (resumable upload chunk) requests under
+    settings.upload_admission_prefix are counted; every other request passes
+    through untouched.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("POST", "PUT")
+            or not scope["path"].startswith(settings.api_v1_str + settings.upload_admission_prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        announced = headers.get(b"content-length")
+        charged = int(announced) if announced and announced.isdigit() else 0
+
+        rejection = await upload_admission.acquire(charged)
+        if rejection is not None:
+            admission_rejections.inc(reason=rejection)
+            await self.reject(send)
+            return
+
+        over_budget = False
+        started = False
+
+        async def receive_charged():
+            # An unannounced body going over budget is cut off: the app sees
+            # the client disconnect and its response is replaced by a 503
+            nonlocal charged, over_budget
+            if over_budget:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if announced is None and message["type"] == "http.request":
+                size = len(message.get("body", b""))
+                if not upload_admission.charge(size):
+                    over_budget = True
+                    return {"type": "http.disconnect"}
+                charged += size
+            return message
+
+        async def send_unless_over_budget(message):
+            nonlocal started
+            if over_budget:
+                return
+            started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive_charged, send_unless_over_budget)
+        except Exception:
+            if not over_budget:
+                raise
+        finally:
+            upload_admission.release(charged)
+        if over_budget and not started:
+            admission_rejections.inc(reason="over_budget")
+            await self.reject(send)
+
+    @staticmethod
+    async def reject(send) -> None:
+        body = json.dumps({
+            "detail": {
+                "message": "Too many uploads in progress on this worker",
+                "hint": "Retry after the number of seconds in the Retry-After header"
+            }
+        }).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(settings.upload_admission_retry_after_seconds).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+upload_admission = UploadAdmission()
+
+admission_wait = registry.register(Histogram(
+    "upload_admission_wait_seconds",
+    "Time queued uploads waited before being admitted",
+))
+admission_rejections = registry.register(Counter(
+    "upload_admission_rejections_total",
+    "Uploads rejected with 503 by reason (queue_full, timeout, over_budget)",
+    ("reason",),
+))
+registry.register(CallbackMetric(
+    "upload_admission_queue_depth",
+    "Uploads waiting for admission in this worker",
+    (),
+    lambda: {(): upload_admission.queued},
+))
+registry.register(CallbackMetric(
+    "upload_admission_in_flight",
+    "Admitted uploads and their body bytes in flight in this worker",
+    ("resource",),
+    lambda: {("uploads",): upload_admission.in_flight, ("bytes",): upload_admission.bytes_in_flight},
+))
@@ -0,0 +1,193 @@
+"""
+Response cache module for the Globant Data Migration API.
+
+This module provides an in-process LRU/TTL cache for read-only endpoints.
+Entries are keyed on the persisted silver data version (silver_data_version,
+see app.core.replica), which every silver merge increments in its own
+transaction, so every entry stored under another version becomes a miss.
+
+Each worker process holds its own cache. A worker knows the version of its
+own merges at once and polls the primary's at most every
+settings.read_replica_version_check_seconds, which bounds how long a merge
+served by another worker goes unnoticed.
+
+Classes:
+    ResponseCache: Thread-safe LRU cache with per-entry TTL.
+
+Functions:
+    cached_json_response: Serve a JSON body from the cache with ETag / 304 support.
+
+Variables:
+    gold_cache: Response cache used by the gold router
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from app.core import database
+from app.core.config import settings
+from app.core.metrics import CallbackMetric, gold_query_duration, registry
+from app.core.replica import replica_guard
+
+
+@dataclass
+class CacheEntry:
+    """A cached response body and the data version it was built from."""
+    version: int
+    etag: str
+    body: bytes
+    expires_at: float
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache with a per-entry TTL.
+
+    Entries are only returned when they were stored under the requested data
+    version and have not expired.
+
+    Attributes:
+        max_entries (int): Maximum number of entries kept before evicting the LRU one
+        ttl_seconds (float): Lifetime of an entry
+        hits (int): Number of lookups served from the cache
+        misses (int): Number of lookups that had to be recomputed
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, version: int) -> Optional[CacheEntry]:
+        """Return the entry for key if it is current and not expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version or entry.expires_at <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: str, version: int, body: bytes) -> CacheEntry:
+        """Store a response body for key under the given data version."""
+        entry = CacheEntry(
+            version=version,
+            etag=make_etag(body),
+            body=body,
+            expires_at=time.monotonic() + self.ttl_seconds
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def hit_ratio(self) -> float:
+        """Share of lookups served from the cache, 0 before the first lookup."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def make_etag(body: bytes) -> str:
+    """Build a strong ETag from the response body, so it is stable across workers."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def make_cache_key(endpoint: str, params: Dict[str, Any]) -> str:
+    """Build a cache key from the endpoint name and its (sorted) parameters."""
+    return endpoint + "?" + json.dumps(jsonable_encoder(params), sort_keys=True, separators=(",", ":"))
+
+
+def cached_json_response(
+    request: Request,
+    endpoint: str,
+    params: Dict[str, Any],
+    build: Callable[[], Any]
+) -> Response:
+    """
+    Serve a JSON response from the gold cache with ETag / 304 support.
+
+    build() is only called on a cache miss; a hit at most polls the primary's
+    data version. When the client's If-None-Match matches the body built
+    under the current data version, a bodyless 304 is returned.
+
+    Args:
+        request: Incoming request (used for If-None-Match)
+        endpoint: Endpoint name, part of the cache key
+        params: Query parameters that change the response, part of the cache key
+        build: Callable returning the JSON-serializable response content, or
+            an already encoded JSON body as bytes
+
+    Returns:
+        Response: 200 with the JSON body and an ETag, or 304
+    """
+    key = make_cache_key(endpoint, params)
+    version = replica_guard.current_data_version(database.read_primary_session_local)
+    entry = gold_cache.get(key, version) if settings.gold_cache_enabled else None
+    if entry is None:
+        started = time.perf_counter()
+        content = build()
+        gold_query_duration.observe(time.perf_counter() - started, endpoint=endpoint)
+        if isinstance(content, bytes):
+            body = content
+        else:
+            body = json.dumps(jsonable_encoder(content), separators=(",", ":")).encode()
+        if settings.gold_cache_enabled:
+            entry = gold_cache.set(key, version, body)
+        else:
+            entry = CacheEntry(version=version, etag=make_etag(body), body=body, expires_at=0)
+
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if_none_match = _parse_if_none_match(request.headers.get("if-none-match"))
+    if entry.etag in if_none_match or "*" in if_none_match:
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def _parse_if_none_match(header: Optional[str]) -> set:
+    """Return the ETags listed in an If-None-Match header, ignoring weak prefixes."""
+    if not header:
+        return set()
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+gold_cache = ResponseCache(
+    max_entries=settings.gold_cache_max_entries,
+    ttl_seconds=settings.gold_cache_ttl_seconds
+)
+
+registry.register(CallbackMetric(
+    "gold_cache_hits_total", "Gold response cache lookups served from the cache", (),
+    lambda: {(): gold_cache.hits}, type="counter"
+))
+registry.register(CallbackMetric(
+    "gold_cache_misses_total", "Gold response cache lookups that ran the query", (),
+    lambda: {(): gold_cache.misses}, type="counter"
+))
+registry.register(CallbackMetric(
+    "gold_cache_hit_ratio", "Share of gold response cache lookups served from the cache", (),
+    lambda: {(): gold_cache.hit_ratio()}
+))
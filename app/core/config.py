@@ -9,7 +9,7 @@ Classes:
 """
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -22,16 +22,137 @@ class Settings(BaseSettings):
     Attributes:
         database_url (str): PostgreSQL connection string. Format:
             postgresql://<user>:<password>@<host>:<port>/<database>
+        read_database_url (Optional[str]): Connection string of a streaming read replica.
+            When set, the read pool (gold metrics and exports) connects to it instead of
+            database_url, falling back to the primary while it lags behind the last merge
+        read_replica_version_check_seconds (float): Minimum interval between polls of the
+            primary's data version, which the replica's is compared with and the gold
+            response cache is keyed on. Bounds how long a merge served by another worker
+            may go unnoticed by the lag guard and the cache
         api_v1_str (str): API version prefix for all endpoints
         project_name (str): Name of the project, used in API documentation
+        log_level (str): Level of the app.* loggers, e.g. the per-stage timing lines
+            of uploads and merges (INFO) or none of them (WARNING)
+        slow_query_threshold_ms (float): Duration from which a SQL statement is logged
+            as slow on the app.queries logger
+        slow_query_explain (bool): Whether slow statements of gold and merge routes are
+            run again under EXPLAIN (ANALYZE, BUFFERS), the plan stored in query_diagnostics
+        warmup_enabled (bool): Whether each worker warms its pools, dimensions and gold
+            cache at startup; when disabled, workers are ready at once
+        warmup_pool_connections (int): Connections opened per workload pool by the warm-up,
+            at most the pool size
+        warmup_gold_paths (List[str]): Gold GETs requested by the warm-up, filling the gold
+            cache (a JSON list in the environment)
+        warmup_retry_seconds (float): Delay between warm-up attempts after a failure
+        upload_lock_wait_seconds (float): How long an upload waits for the advisory lock
+            of its staging table, held by another upload or a merge, before being
+            rejected with 409 (0 rejects conflicting uploads at once)
+        merge_lock_wait_seconds (float): How long a merge waits for the uploads of its
+            source staging table to finish before being rejected with 409
+        table_lock_retry_after_seconds (int): Retry-After of the 409 responses of
+            conflicting uploads and merges
+        upload_admission_prefix (str): Path prefix, under api_v1_str, of the POST
+            requests counted by the upload admission control
+        upload_max_concurrent (int): Uploads a worker processes at a time
+        upload_max_inflight_bytes (int): Upload body bytes a worker accepts at a time;
+            a larger upload is admitted only when no other upload is in flight
+        upload_admission_queue_size (int): Uploads a worker queues while over budget;
+            further uploads are rejected with 503 at once
+        upload_admission_wait_seconds (float): How long a queued upload waits for
+            admission before being rejected with 503
+        upload_admission_retry_after_seconds (int): Retry-After of the 503 responses
+            of rejected uploads
+        upload_chunk_max_bytes (int): Largest chunk accepted by a resumable upload session
+        upload_session_ttl_seconds (int): Idle time after which an open upload session
+            is expired (its row and table dropped) when the next session is created
+        hired_employees_dedup_rule (str): Which staging row wins when several rows
+            resolve to the same employee id during the silver merge. One of
+            "last_loaded", "first_loaded" or "latest_hire_datetime"
+        gold_cache_enabled (bool): Whether gold responses are cached in-process
+        gold_cache_ttl_seconds (float): Lifetime of a cached gold response
+        gold_cache_max_entries (int): Maximum number of cached gold responses per worker
+        gold_engine (str): Engine computing the gold metrics. "sql" queries PostgreSQL;
+            "columnar" keeps the fact table in worker memory as NumPy arrays
+        gold_columnar_max_age_seconds (float): Age after which the columnar engine reloads
+            the fact table, picking up merges served by other workers
+        gold_json_renderer (str): How SQL-served gold responses are encoded. "model" builds
+            one Pydantic model per row; "database" has PostgreSQL render the JSON body
+            with json_agg and returns the bytes as-is
+        {ingest,merge,read}_pool_size (int): Connections kept open by the pool of each
+            workload: bronze uploads (ingest), silver merges (merge) and gold and export
+            queries (read)
+        {ingest,merge,read}_pool_max_overflow (int): Extra connections a pool may open
+            under load, closed again when returned
+        {ingest,merge,read}_pool_timeout_seconds (float): How long a request waits for a
+            connection of an exhausted pool before failing
+        {ingest,merge,read}_pool_recycle_seconds (int): Age after which a pooled connection
+            is replaced (-1 keeps connections indefinitely)
     """
     
     # Database settings
     database_url: str = "postgresql://globant_user:globant_password@db:5432/globant_migration_db"
+    read_database_url: Optional[str] = None
+    read_replica_version_check_seconds: float = 1
     
     # API Settings
     api_v1_str: str = "/api/v1"
     project_name: str = "Globant Data Migration API"
+    log_level: str = "INFO"
+    
+    # SQL profiling settings
+    slow_query_threshold_ms: float = 500
+    slow_query_explain: bool = False
+    
+    # Startup warm-up settings
+    warmup_enabled: bool = True
+    warmup_pool_connections: int = 2
+    warmup_gold_paths: List[str] = [
+        "/api/v1/gold/metrics/hired_by_quarter",
+        "/api/v1/gold/metrics/departments_above_mean",
+    ]
+    warmup_retry_seconds: float = 5
+    
+    # Staging table lock settings
+    upload_lock_wait_seconds: float = 0
+    merge_lock_wait_seconds: float = 300
+    table_lock_retry_after_seconds: int = 5
+    
+    # Upload admission control settings, per worker
+    upload_admission_prefix: str = "/bronze/upload/"
+    upload_max_concurrent: int = 4
+    upload_max_inflight_bytes: int = 1024 * 1024 * 1024
+    upload_admission_queue_size: int = 8
+    upload_admission_wait_seconds: float = 1
+    upload_admission_retry_after_seconds: int = 10
+    upload_chunk_max_bytes: int = 64 * 1024 * 1024
+    upload_session_ttl_seconds: int = 24 * 3600
+    
+    # Silver merge settings
+    hired_employees_dedup_rule: str = "last_loaded"
+    
+    # Gold response cache settings
+    gold_cache_enabled: bool = True
+    gold_cache_ttl_seconds: float = 300
+    gold_cache_max_entries: int = 256
+    
+    # Gold engine settings
+    gold_engine: str = "sql"
+    gold_columnar_max_age_seconds: float = 300
+    gold_json_renderer: str = "model"
+    
+    # Connection pool settings, one pool per workload
+    ingest_pool_size: int = 4
+    ingest_pool_max_overflow: int = 2
+    ingest_pool_timeout_seconds: float = 30
+    ingest_pool_recycle_seconds: int = 1800
+    merge_pool_size: int = 2
+    merge_pool_max_overflow: int = 1
+    merge_pool_timeout_seconds: float = 60
+    merge_pool_recycle_seconds: int = 1800
+    read_pool_size: int = 10
+    read_pool_max_overflow: int = 10
+    read_pool_timeout_seconds: float = 10
+    read_pool_recycle_seconds: int = 1800
     
     model_config = SettingsConfigDict(case_sensitive=True)
 
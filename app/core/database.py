@@ -1,23 +1,51 @@
 """
 Database configuration module for the Globant Data Migration API.
 
-This module sets up the SQLAlchemy engine, session management, and base model class.
+This module sets up the SQLAlchemy engines, session management, and base model class.
 It provides the core database functionality used throughout the application.
 
+Each workload gets its own connection pool, sized through Settings, so long
+bronze uploads cannot take the connections gold reads need:
+
+    ingest: bronze CSV uploads
+    merge: silver merges
+    read: gold metrics and exports
+
+When settings.read_database_url is set, the read pool connects to that
+replica and a read_primary pool, sized like the read pool, serves the reads
+the replica lag guard (app.core.replica) sends back to the primary.
+
 Functions:
-    get_db: Dependency function to get a database session.
+    get_db: Dependency function to get a session of the default engine.
+    get_ingest_db: Dependency function to get a session of the ingest pool.
+    get_merge_db: Dependency function to get a session of the merge pool.
+    get_read_db: Dependency function to get a session of the read pool.
+    open_read_session: Open a read session, on the primary while the replica lags.
+    pool_status: Snapshot of every workload pool, for monitoring.
 
 Variables:
-    engine: SQLAlchemy database engine instance
-    session_local: SQLAlchemy session factory
+    engine: SQLAlchemy database engine instance for scripts, migrations and tests
+    session_local: SQLAlchemy session factory of the default engine
+    engines: Workload name -> SQLAlchemy engine with its own pool
+    ingest_session_local, merge_session_local, read_session_local: Workload session factories
+    read_primary_session_local: Session factory of the primary for reads
     base: Declarative base class for database models
 """
 
+from typing import Any, Callable, Dict, Iterator, Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.core.metrics import CallbackMetric, TimedQueuePool, registry
+from app.core.replica import replica_guard
+
+# Workloads with a dedicated connection pool
+POOL_NAMES = ("ingest", "merge", "read")
 
 # Create SQLAlchemy engine
 engine = create_engine(
@@ -26,12 +54,44 @@ engine = create_engine(
     pool_pre_ping=True,  # Enable connection pool "pre-ping" feature
 )
 
-# Create session factory
-session_local = sessionmaker(
-    autocommit=False,  # Transactions must be committed explicitly
-    autoflush=False,   # Changes won't be automatically flushed
-    bind=engine        # Bind to our database engine
-)
+def pool_setting(name: str, setting: str) -> Any:
+    """<name>_pool_<setting> of a workload pool; read_primary is sized like read."""
+    return getattr(settings, f"{name.split('_')[0]}_pool_{setting}")
+
+def create_pool_engine(name: str, url: Optional[str] = None) -> Engine:
+    """Create the engine of a workload, its pool sized by the <name>_pool_* settings."""
+    return create_engine(
+        url or settings.database_url,
+        pool_pre_ping=True,
+        # Times checkouts for db_pool_checkout_wait_seconds, labelled by name
+        poolclass=TimedQueuePool,
+        pool_logging_name=name,
+        pool_size=pool_setting(name, "size"),
+        max_overflow=pool_setting(name, "max_overflow"),
+        pool_timeout=pool_setting(name, "timeout_seconds"),
+        pool_recycle=pool_setting(name, "recycle_seconds"),
+    )
+
+engines: Dict[str, Engine] = {
+    name: create_pool_engine(name, settings.read_database_url if name == "read" else None)
+    for name in POOL_NAMES
+}
+if settings.read_database_url:
+    engines["read_primary"] = create_pool_engine("read_primary")
+
+def create_session_factory(bind: Engine) -> sessionmaker:
+    return sessionmaker(
+        autocommit=False,  # Transactions must be committed explicitly
+        autoflush=False,   # Changes won't be automatically flushed
+        bind=bind          # Bind to our database engine
+    )
+
+# Create session factories
+session_local = create_session_factory(engine)
+ingest_session_local = create_session_factory(engines["ingest"])
+merge_session_local = create_session_factory(engines["merge"])
+read_session_local = create_session_factory(engines["read"])
+read_primary_session_local = create_session_factory(engines.get("read_primary", engines["read"]))
 
 # Create declarative base class for models
 base = declarative_base()
@@ -56,3 +116,75 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def session_dependency(factory: sessionmaker) -> Callable[[], Iterator[Session]]:
+    """Build a dependency function like get_db, yielding sessions of factory."""
+    def get_session() -> Iterator[Session]:
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+    return get_session
+
+get_ingest_db = session_dependency(ingest_session_local)
+get_merge_db = session_dependency(merge_session_local)
+
+def open_read_session() -> Session:
+    """
+    Open a session of the read pool, or of the primary while the replica lags.
+
+    Without settings.read_database_url the read pool is on the primary and is
+    used as is. Otherwise the replica's data version is checked against the
+    last merge (see app.core.replica); a lagging or unreachable replica sends
+    the read to the read_primary pool.
+
+    Returns:
+        Session: The caller must close it
+    """
+    db = read_session_local()
+    if not settings.read_database_url:
+        return db
+    try:
+        if replica_guard.is_fresh(db, read_primary_session_local):
+            return db
+    except SQLAlchemyError:
+        replica_guard.record_fallback()
+    db.close()
+    return read_primary_session_local()
+
+def get_read_db() -> Iterator[Session]:
+    """Dependency function like get_db, yielding a session of open_read_session."""
+    db = open_read_session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def pool_status() -> Dict[str, Dict[str, Any]]:
+    """
+    Snapshot of every workload pool.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Pool name -> configured size, max_overflow
+            and timeout_seconds, and the current checked_in (idle), checked_out
+            (in use) and overflow (beyond size, negative while the pool is
+            still filling up) connection counts
+    """
+    status = {}
+    for name, pool_engine in engines.items():
+        pool = pool_engine.pool
+        status[name] = {
+            "size": pool.size(),
+            "max_overflow": pool_setting(name, "max_overflow"),
+            "timeout_seconds": pool.timeout(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        }
+    return status
+
+registry.register(CallbackMetric(
+    "db_pool_checked_out", "Connections in use by workload pool", ("pool",),
+    lambda: {(name,): status["checked_out"] for name, status in pool_status().items()}
+))
@@ -0,0 +1,339 @@
+"""
+Prometheus metrics module for the Globant Data Migration API.
+
+This module keeps counters and histograms in process memory and renders
+them in the Prometheus text exposition format served by GET /metrics. No
+client library or push gateway is involved; Prometheus scrapes each worker.
+
+Each worker process has its own values, so a scrape of a multi-worker
+deployment sees the worker that answered it. Scrape workers individually or
+sum the series by instance.
+
+Classes:
+    Counter: Monotonic count per label set.
+    Histogram: Cumulative bucket counts, sum and count per label set.
+    CallbackMetric: Values read from a callback at scrape time.
+    Registry: Collection of metrics rendered together.
+    TimedQueuePool: QueuePool recording how long checkouts wait.
+    RequestMetricsMiddleware: ASGI middleware recording request latency per route.
+
+Functions:
+    record_bronze_rows: Count the rows of a bronze upload by stage.
+    record_merge: Record the duration and rows of a silver merge.
+
+Variables:
+    registry: Metrics served by GET /metrics
+    http_request_duration, bronze_rows, merge_duration, merge_rows,
+    gold_query_duration, pool_checkout_wait: Metrics recorded by the app
+"""
+
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from sqlalchemy.pool import QueuePool
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds, the Prometheus client default
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Long running uploads and merges
+SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+LabelValues = Tuple[str, ...]
+
+
+def format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Render a label set, escaping backslashes, quotes and newlines."""
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def format_value(value: float) -> str:
+    """Render a sample value, integers without a decimal point."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """
+    Monotonic count per label set.
+
+    Attributes:
+        name (str): Metric name, ending in _total by convention
+        help (str): Description shown by Prometheus
+        labelnames (Tuple[str, ...]): Names of the labels every sample carries
+    """
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Add amount (non-negative) to the sample of labels."""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Current value of the sample of labels, 0 if never incremented."""
+        return self._values.get(tuple(str(labels[name]) for name in self.labelnames), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [
+            f"{self.name}{format_labels(self.labelnames, key)} {format_value(value)}"
+            for key, value in sorted(values)
+        ]
+
+
+class Histogram:
+    """
+    Distribution of observed values per label set.
+
+    Attributes:
+        name (str): Metric name, ending in the unit (_seconds) by convention
+        help (str): Description shown by Prometheus
+        labelnames (Tuple[str, ...]): Names of the labels every sample carries
+        buckets (Tuple[float, ...]): Bucket upper bounds, +Inf is implied
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count], sum
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation for the sample of labels."""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            else:
+                counts[-1] += 1
+            total[0] += value
+
+    def count(self, **labels: str) -> int:
+        """Number of observations of the sample of labels."""
+        entry = self._values.get(tuple(str(labels[name]) for name in self.labelnames))
+        return sum(entry[0]) if entry else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = [(key, list(counts), total[0]) for key, (counts, total) in self._values.items()]
+        lines = []
+        for key, counts, total in sorted(values):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                labels = format_labels(self.labelnames + ("le",), key + (format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class CallbackMetric:
+    """
+    Values read at scrape time from state the app already keeps.
+
+    Attributes:
+        name (str): Metric name
+        help (str): Description shown by Prometheus
+        labelnames (Tuple[str, ...]): Names of the labels every sample carries
+        collect (Callable): Returns label values -> value
+        type (str): "gauge", or "counter" for values that only increase
+    """
+
+    def __init__(
+        self, name: str, help: str, labelnames: Sequence[str],
+        collect: Callable[[], Dict[LabelValues, float]], type: str = "gauge"
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+        self.type = type
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{format_labels(self.labelnames, key)} {format_value(value)}"
+            for key, value in sorted(self.collect().items())
+        ]
+
+
+class Registry:
+    """Metrics rendered together by GET /metrics."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, object] = {}
+
+    def register(self, metric):
+        """Add a metric and return it."""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "Latency of HTTP requests by route template, method and status code",
+    ("method", "route", "status"),
+))
+bronze_rows = registry.register(Counter(
+    "bronze_rows_total",
+    "Rows of bronze uploads by staging table and stage (parsed, validated, written, rejected)",
+    ("table", "stage"),
+))
+merge_duration = registry.register(Histogram(
+    "silver_merge_duration_seconds",
+    "Duration of committed silver merges by table and operation",
+    ("table", "operation"),
+    SLOW_BUCKETS,
+))
+merge_rows = registry.register(Counter(
+    "silver_merge_rows_total",
+    "Rows inserted, updated or removed by silver merges by table and operation",
+    ("table", "operation"),
+))
+gold_query_duration = registry.register(Histogram(
+    "gold_query_duration_seconds",
+    "Time spent computing gold responses (cache misses) by endpoint",
+    ("endpoint",),
+))
+pool_checkout_wait = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for (or opening) a pooled connection by workload pool",
+    ("pool",),
+    (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60),
+))
+
+
+def record_bronze_rows(table: str, parsed: int, written: int, rejected: int) -> None:
+    """
+    Count the rows of a bronze upload.
+
+    Args:
+        table: Staging table
+        parsed: CSV rows read
+        written: Rows written to the staging table
+        rejected: Rows that failed validation
+    """
+    bronze_rows.inc(parsed, table=table, stage="parsed")
+    bronze_rows.inc(parsed - rejected, table=table, stage="validated")
+    bronze_rows.inc(written, table=table, stage="written")
+    bronze_rows.inc(rejected, table=table, stage="rejected")
+
+
+def record_merge(table: str, operation: str, seconds: float, rows: int) -> None:
+    """
+    Record a committed silver merge.
+
+    Args:
+        table: Silver table
+        operation: "merge" or "replace_year"
+        seconds: Duration of the merge, commit included
+        rows: Rows inserted, updated or removed
+    """
+    merge_duration.observe(seconds, table=table, operation=operation)
+    merge_rows.inc(rows, table=table, operation=operation)
+
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool recording the wait of every checkout in pool_checkout_wait.
+
+    The pool is labelled by its logging name, set with the pool_logging_name
+    argument of create_engine.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_checkout_wait.observe(
+                time.perf_counter() - started, pool=self._orig_logging_name or "default"
+            )
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware recording every HTTP request in http_request_duration.
+
+    Requests are labelled by route template (/api/v1/gold/metrics/{...}), not
+    by raw path, so the number of series stays bounded; requests matching no
+    route are labelled "unmatched". Latency runs until the last body chunk
+    is sent, so streamed responses are measured in full.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=status,
+            )
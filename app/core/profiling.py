@@ -0,0 +1,258 @@
+"""
+SQL profiling module for the Globant Data Migration API.
+
+before_cursor_execute / after_cursor_execute listeners on every SQLAlchemy
+Engine time each statement sent to PostgreSQL and:
+
+    - add it to the statistics of the current request (statement count and
+      DB time), reported in the X-DB-Statements and Server-Timing response
+      headers and in the http_request_db_* histograms of /metrics, so an
+      N+1 pattern shows up as a statement count growing with the input
+    - log statements slower than settings.slow_query_threshold_ms as JSON
+      lines on the app.queries logger, with the shape of their parameters
+      (names and types, never values)
+    - when settings.slow_query_explain is enabled, run slow statements of
+      gold and merge routes again under EXPLAIN (ANALYZE, BUFFERS) and store
+      the plan in the query_diagnostics table
+
+The plan is captured on the same connection, inside a savepoint that is
+always rolled back, so statements that write are executed a second time but
+leave nothing behind. Capturing doubles the cost of every slow statement;
+enable it while investigating, not permanently.
+
+Classes:
+    QueryStats: Statement count and DB time of one request.
+    QueryProfileMiddleware: ASGI middleware collecting QueryStats per request.
+
+Functions:
+    install_query_profiling: Register the cursor listeners on every Engine.
+    parameters_shape: Describe statement parameters without their values.
+"""
+
+import json
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+import psycopg2.extensions
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics import Histogram, registry
+
+logger = logging.getLogger("app.queries")
+
+# Statements whose plan can be captured: reads and DML, never DDL or utility commands
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "MERGE")
+
+# Route prefixes whose slow statements get an EXPLAIN (ANALYZE, BUFFERS)
+EXPLAIN_ROUTES = ("/api/v1/gold/", "/api/v1/silver/merge/")
+
+# Reads json columns (the EXPLAIN output) as the text PostgreSQL sent
+PLAN_AS_TEXT = psycopg2.extensions.new_type((114,), "PLAN_AS_TEXT", lambda value, cursor: value)
+
+# Longest statement text written to logs and diagnostics
+MAX_STATEMENT_LENGTH = 4000
+
+request_db_statements = registry.register(Histogram(
+    "http_request_db_statements",
+    "SQL statements executed per HTTP request by route template",
+    ("route",),
+    (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000),
+))
+request_db_seconds = registry.register(Histogram(
+    "http_request_db_seconds",
+    "Time spent in SQL statements per HTTP request by route template",
+    ("route",),
+))
+
+
+@dataclass
+class QueryStats:
+    """
+    Statement count and DB time of one request.
+
+    Attributes:
+        statements (int): Statements executed
+        seconds (float): Time spent executing them
+        scope (dict): ASGI scope of the request, to find its route
+    """
+    statements: int = 0
+    seconds: float = 0.0
+    scope: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def route(self) -> str:
+        """Route template of the request, "unmatched" before routing or without a match."""
+        return getattr(self.scope.get("route"), "path", "unmatched")
+
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+# Set while the profiler itself talks to the database, so it does not profile itself
+_capturing: ContextVar[bool] = ContextVar("capturing_query_plan", default=False)
+
+
+def parameters_shape(parameters: Any, executemany: bool = False) -> Any:
+    """
+    Describe statement parameters by name and type, never by value.
+
+    Args:
+        parameters: DBAPI parameters, a mapping, a sequence, or for
+            executemany a sequence of either
+        executemany: Whether parameters holds one entry per execution
+
+    Returns:
+        The parameter names (or positions) mapped to type names, and for
+        executemany the number of executions and the shape of the first one
+    """
+    if executemany:
+        parameters = list(parameters or [])
+        return {"executions": len(parameters), "each": parameters_shape(parameters[0]) if parameters else None}
+    if isinstance(parameters, dict):
+        return {name: _type_name(value) for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_type_name(value) for value in parameters]
+    return None
+
+
+def _type_name(value: Any) -> str:
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    seconds = time.perf_counter() - conn.info["query_started"].pop()
+    if _capturing.get():
+        return
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.seconds += seconds
+    if seconds * 1000 < settings.slow_query_threshold_ms:
+        return
+
+    route = stats.route if stats is not None else None
+    shape = parameters_shape(parameters, executemany)
+    logger.warning(json.dumps({
+        "event": "slow_query",
+        "route": route,
+        "duration_ms": round(seconds * 1000, 3),
+        "statement": statement[:MAX_STATEMENT_LENGTH],
+        "parameters": shape,
+    }, default=str))
+    if (
+        settings.slow_query_explain
+        and not executemany
+        and route is not None
+        and route.startswith(EXPLAIN_ROUTES)
+        and statement.lstrip().upper().startswith(EXPLAINABLE)
+    ):
+        _capture_plan(conn, statement, parameters, route, shape, seconds)
+
+
+def _capture_plan(conn, statement, parameters, route, shape, seconds) -> None:
+    """Store the EXPLAIN (ANALYZE, BUFFERS) plan of a slow statement in query_diagnostics."""
+    dbapi_connection = conn.connection.dbapi_connection
+    if dbapi_connection.autocommit:
+        # No transaction to roll the second execution back into
+        return
+
+    token = _capturing.set(True)
+    try:
+        # A separate DBAPI cursor leaves the original statement's results untouched
+        cursor = dbapi_connection.cursor()
+        # The plan is stored as PostgreSQL wrote it, not parsed and dumped again
+        psycopg2.extensions.register_type(PLAN_AS_TEXT, cursor)
+        try:
+            cursor.execute("SAVEPOINT query_diagnostics")
+            try:
+                cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement, parameters)
+                plan = cursor.fetchone()[0]
+            finally:
+                cursor.execute("ROLLBACK TO SAVEPOINT query_diagnostics")
+                cursor.execute("RELEASE SAVEPOINT query_diagnostics")
+        finally:
+            cursor.close()
+
+        try:
+            json.loads(plan)
+        except ValueError:
+            # Some server versions emit malformed JSON for MERGE into partitioned
+            # tables; keep the plan readable as a JSON string instead of losing it
+            plan = json.dumps(plan)
+
+        # Written on another connection, so it is kept even if the request rolls back
+        from app.core.database import engine
+        with engine.begin() as diagnostics:
+            diagnostics.execute(text("""
+                INSERT INTO query_diagnostics (route, statement, parameters_shape, duration_ms, plan)
+                VALUES (:route, :statement, CAST(:shape AS jsonb), :duration_ms, CAST(:plan AS jsonb))
+            """), {
+                "route": route,
+                "statement": statement[:MAX_STATEMENT_LENGTH],
+                "shape": json.dumps(shape),
+                "duration_ms": seconds * 1000,
+                "plan": plan,
+            })
+    except Exception:
+        logger.exception("Could not capture the plan of a slow statement")
+    finally:
+        _capturing.reset(token)
+
+
+def install_query_profiling() -> None:
+    """Register the profiling listeners on every Engine, once."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryProfileMiddleware:
+    """
+    ASGI middleware collecting the QueryStats of every HTTP request.
+
+    The statistics so far are sent with the response headers:
+
+        X-DB-Statements: 12
+        Server-Timing: db;dur=3.412
+
+    Statements of a streamed body run after the headers are sent; they are
+    only part of the http_request_db_* histograms, recorded when the
+    response is complete.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope=scope)
+        token = current_query_stats.set(stats)
+
+        async def send_with_stats(message) -> None:
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"x-db-statements", str(stats.statements).encode()),
+                    (b"server-timing", f"db;dur={stats.seconds * 1000:.3f}".encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            current_query_stats.reset(token)
+            request_db_statements.observe(stats.statements, route=stats.route)
+            request_db_seconds.observe(stats.seconds, route=stats.route)
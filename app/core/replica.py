@@ -0,0 +1,169 @@
+"""
+Read replica lag guard for the Globant Data Migration API.
+
+When settings.read_database_url points the read pool at a streaming replica,
+gold and export reads must not return data older than the last merge. Every
+silver merge increments the persisted version in silver_data_version inside
+its own transaction, so a replica that has replayed the merge also has the
+new version. A read session is only used if the replica's version has
+caught up with the newest version known to this worker:
+
+    - the version committed by this worker's own merges, known immediately
+    - the primary's version, polled at most every
+      settings.read_replica_version_check_seconds, which covers merges
+      served by other workers
+
+Otherwise the read falls back to the primary.
+
+The same poll keys the gold response cache (app.core.cache): entries built
+under another persisted version are misses, so every worker drops them
+within settings.read_replica_version_check_seconds of a merge.
+
+Classes:
+    ReplicaGuard: Decides whether a replica session is fresh enough to read.
+
+Functions:
+    record_data_version: Increment the persisted silver data version.
+    read_data_version: Read the persisted silver data version.
+
+Variables:
+    replica_guard: Process-wide guard used by the read session factory
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+DATA_VERSION_TABLE = "silver_data_version"
+
+
+def record_data_version(db: Session) -> int:
+    """
+    Increment the persisted silver data version.
+
+    Called by every silver merge before it commits; the caller owns the
+    transaction. The row is created on first use.
+
+    Args:
+        db: Database session of the merge
+
+    Returns:
+        int: The new version, visible to readers once the merge commits
+    """
+    return db.execute(text(f"""
+        INSERT INTO {DATA_VERSION_TABLE} AS v (id, version, updated_timestamp)
+        VALUES (1, 1, now())
+        ON CONFLICT (id) DO UPDATE SET
+            version = v.version + 1,
+            updated_timestamp = now()
+        RETURNING version
+    """)).scalar()
+
+
+def read_data_version(db: Session) -> int:
+    """Read the persisted silver data version, 0 before the first merge."""
+    version = db.execute(text(f"SELECT version FROM {DATA_VERSION_TABLE} WHERE id = 1")).scalar()
+    return version or 0
+
+
+class ReplicaGuard:
+    """
+    Tracks the newest committed data version and compares replicas with it.
+
+    Attributes:
+        check_seconds (float): Minimum interval between polls of the primary
+        required_version (int): Newest version known to this worker
+        data_version (int): Last version read from the primary or committed by
+            a merge of this worker, which keys the gold response cache
+        replica_reads (int): Reads served by the replica
+        primary_fallbacks (int): Reads sent to the primary because the replica
+            lagged behind or could not be queried
+    """
+
+    def __init__(self, check_seconds: float) -> None:
+        self.check_seconds = check_seconds
+        self.required_version = 0
+        self.data_version = 0
+        self.replica_reads = 0
+        self.primary_fallbacks = 0
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def note_merge(self, version: int) -> None:
+        """Record a version committed by a merge of this worker."""
+        with self._lock:
+            self.required_version = max(self.required_version, version)
+            self.data_version = version
+
+    def poll(self, primary: Callable[[], Session]) -> None:
+        """
+        Read the primary's version when the last poll is older than check_seconds.
+
+        Args:
+            primary: Session factory of the primary
+        """
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= self.check_seconds:
+            db = primary()
+            try:
+                self.note_merge(read_data_version(db))
+            finally:
+                db.close()
+            self._checked_at = now
+
+    def current_requirement(self, primary: Callable[[], Session]) -> int:
+        """Newest version known to this worker, polling the primary if due."""
+        self.poll(primary)
+        return self.required_version
+
+    def current_data_version(self, primary: Callable[[], Session]) -> int:
+        """
+        Persisted data version the gold cache is keyed on, polling the primary if due.
+
+        Unlike required_version it follows the primary down as well, e.g. after
+        a restore, so entries built before are not served again.
+        """
+        self.poll(primary)
+        return self.data_version
+
+    def is_fresh(self, replica_db: Session, primary: Callable[[], Session]) -> bool:
+        """
+        Whether replica_db has replayed every merge known to this worker.
+
+        Args:
+            replica_db: Session on the replica, used for the read if fresh
+            primary: Session factory of the primary
+
+        Returns:
+            bool: True if the read can be served by the replica
+        """
+        fresh = read_data_version(replica_db) >= self.current_requirement(primary)
+        with self._lock:
+            if fresh:
+                self.replica_reads += 1
+            else:
+                self.primary_fallbacks += 1
+        return fresh
+
+    def record_fallback(self) -> None:
+        """Count a read sent to the primary because the replica failed."""
+        with self._lock:
+            self.primary_fallbacks += 1
+
+    def status(self) -> Dict[str, Any]:
+        """Snapshot of the guard, for monitoring."""
+        return {
+            "enabled": settings.read_database_url is not None,
+            "required_version": self.required_version,
+            "data_version": self.data_version,
+            "replica_reads": self.replica_reads,
+            "primary_fallbacks": self.primary_fallbacks,
+        }
+
+
+replica_guard = ReplicaGuard(settings.read_replica_version_check_seconds)
@@ -0,0 +1,161 @@
+"""
+Staging table lock module for the Globant Data Migration API.
+
+A bronze upload truncates its staging table and commits batch by batch, and
+a silver merge reads the staging table its dimension or fact comes from.
+Two loads of the same table, or a load and a merge of it, must not
+interleave; loads and merges of different tables may run in parallel.
+
+Every upload and merge therefore holds a PostgreSQL session-level advisory
+lock on its staging table, keyed by the table name. The lock is taken on
+the connection the request's session is bound to, so it spans the batch
+commits, works across workers and hosts, and is released by PostgreSQL if
+the worker dies. A request finding the table locked polls for it, checking
+a pool connection out for each attempt only, so requests queued behind a
+load do not hold the connections of their pool:
+
+    uploads wait up to settings.upload_lock_wait_seconds (default 0: rejected at once)
+    merges wait up to settings.merge_lock_wait_seconds (default 300: queued behind the load)
+
+and are rejected with 409 Conflict and a Retry-After header once the wait
+is exhausted.
+
+Functions:
+    upload_session: Dependency yielding an ingest session holding a staging table lock.
+    merge_session: Dependency yielding a merge session holding a staging table lock.
+    lock_key: Advisory lock key of a staging table.
+"""
+
+import asyncio
+import logging
+import time
+import zlib
+from typing import AsyncIterator, Callable
+
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import ingest_session_local, merge_session_local
+from app.core.metrics import Counter, Histogram, SLOW_BUCKETS, registry
+
+logger = logging.getLogger("app.locks")
+
+# First key of every staging table lock, so they cannot collide with other advisory locks
+LOCK_NAMESPACE = 20250
+
+# Interval between two attempts to take a busy lock
+POLL_SECONDS = 0.1
+
+lock_wait = registry.register(Histogram(
+    "staging_lock_wait_seconds",
+    "Time uploads and merges waited for the lock of their staging table",
+    ("table", "operation"),
+    (0.001,) + SLOW_BUCKETS,
+))
+lock_conflicts = registry.register(Counter(
+    "staging_lock_conflicts_total",
+    "Uploads and merges rejected with 409 because their staging table stayed locked",
+    ("table", "operation"),
+))
+
+
+def lock_key(table: str) -> int:
+    """Advisory lock key of a staging table: a stable signed 32-bit hash of its name."""
+    key = zlib.crc32(table.encode())
+    return key - (1 << 32) if key >= (1 << 31) else key
+
+
+def _try_lock(connection: Connection, table: str) -> bool:
+    acquired = connection.execute(
+        text("SELECT pg_try_advisory_lock(:namespace, :key)"),
+        {"namespace": LOCK_NAMESPACE, "key": lock_key(table)}
+    ).scalar()
+    # End the implicit transaction, the session starts its own ones
+    connection.commit()
+    return acquired
+
+
+def _unlock(connection: Connection, table: str) -> None:
+    try:
+        connection.execute(
+            text("SELECT pg_advisory_unlock(:namespace, :key)"),
+            {"namespace": LOCK_NAMESPACE, "key": lock_key(table)}
+        )
+        connection.commit()
+    except Exception:
+        # Closing the DBAPI connection ends the PostgreSQL session, which releases its locks
+        # (returning it to the pool would not)
+        logger.exception("Could not release the lock of %s", table)
+        connection.invalidate()
+    finally:
+        connection.close()
+
+
+def locked_session(factory: sessionmaker, table: str, operation: str) -> Callable[[], AsyncIterator[Session]]:
+    """
+    Build a dependency yielding a session of factory that holds the lock of table.
+
+    The session is bound to the pooled connection that took the lock for the
+    whole request, so its commits do not hand the connection (and the lock)
+    back to the pool. While the table is locked, each attempt returns its
+    connection to the pool before sleeping.
+
+    Args:
+        factory: Session factory of the workload pool
+        table: Staging table to lock
+        operation: "upload" or "merge", selecting settings.<operation>_lock_wait_seconds
+
+    Raises:
+        HTTPException: 409 with Retry-After if the table is still locked after the wait
+    """
+    async def get_session() -> AsyncIterator[Session]:
+        started = time.monotonic()
+        while True:
+            connection = await run_in_threadpool(factory.kw["bind"].connect)
+            try:
+                acquired = await run_in_threadpool(_try_lock, connection, table)
+            except BaseException:
+                # Interrupted during an attempt that may have taken the lock. A pooled connection
+                # keeps its session-level locks, so close the DBAPI connection instead of returning it
+                connection.invalidate()
+                connection.close()
+                raise
+            if acquired:
+                break
+            # Hand the connection back while waiting, the next attempt checks one out again
+            connection.close()
+            if time.monotonic() - started >= getattr(settings, f"{operation}_lock_wait_seconds"):
+                lock_conflicts.inc(table=table, operation=operation)
+                raise HTTPException(
+                    status_code=409,
+                    detail={
+                        "message": f"{table} is being loaded or merged by another request",
+                        "hint": "Retry once the running upload or merge of this table has finished"
+                    },
+                    headers={"Retry-After": str(settings.table_lock_retry_after_seconds)}
+                )
+            await asyncio.sleep(POLL_SECONDS)
+        lock_wait.observe(time.monotonic() - started, table=table, operation=operation)
+
+        db = factory(bind=connection)
+        try:
+            yield db
+        finally:
+            db.close()
+            await run_in_threadpool(_unlock, connection, table)
+
+    return get_session
+
+
+def upload_session(table: str) -> Callable[[], AsyncIterator[Session]]:
+    """Dependency yielding an ingest pool session that holds the lock of the staging table."""
+    return locked_session(ingest_session_local, table, "upload")
+
+
+def merge_session(table: str) -> Callable[[], AsyncIterator[Session]]:
+    """Dependency yielding a merge pool session that holds the lock of its source staging table."""
+    return locked_session(merge_session_local, table, "merge")
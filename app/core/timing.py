@@ -0,0 +1,90 @@
+"""
+Per-stage timing module for the Globant Data Migration API.
+
+Bronze uploads and silver merges time their stages (reading the body,
+parsing, validating, writing, committing, counting, the MERGE itself...)
+with a StageTimer. The timings are returned in the response's optional
+timings section and logged as one JSON object per line on the app.timings
+logger, so slow loads can be broken down after the fact.
+
+Classes:
+    StageTimer: Accumulates monotonic durations per named stage.
+"""
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator
+
+logger = logging.getLogger("app.timings")
+
+
+class StageTimer:
+    """
+    Monotonic per-stage timings of one upload or merge.
+
+    A stage entered several times (once per batch, once per row) accumulates
+    its durations. Time spent outside any stage is only part of total_ms.
+
+    Attributes:
+        name (str): What is timed, e.g. "bronze_upload" or "silver_merge"
+        context (dict): Fields identifying the operation in the log line, e.g. table
+        stages (Dict[str, float]): Stage name -> accumulated seconds, in first-entered order
+    """
+
+    def __init__(self, name: str, **context: Any) -> None:
+        self.name = name
+        self.context = context
+        self.stages: Dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add seconds to the stage name."""
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as part of the stage name."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def iterate(self, name: str, iterable: Iterable) -> Iterator:
+        """Yield the items of iterable, timing each next() as part of the stage name."""
+        iterator = iter(iterable)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add(name, time.perf_counter() - started)
+                return
+            self.add(name, time.perf_counter() - started)
+            yield item
+
+    def elapsed(self) -> float:
+        """Seconds since the timer was created."""
+        return time.perf_counter() - self._started
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Timings in milliseconds.
+
+        Returns:
+            Dict[str, Any]: total_ms since the timer was created and stages_ms,
+                stage name -> accumulated milliseconds
+        """
+        return {
+            "total_ms": round(self.elapsed() * 1000, 3),
+            "stages_ms": {name: round(seconds * 1000, 3) for name, seconds in self.stages.items()},
+        }
+
+    def log(self, **fields: Any) -> None:
+        """Emit the timings as a single JSON log line, with extra fields such as row counts."""
+        if logger.isEnabledFor(logging.INFO):
+            record = {"event": "stage_timings", "timer": self.name, **self.context, **fields}
+            record.update(self.report())
+            logger.info(json.dumps(record, default=str))
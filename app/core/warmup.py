@@ -0,0 +1,162 @@
+"""
+Startup warm-up module for the Globant Data Migration API.
+
+A fresh worker has empty connection pools, no columnar arrays and an empty
+gold response cache, so its first requests pay for connecting to
+PostgreSQL, loading dimensions and running the gold queries. warm_up()
+pays for them at startup instead:
+
+    pools       open settings.warmup_pool_connections connections in every
+                workload pool and return them, so they stay open
+    dimensions  load the columnar engine (fact arrays and dimension
+                dictionaries) when settings.gold_engine is "columnar"
+    gold        request settings.warmup_gold_paths through the app itself,
+                which stores their responses in the gold cache
+
+The first attempt runs in the application's lifespan startup, before the
+worker accepts connections. If it fails (e.g. the database is not up yet),
+the worker starts anyway and retries in the background every
+settings.warmup_retry_seconds; GET /ready answers 503 until one succeeds.
+
+Classes:
+    WarmupState: Readiness of this worker and the outcome of its warm-ups.
+
+Functions:
+    warm_up: Warm the pools, dimensions and gold cache once.
+    retry_warm_up: Retry warm_up in the background until it succeeds.
+
+Variables:
+    warmup_state: Readiness of this worker, reported by GET /ready
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import engines, read_session_local
+from app.core.timing import StageTimer
+
+logger = logging.getLogger("app.warmup")
+
+
+class WarmupState:
+    """
+    Readiness of this worker.
+
+    Attributes:
+        ready (bool): Whether a warm-up succeeded (or warm-up is disabled)
+        attempts (int): Warm-ups started
+        error (Optional[str]): Error of the last failed warm-up
+        timings (Optional[dict]): total_ms and stages_ms of the successful warm-up
+    """
+
+    def __init__(self) -> None:
+        self.ready = False
+        self.attempts = 0
+        self.error: Optional[str] = None
+        self.timings: Optional[Dict[str, Any]] = None
+        self._started = time.monotonic()
+
+    def reset(self) -> None:
+        """Forget earlier warm-ups, as in a fresh worker."""
+        self.__init__()
+
+    def status(self) -> Dict[str, Any]:
+        """Readiness, attempts, last error and timings of this worker."""
+        return {
+            "status": "ready" if self.ready else "warming",
+            "attempts": self.attempts,
+            "error": self.error,
+            "timings": self.timings,
+            "uptime_seconds": round(time.monotonic() - self._started, 3),
+        }
+
+
+def warm_pools(connections: int) -> Dict[str, int]:
+    """
+    Open up to connections connections in every workload pool at once, then return them.
+
+    Returns:
+        Dict[str, int]: Pool name -> connections opened
+    """
+    opened = {}
+    for name, engine in engines.items():
+        held = []
+        try:
+            for _ in range(min(connections, engine.pool.size())):
+                connection = engine.connect()
+                held.append(connection)
+                connection.execute(text("SELECT 1"))
+        finally:
+            for connection in held:
+                connection.close()
+        opened[name] = len(held)
+    return opened
+
+
+def warm_dimensions() -> bool:
+    """Load the columnar engine when it serves the gold metrics; return whether it was loaded."""
+    if settings.gold_engine != "columnar":
+        return False
+    from app.api.services.columnar import columnar_engine
+    db = read_session_local()
+    try:
+        columnar_engine.load(db)
+    finally:
+        db.close()
+    return True
+
+
+async def warm_gold(app) -> int:
+    """Request every warm-up gold path through the app, filling the gold cache; return the paths."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://warmup") as client:
+        for path in settings.warmup_gold_paths:
+            response = await client.get(path)
+            response.raise_for_status()
+    return len(settings.warmup_gold_paths)
+
+
+async def warm_up(app) -> None:
+    """
+    Warm the pools, dimensions and gold cache of this worker once.
+
+    Raises:
+        Exception: Whatever a step raised; the worker stays not ready
+    """
+    warmup_state.attempts += 1
+    timer = StageTimer("warmup", attempt=warmup_state.attempts)
+    try:
+        with timer.stage("pools"):
+            pools = await run_in_threadpool(warm_pools, settings.warmup_pool_connections)
+        with timer.stage("dimensions"):
+            columnar = await run_in_threadpool(warm_dimensions)
+        with timer.stage("gold"):
+            gold_paths = await warm_gold(app)
+    except Exception as exc:
+        warmup_state.error = f"{type(exc).__name__}: {exc}"
+        timer.log(ready=False, error=warmup_state.error)
+        raise
+    warmup_state.ready = True
+    warmup_state.error = None
+    warmup_state.timings = timer.report()
+    timer.log(ready=True, pools=pools, columnar=columnar, gold_paths=gold_paths)
+
+
+async def retry_warm_up(app) -> None:
+    """Retry warm_up every settings.warmup_retry_seconds until it succeeds."""
+    while not warmup_state.ready:
+        await asyncio.sleep(settings.warmup_retry_seconds)
+        try:
+            await warm_up(app)
+        except Exception:
+            logger.warning("Warm-up attempt %s failed: %s", warmup_state.attempts, warmup_state.error)
+
+
+warmup_state = WarmupState()
@@ -8,25 +8,72 @@ Routes:
     /: Root endpoint that returns a welcome message
     /docs: Swagger UI documentation (provided by FastAPI)
     /redoc: ReDoc documentation (provided by FastAPI)
+    /health: Liveness check
+    /ready: Readiness check, 503 until the worker is warm
+    /health/pools: Connection pool usage per workload
+    /health/replica: Read replica lag guard counters
+    /health/admission: Upload admission budget and usage
+    /metrics: Prometheus metrics of this worker
     /api/v1/bronze/*: Bronze layer endpoints for data upload
 """
 
+import asyncio
+import logging
 import sys
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.admission import UploadAdmissionMiddleware, upload_admission
 from app.core.config import settings
+from app.core.database import pool_status
+from app.core.metrics import CONTENT_TYPE, RequestMetricsMiddleware, registry
+from app.core.profiling import QueryProfileMiddleware, install_query_profiling
+from app.core.replica import replica_guard
+from app.core.warmup import retry_warm_up, warm_up, warmup_state
 from app.api.routes import router as api_router
 
 # Set recursion limit
 sys.setrecursionlimit(3000)
 
+# App loggers write structured (JSON) lines, such as the stage timings, as is
+app_logger = logging.getLogger("app")
+app_logger.setLevel(settings.log_level)
+if not app_logger.handlers:
+    log_handler = logging.StreamHandler()
+    log_handler.setFormatter(logging.Formatter("%(message)s"))
+    app_logger.addHandler(log_handler)
+app_logger.propagate = False
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Warm the worker up before it accepts connections (see app.core.warmup).
+
+    A failed warm-up does not stop the worker: it starts not ready and keeps
+    retrying in the background.
+    """
+    retry = None
+    if not settings.warmup_enabled:
+        warmup_state.ready = True
+    else:
+        try:
+            await warm_up(app)
+        except Exception:
+            app_logger.warning("Warm-up failed, starting not ready: %s", warmup_state.error)
+            retry = asyncio.create_task(retry_warm_up(app))
+    yield
+    if retry is not None:
+        retry.cancel()
+
 # Initialize FastAPI application
 app = FastAPI(
     title="Data Migration API",
     description="API for managing data migration between bronze, silver, and gold layers",
     version="1.0.0",
     docs_url="/docs",  # Swagger UI endpoint
-    redoc_url="/redoc"  # ReDoc endpoint
+    redoc_url="/redoc",  # ReDoc endpoint
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -38,6 +85,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Count statements and DB time per request, log (and optionally explain) slow ones
+install_query_profiling()
+app.add_middleware(QueryProfileMiddleware)
+
+# Admit bronze uploads within the in-flight budget of this worker, reject the excess with 503
+app.add_middleware(UploadAdmissionMiddleware)
+
+# Record request latency per route for /metrics
+app.add_middleware(RequestMetricsMiddleware)
+
 # Include routers
 app.include_router(api_router, prefix="/api/v1")
 
@@ -58,3 +115,81 @@ async def root():
             }
     """
     return {"message": "Welcome to Globant Data Migration API"}
+
+@app.get("/health")
+async def health():
+    """
+    Liveness check.
+
+    Returns:
+        dict: Status and API version
+    """
+    return {"status": "healthy", "version": app.version}
+
+@app.get("/ready")
+async def ready():
+    """
+    Readiness check.
+
+    Answers 503 until the worker's pools, dimensions and gold cache are warm,
+    so a load balancer only routes traffic to warm workers.
+
+    Returns:
+        dict: status ("ready" or "warming"), warm-up attempts, the last error
+            and the timings of the successful warm-up
+    """
+    return JSONResponse(status_code=200 if warmup_state.ready else 503, content=warmup_state.status())
+
+@app.get("/health/pools")
+async def health_pools():
+    """
+    Connection pool usage of each workload (ingest, merge, read).
+
+    A pool whose checked_out stays at size + max_overflow is exhausted and
+    its requests wait up to timeout_seconds for a connection.
+
+    Returns:
+        dict: Pool name -> configured size, max_overflow and timeout_seconds,
+            and the current checked_in, checked_out and overflow counts
+    """
+    return pool_status()
+
+@app.get("/health/replica")
+async def health_replica():
+    """
+    Read replica lag guard of this worker.
+
+    primary_fallbacks growing faster than replica_reads means the replica
+    keeps lagging behind the merges and the primary serves the reads.
+
+    Returns:
+        dict: Whether a replica is configured, the newest data version known
+            to this worker, and the reads served by the replica and by the primary
+    """
+    return replica_guard.status()
+
+@app.get("/health/admission")
+async def health_admission():
+    """
+    Upload admission control of this worker.
+
+    queued staying above zero, or rejected growing, means uploads arrive
+    faster than the worker's budget lets them be processed.
+
+    Returns:
+        dict: Configured budget (max_concurrent, max_inflight_bytes, queue_size),
+            the uploads and bytes in flight, the queued uploads, and the uploads
+            admitted and rejected (by reason) since startup
+    """
+    return upload_admission.status()
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Prometheus metrics of this worker, in the text exposition format.
+
+    Request latency per route, bronze rows per stage, silver merge duration
+    and rows, gold query latency, gold cache hits, pool checkout wait and upload
+    admission queue depth.
+    """
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
@@ -6,6 +6,8 @@ import pytest
 from fastapi.testclient import TestClient
 from io import StringIO
 import csv
+import json
+import logging
 
 from app.main import app
 from app.core.database import get_db, base, engine
@@ -116,4 +118,39 @@ def test_upload_invalid_column_count(test_db):
     assert response.status_code == 201
     assert len(response.json()["errors"]) == 2
     for error in response.json()["errors"]:
-        assert "Invalid number of columns" in error["error"] 
\ No newline at end of file
+        assert "Invalid number of columns" in error["error"] 
+# Test per-stage timings are only returned on request, and always logged
+def test_upload_timings(test_db, caplog):
+    test_data = [
+        [1, "John Doe", "2021-01-01T00:00:00Z", 1, 1],
+        [2, "Jane Smith", "invalid", 2, 2]
+    ]
+    csv_file = create_test_csv(test_data)
+    response = client.post(
+        "/api/v1/bronze/upload/hired_employees_csv/",
+        files={"file": ("test.csv", csv_file.getvalue(), "text/csv")}
+    )
+    assert response.status_code == 201
+    assert "timings" not in response.json()
+
+    logger = logging.getLogger("app.timings")
+    logger.addHandler(caplog.handler)
+    try:
+        response = client.post(
+            "/api/v1/bronze/upload/hired_employees_csv/?timings=true",
+            files={"file": ("test.csv", csv_file.getvalue(), "text/csv")}
+        )
+    finally:
+        logger.removeHandler(caplog.handler)
+    assert response.status_code == 201
+    timings = response.json()["timings"]
+    assert list(timings["stages_ms"]) == [
+        "count", "truncate", "read", "decode", "parse", "validate", "write", "commit", "profile"
+    ]
+    assert sum(timings["stages_ms"].values()) <= timings["total_ms"]
+
+    line = json.loads(caplog.records[-1].getMessage())
+    assert line["event"] == "stage_timings"
+    assert line["timer"] == "bronze_upload"
+    assert line["table"] == "stg_hired_employees"
+    assert (line["parsed"], line["written"], line["rejected"]) == (2, 1, 1)
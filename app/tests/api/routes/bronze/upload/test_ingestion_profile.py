@@ -0,0 +1,73 @@
+"""
+Tests for the profiles computed by the bronze uploads.
+"""
+
+from app.api.services.ingestion_profile import ApproxDistinct, LoadProfiler
+from app.tests.api.routes.helpers import client, upload_file
+
+# Test the distinct estimate is exact for small sets and within a few percent for large ones
+def test_approx_distinct():
+    small = ApproxDistinct()
+    for value in ["a", "b", "c", "a", "b"] * 10:
+        small.add(value)
+    assert small.estimate() == 3
+
+    large = ApproxDistinct()
+    for value in range(200000):
+        large.add(str(value % 50000))
+    assert abs(large.estimate() - 50000) < 50000 * 0.05
+
+# Test a hired employees load is profiled in its validation pass
+def test_hired_employees_profile(test_db):
+    body = (
+        b"1,John Doe,2021-03-01T00:00:00Z,1,1\n"
+        b"2,Jane Smith,2021-01-15T08:00:00Z,1,2\n"
+        b"3,Bob,2022-11-30T23:00:00Z,2,2\n"
+        b"4,,2021-05-01T00:00:00Z,1,1\n"
+        b"5,Alice,not a date,1,1\n"
+        b"6,Carol,2021-06-01T00:00:00Z\n"
+        b"7,Dave,2021-07-01T00:00:00Z\n"
+    )
+    assert upload_file("hired_employees", body).status_code == 201
+
+    response = client.get("/api/v1/bronze/profiles/stg_hired_employees/latest")
+    assert response.status_code == 200
+    profile = response.json()
+    assert profile["source_file"] == "hired_employees.csv"
+    assert (profile["rows_parsed"], profile["rows_written"], profile["rows_rejected"]) == (7, 3, 4)
+    assert profile["min_hire_datetime"] == "2021-01-15T08:00:00"
+    assert profile["max_hire_datetime"] == "2022-11-30T23:00:00"
+    columns = profile["columns"]
+    assert columns["name"]["empty"] == 1
+    assert columns["department_id"] == {"nulls": 2, "empty": 0, "approx_distinct": 2}
+    assert columns["id"]["approx_distinct"] == 7
+    assert profile["top_errors"] == [
+        {"error": "Invalid number of columns", "rows": 2},
+        {"error": "Missing value for name", "rows": 1},
+        {"error": "Invalid datetime format", "rows": 1},
+    ]
+
+# Test the hire datetime range orders dates without zero padding by value, across a checkpoint
+def test_profile_datetime_range_unpadded():
+    profiler = LoadProfiler("stg_hired_employees", ["id", "datetime"], datetime_column="datetime")
+    for row in [["1", "2021-01-15T08:00:00Z"], ["2", "2021-1-5T1:2:3Z"]]:
+        profiler.observe(row, {"id": row[0], "datetime": row[1]})
+    profiler = LoadProfiler.from_state(profiler.state())
+    profiler.observe(["3", "2021-9-30T00:00:00Z"], {"id": "3", "datetime": "2021-9-30T00:00:00Z"})
+    assert profiler.state()["min_datetime"] == "2021-01-05T01:02:03Z"
+    assert profiler.state()["max_datetime"] == "2021-09-30T00:00:00Z"
+
+# Test profiles are listed newest first per table, and a table never loaded has none
+def test_list_profiles(test_db):
+    assert client.get("/api/v1/bronze/profiles/stg_jobs/latest").status_code == 404
+    assert upload_file("jobs", b"1,Engineer\n2,Analyst\n").status_code == 201
+    assert upload_file("departments", b"1,Sales\n2\n").status_code == 201
+    assert upload_file("jobs", b"1,Engineer\n").status_code == 201
+
+    profiles = client.get("/api/v1/bronze/profiles/", params={"table": "stg_jobs"}).json()
+    assert [profile["rows_parsed"] for profile in profiles] == [1, 2]
+    assert all(profile["min_hire_datetime"] is None for profile in profiles)
+
+    latest = client.get("/api/v1/bronze/profiles/", params={"limit": 2}).json()
+    assert [profile["table"] for profile in latest] == ["stg_jobs", "stg_departments"]
+    assert latest[1]["columns"]["department"]["nulls"] == 1
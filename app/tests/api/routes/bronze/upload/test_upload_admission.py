@@ -0,0 +1,94 @@
+"""
+Tests for the admission control of bronze uploads.
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.core.admission import admission_rejections, upload_admission
+from app.core.config import settings
+from app.tests.api.routes.helpers import client, upload_file
+
+# A chunked body is sent without Content-Length, so admission charges it as it arrives
+CHUNKED_FORM = {"content-type": "multipart/form-data; boundary=chunked"}
+
+@pytest.fixture(scope="function")
+def busy_worker():
+    """Admit uploads as other requests would; release them on exit."""
+    held = []
+
+    def admit(size: int = 0):
+        assert upload_admission.try_acquire(size)
+        held.append(size)
+        return lambda: upload_admission.release(held.pop())
+
+    yield admit
+    for size in held:
+        upload_admission.release(size)
+
+# Test an upload beyond the concurrent ingestion limit is rejected fast, without blocking other requests
+def test_concurrency_limit(test_db, busy_worker, monkeypatch):
+    monkeypatch.setattr(settings, "upload_max_concurrent", 1)
+    monkeypatch.setattr(settings, "upload_admission_queue_size", 0)
+    busy_worker()
+    rejected = admission_rejections.value(reason="queue_full")
+
+    started = time.monotonic()
+    response = upload_file("departments", b"1,Sales\n")
+    assert response.status_code == 503
+    assert time.monotonic() - started < 0.5
+    assert response.headers["retry-after"] == str(settings.upload_admission_retry_after_seconds)
+    assert admission_rejections.value(reason="queue_full") == rejected + 1
+    assert client.get("/api/v1/gold/metrics/hired_by_quarter").status_code == 200
+
+# Test the byte budget counts the announced body sizes, and admits an oversized upload on an idle worker
+def test_byte_budget(test_db, busy_worker, monkeypatch):
+    monkeypatch.setattr(settings, "upload_max_inflight_bytes", 300)
+    monkeypatch.setattr(settings, "upload_admission_wait_seconds", 0)
+    release = busy_worker(200)
+
+    body = b"".join(f"{i},Department {i}\n".encode() for i in range(1, 20))
+    assert upload_file("departments", body).status_code == 503
+    release()
+    response = upload_file("departments", body)
+    assert response.status_code == 201
+    assert upload_admission.in_flight == 0 and upload_admission.bytes_in_flight == 0
+
+# Test a chunked upload is stopped once its bytes take the worker over budget
+def test_chunked_upload_over_budget(test_db, busy_worker, monkeypatch):
+    monkeypatch.setattr(settings, "upload_max_inflight_bytes", 300)
+    release = busy_worker(200)
+    rejected = admission_rejections.value(reason="over_budget")
+    parts = [f"{i},Department {i}\n".encode() for i in range(1, 20)]
+
+    response = client.post("/api/v1/bronze/upload/departments_csv/", content=iter(parts), headers=CHUNKED_FORM)
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == str(settings.upload_admission_retry_after_seconds)
+    assert admission_rejections.value(reason="over_budget") == rejected + 1
+    assert upload_admission.in_flight == 1 and upload_admission.bytes_in_flight == 200
+
+    release()
+    response = client.post("/api/v1/bronze/upload/departments_csv/", content=iter(parts), headers=CHUNKED_FORM)
+    assert response.status_code == 400
+    assert upload_admission.in_flight == 0 and upload_admission.bytes_in_flight == 0
+
+# Test a queued upload is admitted once a running one finishes, and the queue depth is exported
+def test_queued_upload_admitted(test_db, busy_worker, monkeypatch):
+    monkeypatch.setattr(settings, "upload_max_concurrent", 1)
+    monkeypatch.setattr(settings, "upload_admission_wait_seconds", 5)
+    release = busy_worker()
+    depths = []
+    threading.Timer(0.3, lambda: (depths.append(upload_admission.queued), release())).start()
+
+    response = upload_file("departments", b"1,Sales\n")
+    assert response.status_code == 201
+    assert depths == [1]
+    assert upload_admission.queued == 0
+
+    metrics = client.get("/metrics").text
+    assert "upload_admission_queue_depth 0" in metrics
+    assert 'upload_admission_in_flight{resource="uploads"} 0' in metrics
+    status = client.get("/health/admission").json()
+    assert status["max_concurrent"] == 1 and status["in_flight"] == 0
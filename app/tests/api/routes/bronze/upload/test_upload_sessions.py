@@ -0,0 +1,134 @@
+"""
+Tests for the resumable chunked upload of hired employees.
+"""
+
+import pytest
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import base, engine
+from app.tests.api.routes.helpers import client, upload_file
+
+SESSIONS = "/api/v1/bronze/upload/hired_employees_csv/sessions"
+
+FILE = (
+    "1,José Pérez,2021-03-01T00:00:00Z,1,1\n"
+    "2,Jane Smith,2021-01-15T08:00:00Z,1,2\n"
+    "3,,2021-05-01T00:00:00Z,1,1\n"
+    "4,Bob,2022-11-30T23:00:00Z,2,2\n"
+    "2,Jane Doe,2021-01-16T08:00:00Z,1,2"
+).encode()
+
+@pytest.fixture(scope="function")
+def test_db():
+    """Create test database tables before each test and drop them, and any session table, after."""
+    base.metadata.create_all(bind=engine)
+    yield
+    with engine.begin() as connection:
+        for (name,) in connection.execute(text("SELECT tablename FROM pg_tables WHERE tablename LIKE 'stg_hired_employees_upload_%'")):
+            connection.execute(text(f"DROP TABLE {name}"))
+    base.metadata.drop_all(bind=engine)
+
+def staged():
+    with engine.connect() as connection:
+        return dict(connection.execute(text("SELECT id, name FROM stg_hired_employees")).all())
+
+def create(total_bytes=None) -> str:
+    response = client.post(f"{SESSIONS}/", json={"filename": "hired_employees.csv", "total_bytes": total_bytes})
+    assert response.status_code == 201
+    assert response.json()["offset"] == 0
+    return response.json()["session_id"]
+
+def put(session_id: str, offset: int, chunk: bytes):
+    return client.put(f"{SESSIONS}/{session_id}", params={"offset": offset}, content=chunk)
+
+# Test chunks split inside rows and characters are loaded as they arrive, and finalize replaces staging
+def test_chunked_upload(test_db):
+    upload_file("hired_employees", b"9,Old,2020-01-01T00:00:00Z,1,1\n")
+    session_id = create(len(FILE))
+
+    split = FILE.index("é".encode()) + 1
+    response = put(session_id, 0, FILE[:split])
+    assert response.status_code == 200
+    assert response.headers["upload-offset"] == str(split)
+    assert response.json()["rows_parsed"] == 0
+
+    second = FILE.index(b"\n4,") + 3
+    progress = put(session_id, split, FILE[split:second]).json()
+    assert (progress["offset"], progress["rows_parsed"], progress["rows_written"], progress["rows_rejected"]) == (second, 3, 2, 1)
+    assert staged() == {"9": "Old"}
+
+    assert put(session_id, second, FILE[second:]).json()["offset"] == len(FILE)
+    response = client.post(f"{SESSIONS}/{session_id}/finalize")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total_processed"] == 4
+    assert body["errors"] == [{"row": 3, "data": ["3", "", "2021-05-01T00:00:00Z", "1", "1"], "error": "Missing value for name"}]
+    assert body["session"]["status"] == "finalized" and body["session"]["rows_parsed"] == 5
+    assert staged() == {"1": "José Pérez", "2": "Jane Doe", "4": "Bob"}
+
+    profile = client.get("/api/v1/bronze/profiles/stg_hired_employees/latest").json()
+    assert (profile["rows_parsed"], profile["rows_rejected"]) == (5, 1)
+    assert profile["columns"]["id"]["approx_distinct"] == 4
+    assert profile["max_hire_datetime"] == "2022-11-30T23:00:00"
+    assert client.put(f"{SESSIONS}/{session_id}", params={"offset": len(FILE)}, content=b"5").status_code == 409
+
+# Test an interrupted upload resumes from the committed offset, resent bytes being skipped
+def test_resume_from_offset(test_db):
+    session_id = create()
+    first = FILE.index(b"\n3,") + 1
+    assert put(session_id, 0, FILE[:first]).status_code == 200
+
+    response = put(session_id, first + 10, FILE[first + 10:])
+    assert response.status_code == 409
+    assert response.headers["upload-offset"] == str(first)
+
+    offset = int(client.get(f"{SESSIONS}/{session_id}").json()["offset"])
+    assert offset == first
+    assert put(session_id, 10, FILE[10:]).json()["offset"] == len(FILE)
+    assert put(session_id, 0, FILE[:first]).json()["rows_parsed"] == 4
+
+    assert client.post(f"{SESSIONS}/{session_id}/finalize").json()["total_processed"] == 4
+    assert staged() == {"1": "José Pérez", "2": "Jane Doe", "4": "Bob"}
+
+# Test an incomplete upload cannot be finalized, and an abandoned one leaves nothing behind
+def test_incomplete_and_aborted_upload(test_db):
+    session_id = create(len(FILE))
+    assert put(session_id, 0, FILE[:20]).status_code == 200
+    response = client.post(f"{SESSIONS}/{session_id}/finalize")
+    assert response.status_code == 409
+    assert response.headers["upload-offset"] == "20"
+    assert put(session_id, 20, FILE[20:] + b"\n6,Extra").status_code == 400
+
+    assert client.delete(f"{SESSIONS}/{session_id}").status_code == 204
+    assert client.get(f"{SESSIONS}/{session_id}").status_code == 404
+    with engine.connect() as connection:
+        assert connection.execute(text(f"SELECT to_regclass('stg_hired_employees_upload_{session_id}')")).scalar() is None
+    assert staged() == {}
+
+# Test a quoted field spanning lines is kept whole across chunks, and oversized chunks are refused
+def test_quoted_line_break_and_chunk_limit(test_db, monkeypatch):
+    body = b'1,"Ann\nLee",2021-03-01T00:00:00Z,1,1\n2,"Bo ""B""",2021-01-15T08:00:00Z,1,2\n'
+    session_id = create(len(body))
+    split = body.index(b"Lee")
+    assert put(session_id, 0, body[:split]).json()["rows_parsed"] == 0
+    assert put(session_id, split, body[split:]).json()["rows_parsed"] == 2
+    assert client.post(f"{SESSIONS}/{session_id}/finalize").status_code == 200
+    assert staged() == {"1": "Ann\nLee", "2": 'Bo "B"'}
+
+    monkeypatch.setattr(settings, "upload_chunk_max_bytes", 10)
+    session_id = create()
+    assert put(session_id, 0, FILE[:11]).status_code == 413
+    chunked = client.put(f"{SESSIONS}/{session_id}", params={"offset": 0}, content=iter([FILE[:6], FILE[6:12]]))
+    assert chunked.status_code == 413
+    assert client.get(f"{SESSIONS}/{session_id}").json()["offset"] == 0
+
+# Test idle open sessions are expired, with their table, when a session is created
+def test_idle_sessions_expire(test_db, monkeypatch):
+    idle = create()
+    assert put(idle, 0, FILE[:20]).status_code == 200
+    monkeypatch.setattr(settings, "upload_session_ttl_seconds", 0)
+    create()
+    assert client.get(f"{SESSIONS}/{idle}").status_code == 404
+    with engine.connect() as connection:
+        assert connection.execute(text(f"SELECT to_regclass('stg_hired_employees_upload_{idle}')")).scalar() is None
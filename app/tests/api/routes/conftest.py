@@ -0,0 +1,20 @@
+"""
+Fixtures shared by the route tests.
+"""
+
+import pytest
+
+from app.core.database import base, engine
+from app.tests.api.routes.helpers import merge_dimensions
+
+@pytest.fixture(scope="function")
+def test_db():
+    """Create test database tables before each test and drop them after."""
+    base.metadata.create_all(bind=engine)
+    yield
+    base.metadata.drop_all(bind=engine)
+
+@pytest.fixture(scope="function")
+def dimensions(test_db):
+    """Load and merge the dimensions referenced by the employee rows."""
+    merge_dimensions()
@@ -0,0 +1,66 @@
+"""
+Tests for the gold and silver export endpoints.
+"""
+
+import pytest
+from io import BytesIO, StringIO
+import csv
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.tests.api.routes.helpers import client, upload
+
+@pytest.fixture(scope="function")
+def loaded(test_db):
+    """Load and merge dimensions and hired employees."""
+    upload("departments", [[1, "Sales"], [2, "Marketing"]])
+    upload("jobs", [[1, "Recruiter"], [2, "Manager"]])
+    upload("hired_employees", [
+        [1, "Ann", "2021-01-10T09:00:00Z", 1, 1],
+        [2, "Bob", "2021-05-10T09:00:00Z", 1, 2],
+        [3, "Cid", "2021-08-10T09:00:00Z", 2, 2],
+    ])
+    client.post("/api/v1/silver/merge/dim_departments/merge")
+    client.post("/api/v1/silver/merge/dim_jobs/merge")
+    client.post("/api/v1/silver/merge/fact_hired_employees/merge")
+
+# Test the export content matches the JSON endpoint in every format
+def test_export_hired_by_quarter_formats(loaded):
+    expected = client.get("/api/v1/gold/metrics/hired_by_quarter").json()
+
+    response = client.get("/api/v1/gold/export/hired_by_quarter", params={"format": "parquet"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.parquet"
+    assert pq.read_table(BytesIO(response.content)).to_pylist() == expected
+
+    response = client.get(
+        "/api/v1/gold/export/hired_by_quarter",
+        headers={"Accept": "application/vnd.apache.arrow.stream"}
+    )
+    assert response.status_code == 200
+    assert pa.ipc.open_stream(response.content).read_all().to_pylist() == expected
+
+    response = client.get("/api/v1/gold/export/hired_by_quarter", headers={"Accept": "text/csv"})
+    rows = list(csv.DictReader(StringIO(response.text)))
+    assert [row["department"] for row in rows] == [row["department"] for row in expected]
+
+# Test unsupported formats are refused with 406
+def test_export_not_acceptable(loaded):
+    response = client.get(
+        "/api/v1/gold/export/departments_above_mean",
+        headers={"Accept": "application/xml"}
+    )
+    assert response.status_code == 406
+    response = client.get("/api/v1/gold/export/departments_above_mean", params={"format": "xlsx"})
+    assert response.status_code == 406
+
+# Test silver tables export in primary key order
+def test_export_silver_fact(loaded):
+    response = client.get(
+        "/api/v1/silver/export/fact_hired_employees",
+        params={"format": "arrow"}
+    )
+    assert response.status_code == 200
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column("id_employee").to_pylist() == [1, 2, 3]
+    assert str(table.schema.field("hire_datetime").type) == "timestamp[us]"
@@ -0,0 +1,95 @@
+"""
+Tests for the generic gold metric query endpoint.
+"""
+
+from app.core.cache import gold_cache
+from app.core.config import settings
+from app.api.services.metric_query import compile_metric_query
+from app.tests.api.routes.helpers import client, merge_employees
+
+EMPLOYEES = [
+    [1, "Ann", "2021-01-10T09:00:00Z", 1, 1],
+    [2, "Bob", "2021-05-10T09:00:00Z", 1, 1],
+    [3, "Cid", "2021-11-10T09:00:00Z", 1, 2],
+    [4, "Dee", "2021-08-10T09:00:00Z", 2, 2],
+    [5, "Eve", "2020-03-10T09:00:00Z", 2, 2],
+]
+
+URL = "/api/v1/gold/metrics/query"
+
+# Test grouping by department and quarter
+def test_query_department_by_quarter(dimensions):
+    merge_employees(EMPLOYEES)
+    response = client.get(URL, params={"dimensions": "department", "grain": "quarter"})
+    assert response.status_code == 200
+    assert [(row["period"], row["department"], row["hired"]) for row in response.json()] == [
+        ("2021-01-01", "Sales", 1),
+        ("2021-04-01", "Sales", 1),
+        ("2021-07-01", "Marketing", 1),
+        ("2021-10-01", "Sales", 1),
+    ]
+    assert response.json()[0] == {
+        "period": "2021-01-01", "department_id": 1, "department": "Sales",
+        "job_id": None, "job": None, "hired": 1
+    }
+
+# Test filters, a custom date range and both dimensions without a grain
+def test_query_filters_and_range(dimensions):
+    merge_employees(EMPLOYEES)
+    response = client.get(URL, params={
+        "dimensions": ["job", "department"],
+        "job_id": 2,
+        "start_date": "2020-01-01",
+        "end_date": "2021-12-31",
+    })
+    assert response.status_code == 200
+    assert [(row["department"], row["job"], row["hired"]) for row in response.json()] == [
+        ("Marketing", "Manager", 2),
+        ("Sales", "Manager", 1),
+    ]
+    assert all(row["period"] is None for row in response.json())
+
+# Test the total for the window when no dimension or grain is requested
+def test_query_total(dimensions):
+    merge_employees(EMPLOYEES)
+    response = client.get(URL, params={"year": 2021, "department_id": [1, 2]})
+    assert response.json() == [{
+        "period": None, "department_id": None, "department": None,
+        "job_id": None, "job": None, "hired": 4
+    }]
+
+# Test equivalent requests share one compiled statement and are served from the cache
+def test_query_shape_is_compiled_once(dimensions):
+    merge_employees(EMPLOYEES)
+    compile_metric_query.cache_clear()
+    first = client.get(URL, params={"dimensions": ["department", "job"], "grain": "month", "job_id": [2, 1]})
+    second = client.get(URL, params={"dimensions": ["job", "department"], "grain": "month", "job_id": [1, 2]})
+    assert first.json() == second.json()
+    assert second.headers["etag"] == first.headers["etag"]
+    client.get(URL, params={"dimensions": ["department", "job"], "grain": "month", "job_id": 1, "year": 2020})
+    info = compile_metric_query.cache_info()
+    assert (info.misses, info.currsize) == (1, 1)
+
+# Test unknown dimensions and grains are rejected
+def test_query_invalid_shape(dimensions):
+    assert client.get(URL, params={"dimensions": "employee"}).status_code == 422
+    assert client.get(URL, params={"grain": "hour"}).status_code == 422
+
+# Test the database-rendered body matches the model-rendered one for several shapes
+def test_query_database_json_renderer(dimensions, monkeypatch):
+    merge_employees(EMPLOYEES)
+    shapes = [
+        {"dimensions": ["department", "job"], "grain": "month"},
+        {"dimensions": "job", "grain": "day", "department_id": 1},
+        {"year": 2019},
+        {},
+    ]
+    for params in shapes:
+        results = []
+        for renderer in ("model", "database"):
+            monkeypatch.setattr(settings, "gold_json_renderer", renderer)
+            gold_cache.clear()
+            response = client.get(URL, params=params)
+            assert response.status_code == 200
+            results.append(response.json())
+        assert results[0] == results[1]
@@ -0,0 +1,334 @@
+"""
+Tests for the gold metrics endpoints.
+"""
+
+import pytest
+import json
+from sqlalchemy import text
+
+from app.core.cache import gold_cache
+from app.core.config import settings
+from app.core.replica import replica_guard
+from app.api.services.columnar import columnar_engine
+from app.api.services.gold_aggregates import rebuild_gold_aggregates
+from app.api.services.fact_partitions import ensure_fact_partitions
+from app.core.database import engine, session_local
+from app.api.routes.gold.metrics import HIRED_BY_QUARTER_RANGE_SQL, DEPARTMENTS_ABOVE_MEAN_RANGE_SQL, encode_cursor
+from app.tests.api.routes.helpers import client, merge_employees
+
+EMPLOYEES = [
+    [1, "Ann", "2021-01-10T09:00:00Z", 1, 1],
+    [2, "Bob", "2021-05-10T09:00:00Z", 1, 1],
+    [3, "Cid", "2021-11-10T09:00:00Z", 1, 2],
+    [4, "Dee", "2021-08-10T09:00:00Z", 2, 2],
+    [5, "Eve", "2020-03-10T09:00:00Z", 2, 2],
+]
+
+# Test the quarter pivot is served from the refreshed aggregate
+def test_hired_by_quarter(dimensions):
+    merge_employees(EMPLOYEES)
+    response = client.get("/api/v1/gold/metrics/hired_by_quarter")
+    assert response.status_code == 200
+    assert response.json() == [
+        {"department": "Marketing", "job": "Manager", "q1": 0, "q2": 0, "q3": 1, "q4": 0},
+        {"department": "Sales", "job": "Manager", "q1": 0, "q2": 0, "q3": 0, "q4": 1},
+        {"department": "Sales", "job": "Recruiter", "q1": 1, "q2": 1, "q3": 0, "q4": 0},
+    ]
+
+# Test departments above the mean number of hires
+def test_departments_above_mean(dimensions):
+    merge_employees(EMPLOYEES)
+    response = client.get("/api/v1/gold/metrics/departments_above_mean")
+    assert response.status_code == 200
+    assert response.json() == [{"id": 1, "department": "Sales", "hired": 3}]
+
+# Test a re-merge refreshes both the previous and the new keys of moved rows
+def test_merge_refreshes_touched_keys(dimensions):
+    merge_employees(EMPLOYEES)
+    stats = merge_employees([[3, "Cid", "2021-02-10T09:00:00Z", 2, 2]])
+    assert stats["gold_keys_refreshed"] == 2
+    response = client.get("/api/v1/gold/metrics/hired_by_quarter")
+    assert response.json() == [
+        {"department": "Marketing", "job": "Manager", "q1": 1, "q2": 0, "q3": 1, "q4": 0},
+        {"department": "Sales", "job": "Recruiter", "q1": 1, "q2": 1, "q3": 0, "q4": 0},
+    ]
+
+def rollup_rows() -> list:
+    with engine.connect() as conn:
+        return conn.execute(text("""
+            SELECT id_department, id_job, year, quarter, month, hired
+            FROM agg_hires_dept_job_period
+            ORDER BY 1, 2, 3, 4, 5
+        """)).fetchall()
+
+# Test merge deltas keep the rollup cube equal to a full rebuild
+def test_merge_deltas_match_rollup_rebuild(dimensions):
+    merge_employees(EMPLOYEES)
+    assert rollup_rows() == [
+        (1, 1, 2021, 1, 1, 1), (1, 1, 2021, 2, 5, 1), (1, 2, 2021, 4, 11, 1),
+        (2, 2, 2020, 1, 3, 1), (2, 2, 2021, 3, 8, 1),
+    ]
+    # Moves, an unchanged re-merge and a new hire in an existing key
+    merge_employees([
+        [2, "Bob", "2021-01-20T09:00:00Z", 1, 1],
+        [4, "Dee", "2021-08-10T09:00:00Z", 2, 2],
+        [5, "Eve", "2021-08-01T09:00:00Z", 2, 2],
+        [6, "Fay", "2021-11-30T09:00:00Z", 1, 2],
+    ])
+    incremental = rollup_rows()
+    assert incremental == [
+        (1, 1, 2021, 1, 1, 2), (1, 2, 2021, 4, 11, 2), (2, 2, 2021, 3, 8, 2),
+    ]
+    with session_local() as db:
+        rebuild_gold_aggregates(db)
+        db.commit()
+    assert rollup_rows() == incremental
+
+# Test month-aligned windows from the cube agree with the fact table
+def test_month_aligned_window_matches_fact(dimensions):
+    merge_employees(EMPLOYEES)
+    from_rollup = client.get(
+        "/api/v1/gold/metrics/hired_by_quarter",
+        params={"start_date": "2021-05-01", "end_date": "2021-08-31"}
+    ).json()
+    from_fact = client.get(
+        "/api/v1/gold/metrics/hired_by_quarter",
+        params={"start_date": "2021-05-01", "end_date": "2021-08-30"}
+    ).json()
+    assert from_rollup == from_fact == [
+        {"department": "Marketing", "job": "Manager", "q1": 0, "q2": 0, "q3": 1, "q4": 0},
+        {"department": "Sales", "job": "Recruiter", "q1": 0, "q2": 1, "q3": 0, "q4": 0},
+    ]
+
+# Test unchanged polls are answered with 304 from the cache
+def test_hired_by_quarter_etag(dimensions):
+    merge_employees(EMPLOYEES)
+    first = client.get("/api/v1/gold/metrics/hired_by_quarter")
+    etag = first.headers["etag"]
+    second = client.get(
+        "/api/v1/gold/metrics/hired_by_quarter",
+        headers={"If-None-Match": etag}
+    )
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert second.content == b""
+
+# Test a merge invalidates the cached response
+def test_merge_invalidates_cache(dimensions):
+    merge_employees(EMPLOYEES)
+    etag = client.get("/api/v1/gold/metrics/hired_by_quarter").headers["etag"]
+    merge_employees([[6, "Fay", "2021-04-10T09:00:00Z", 2, 1]])
+    response = client.get(
+        "/api/v1/gold/metrics/hired_by_quarter",
+        headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert {"department": "Marketing", "job": "Recruiter", "q1": 0, "q2": 1, "q3": 0, "q4": 0} in response.json()
+
+# Test a merge committed by another worker invalidates the cached response once the version is polled
+def test_other_worker_merge_invalidates_cache(dimensions, monkeypatch):
+    monkeypatch.setattr(replica_guard, "check_seconds", 0)
+    merge_employees(EMPLOYEES)
+    etag = client.get("/api/v1/gold/metrics/hired_by_quarter").headers["etag"]
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE agg_hires_dept_job_period SET hired = hired + 1 WHERE id_department = 2"))
+        connection.execute(text("UPDATE silver_data_version SET version = version + 1"))
+    response = client.get(
+        "/api/v1/gold/metrics/hired_by_quarter",
+        headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert {"department": "Marketing", "job": "Manager", "q1": 0, "q2": 0, "q3": 2, "q4": 0} in response.json()
+
+# Test the year parameter selects another year from the rollup cube
+def test_hired_by_quarter_other_year(dimensions):
+    merge_employees(EMPLOYEES)
+    response = client.get("/api/v1/gold/metrics/hired_by_quarter", params={"year": 2020})
+    assert response.status_code == 200
+    assert response.json() == [
+        {"department": "Marketing", "job": "Manager", "q1": 1, "q2": 0, "q3": 0, "q4": 0},
+    ]
+
+# Test a partial date range is answered from the fact table
+def test_hired_by_quarter_date_range(dimensions):
+    merge_employees(EMPLOYEES)
+    response = client.get(
+        "/api/v1/gold/metrics/hired_by_quarter",
+        params={"start_date": "2021-05-01", "end_date": "2021-08-10"}
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {"department": "Marketing", "job": "Manager", "q1": 0, "q2": 0, "q3": 1, "q4": 0},
+        {"department": "Sales", "job": "Recruiter", "q1": 0, "q2": 1, "q3": 0, "q4": 0},
+    ]
+
+# Test an empty date window is rejected
+def test_departments_above_mean_invalid_range(dimensions):
+    response = client.get(
+        "/api/v1/gold/metrics/departments_above_mean",
+        params={"start_date": "2021-06-01", "end_date": "2021-05-01"}
+    )
+    assert response.status_code == 400
+
+# Test a window leaving its year or past the last supported date is rejected, and year follows the dates
+def test_hired_by_quarter_window_bounds(dimensions):
+    merge_employees(EMPLOYEES)
+    url = "/api/v1/gold/metrics/hired_by_quarter"
+    assert client.get(url, params={"year": 2021, "start_date": "2020-03-01"}).status_code == 400
+    assert client.get(url, params={"start_date": "2020-12-01", "end_date": "2021-02-01"}).status_code == 400
+    assert client.get(url, params={"end_date": "9999-12-31"}).status_code == 422
+    response = client.get(url, params={"start_date": "2020-03-01", "end_date": "2020-03-31"})
+    assert response.json() == [{"department": "Marketing", "job": "Manager", "q1": 1, "q2": 0, "q3": 0, "q4": 0}]
+
+def explain_fact_access(sql: str, params: dict) -> list:
+    """Return (node type, index name, relation) for every plan node reading a fact partition."""
+    with engine.connect() as conn:
+        plan = conn.execute(text("EXPLAIN (FORMAT JSON) " + sql), params).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    access, stack = [], [plan[0]["Plan"]]
+    while stack:
+        node = stack.pop()
+        if node.get("Relation Name", "").startswith("fact_hired_employees") or \
+                node.get("Index Name", "").startswith("fact_hired_employees"):
+            access.append((node["Node Type"], node.get("Index Name"), node.get("Relation Name")))
+        stack.extend(node.get("Plans", []))
+    return access
+
+# Test the range predicates are sargable, prune to one year and use the hire_datetime index
+def test_range_queries_use_hire_datetime_index(dimensions):
+    db = session_local()
+    try:
+        ensure_fact_partitions(db, """(
+            SELECT TIMESTAMP '2016-01-01' AS hire_datetime UNION ALL SELECT TIMESTAMP '2021-12-31'
+        )""")
+        db.commit()
+    finally:
+        db.close()
+    with engine.begin() as conn:
+        conn.execute(text("""
+            INSERT INTO fact_hired_employees (id_employee, name, hire_datetime, id_department, id_job)
+            SELECT i, 'Employee ' || i, TIMESTAMP '2016-01-01' + i * INTERVAL '1 hour', 1 + i % 2, 1 + i % 2
+            FROM generate_series(1, 50000) AS i
+        """))
+        conn.execute(text("ANALYZE fact_hired_employees"))
+    params = {"start": "2021-03-01", "end": "2021-03-08"}
+    for sql in (HIRED_BY_QUARTER_RANGE_SQL, DEPARTMENTS_ABOVE_MEAN_RANGE_SQL):
+        access = explain_fact_access(sql, params)
+        assert all(node != "Seq Scan" for node, _, _ in access), access
+        assert {relation for _, _, relation in access if relation} <= {"fact_hired_employees_y2021"}, access
+        assert any(
+            node in ("Index Scan", "Index Only Scan", "Bitmap Index Scan")
+            and index.startswith("fact_hired_employees_y2021_hire_datetime")
+            for node, index, _ in access
+        ), access
+
+# Test walking keyset pages returns the full result in order
+def test_hired_by_quarter_keyset_pages(dimensions):
+    merge_employees(EMPLOYEES)
+    expected = client.get("/api/v1/gold/metrics/hired_by_quarter").json()
+    items, cursor = [], None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/api/v1/gold/metrics/hired_by_quarter/page", params=params).json()
+        items.extend(page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert items == expected
+
+# Test departments above mean pages and an invalid cursor
+def test_departments_above_mean_page(dimensions):
+    merge_employees(EMPLOYEES)
+    page = client.get(
+        "/api/v1/gold/metrics/departments_above_mean/page", params={"limit": 1}
+    ).json()
+    assert page == {"items": [{"id": 1, "department": "Sales", "hired": 3}], "next_cursor": None}
+    response = client.get(
+        "/api/v1/gold/metrics/departments_above_mean/page", params={"cursor": "not-a-cursor"}
+    )
+    assert response.status_code == 400
+    for values in ([{"a": 1}, "x"], ["3", 1], [True, 1]):
+        response = client.get(
+            "/api/v1/gold/metrics/departments_above_mean/page", params={"cursor": encode_cursor(values)}
+        )
+        assert response.status_code == 400
+    response = client.get("/api/v1/gold/metrics/hired_by_quarter/page", params={"cursor": encode_cursor(["Sales", 2])})
+    assert response.status_code == 400
+
+# Test the NDJSON stream yields one JSON object per line
+def test_hired_by_quarter_stream(dimensions):
+    merge_employees(EMPLOYEES)
+    expected = client.get("/api/v1/gold/metrics/hired_by_quarter").json()
+    response = client.get("/api/v1/gold/metrics/hired_by_quarter/stream")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in response.text.splitlines()] == expected
+
+@pytest.fixture(scope="function")
+def columnar(dimensions, monkeypatch):
+    """Serve the gold metrics from the in-memory columnar engine."""
+    monkeypatch.setattr(settings, "gold_engine", "columnar")
+    columnar_engine.clear()
+    gold_cache.clear()
+    yield columnar_engine
+    columnar_engine.clear()
+
+def gold_metrics(params: dict = None) -> tuple:
+    """Fetch both gold metrics, bypassing the response cache."""
+    gold_cache.clear()
+    return (
+        client.get("/api/v1/gold/metrics/hired_by_quarter", params=params).json(),
+        client.get("/api/v1/gold/metrics/departments_above_mean", params=params).json(),
+    )
+
+# Test the columnar engine returns the same results as the SQL queries
+def test_columnar_engine_matches_sql(columnar, monkeypatch):
+    merge_employees(EMPLOYEES)
+    for params in ({"year": 2021}, {"year": 2020}, {"start_date": "2021-05-01", "end_date": "2021-08-10"}):
+        monkeypatch.setattr(settings, "gold_engine", "sql")
+        expected = gold_metrics(params)
+        monkeypatch.setattr(settings, "gold_engine", "columnar")
+        assert gold_metrics(params) == expected
+    assert len(columnar) == len(EMPLOYEES)
+
+# Test the fact merge applies its rows to a loaded engine without a reload
+def test_columnar_engine_applies_merge_delta(columnar):
+    merge_employees(EMPLOYEES)
+    gold_metrics()
+    loaded_at = columnar.loaded_at
+    merge_employees([[3, "Cid", "2021-02-10T09:00:00Z", 2, 2], [6, "Fay", "2021-04-10T09:00:00Z", 2, 1]])
+    hired_by_quarter, departments_above_mean = gold_metrics()
+    assert columnar.loaded_at == loaded_at
+    assert len(columnar) == 6
+    assert hired_by_quarter == [
+        {"department": "Marketing", "job": "Manager", "q1": 1, "q2": 0, "q3": 1, "q4": 0},
+        {"department": "Marketing", "job": "Recruiter", "q1": 0, "q2": 1, "q3": 0, "q4": 0},
+        {"department": "Sales", "job": "Recruiter", "q1": 1, "q2": 1, "q3": 0, "q4": 0},
+    ]
+    assert departments_above_mean == [{"id": 2, "department": "Marketing", "hired": 3}]
+
+# Test the database-rendered body matches the model-rendered one
+def test_database_json_renderer_matches_models(dimensions, monkeypatch):
+    merge_employees(EMPLOYEES)
+    for params in ({"year": 2021}, {"start_date": "2021-05-01", "end_date": "2021-08-10"}, {"year": 1999}):
+        monkeypatch.setattr(settings, "gold_json_renderer", "model")
+        expected = gold_metrics(params)
+        monkeypatch.setattr(settings, "gold_json_renderer", "database")
+        assert gold_metrics(params) == expected
+    assert expected == ([], [])
+
+# Test a fact referencing a dimension id the engine has not loaded reloads the dimensions
+def test_columnar_engine_reloads_missing_dimension(columnar):
+    merge_employees(EMPLOYEES)
+    gold_metrics()
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO dim_departments (id_department, department) VALUES (3, 'Accounting')"))
+    merge_employees([[6, "Fay", "2021-04-10T09:00:00Z", 3, 1]])
+    hired_by_quarter, departments_above_mean = gold_metrics()
+    assert hired_by_quarter[0] == {"department": "Accounting", "job": "Recruiter", "q1": 0, "q2": 1, "q3": 0, "q4": 0}
+    assert len(hired_by_quarter) == 4
+    assert departments_above_mean == [{"id": 1, "department": "Sales", "hired": 3}]
@@ -0,0 +1,129 @@
+"""
+Tests for routing gold reads to a read replica with the replication lag guard.
+
+A second database on the local server stands in for the replica. It is not
+fed by replication, so each test sets its contents and data version to the
+state a lagging or caught up replica would be in.
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+from app.core import database
+from app.core.cache import gold_cache
+from app.core.config import settings
+from app.core.database import base, engine, create_session_factory
+from app.core.replica import read_data_version, replica_guard
+from app.api.services.gold_aggregates import rebuild_gold_aggregates
+from app.tests.api.routes.helpers import client, upload
+
+REPLICA_DATABASE = f"{make_url(settings.database_url).database}_replica"
+
+@pytest.fixture(scope="function")
+def replica(test_db, monkeypatch):
+    """
+    Point the read pool at a second database with the same schema.
+
+    Yields:
+        Engine: Engine of the replica database, to set up its contents
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text(f"DROP DATABASE IF EXISTS {REPLICA_DATABASE}"))
+        connection.execute(text(f"CREATE DATABASE {REPLICA_DATABASE}"))
+    url = make_url(settings.database_url).set(database=REPLICA_DATABASE)
+    replica_engine = create_engine(url)
+    base.metadata.create_all(bind=replica_engine)
+
+    monkeypatch.setattr(settings, "read_database_url", url.render_as_string(hide_password=False))
+    monkeypatch.setattr(database, "read_session_local", create_session_factory(replica_engine))
+    monkeypatch.setattr(database, "read_primary_session_local", create_session_factory(engine))
+    monkeypatch.setattr(replica_guard, "check_seconds", 0)
+    # Versions noted by earlier tests belong to databases that were dropped since
+    monkeypatch.setattr(replica_guard, "required_version", 0)
+    gold_cache.clear()
+    yield replica_engine
+
+    replica_engine.dispose()
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text(f"DROP DATABASE IF EXISTS {REPLICA_DATABASE}"))
+
+def merge_all():
+    """Load and merge one department, one job and two 2021 hires on the primary."""
+    upload("departments", [[1, "Sales"]])
+    upload("jobs", [[1, "Recruiter"]])
+    upload("hired_employees", [
+        [1, "Ann", "2021-01-10T09:00:00Z", 1, 1],
+        [2, "Bob", "2021-05-10T09:00:00Z", 1, 1],
+    ])
+    for table in ("dim_departments", "dim_jobs", "fact_hired_employees"):
+        assert client.post(f"/api/v1/silver/merge/{table}/merge").status_code == 200
+
+def load_replica(replica_engine, hires: int, version: int):
+    """Give the replica a department with a number of 2021 hires and a data version."""
+    with replica_engine.begin() as connection:
+        connection.execute(text("INSERT INTO dim_departments (id_department, department) VALUES (1, 'Sales')"))
+        connection.execute(text("INSERT INTO dim_jobs (id_job, job) VALUES (1, 'Recruiter')"))
+        connection.execute(text("CREATE TABLE fact_hired_employees_y2021 PARTITION OF fact_hired_employees FOR VALUES FROM ('2021-01-01') TO ('2022-01-01')"))
+        for employee in range(1, hires + 1):
+            connection.execute(text(
+                "INSERT INTO fact_hired_employees VALUES (:id, 'Replica', '2021-03-01', 1, 1)"
+            ), {"id": employee})
+        connection.execute(text("INSERT INTO silver_data_version (id, version) VALUES (1, :version)"), {"version": version})
+    with database.read_session_local() as db:
+        rebuild_gold_aggregates(db)
+        db.commit()
+
+def hired_2021() -> int:
+    """Total 2021 hires reported by the gold layer, bypassing the response cache."""
+    gold_cache.clear()
+    response = client.get("/api/v1/gold/metrics/hired_by_quarter")
+    assert response.status_code == 200
+    return sum(row[quarter] for row in response.json() for quarter in ("q1", "q2", "q3", "q4"))
+
+# Test every merge increments the persisted data version in its transaction
+def test_merges_record_data_version(test_db):
+    merge_all()
+    with database.session_local() as db:
+        assert read_data_version(db) == 3
+    assert replica_guard.required_version >= 3
+
+# Test a replica that has not replayed the last merge is bypassed
+def test_lagging_replica_falls_back_to_primary(replica):
+    merge_all()
+    load_replica(replica, hires=5, version=2)
+    fallbacks = replica_guard.primary_fallbacks
+
+    assert hired_2021() == 2
+    assert replica_guard.primary_fallbacks == fallbacks + 1
+
+# Test a replica that has replayed the last merge serves the reads
+def test_caught_up_replica_serves_reads(replica):
+    merge_all()
+    load_replica(replica, hires=5, version=3)
+    replica_reads = replica_guard.replica_reads
+
+    assert hired_2021() == 5
+    assert replica_guard.replica_reads == replica_reads + 1
+    response = client.get("/api/v1/silver/export/fact_hired_employees", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.text.count("Replica") == 5
+
+# Test a merge served by another worker is noticed by polling the primary
+def test_guard_polls_primary_version(replica):
+    merge_all()
+    load_replica(replica, hires=5, version=3)
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE silver_data_version SET version = version + 1"))
+
+    assert hired_2021() == 2
+
+# Test an unreachable replica sends the reads to the primary
+def test_unreachable_replica_falls_back_to_primary(replica, monkeypatch):
+    merge_all()
+    unreachable = create_engine(make_url(settings.database_url).set(database=f"{REPLICA_DATABASE}_missing"))
+    monkeypatch.setattr(database, "read_session_local", create_session_factory(unreachable))
+
+    assert hired_2021() == 2
+    response = client.get("/health/replica")
+    assert response.json()["enabled"] is True
@@ -0,0 +1,100 @@
+"""
+Tests for the gold hires time series endpoint.
+"""
+
+from app.core.cache import gold_cache
+from app.core.config import settings
+from app.core.database import session_local
+from sqlalchemy import text
+from app.tests.api.routes.helpers import client, merge_employees
+
+EMPLOYEES = [
+    [1, "Ann", "2021-01-10T09:00:00Z", 1, 1],
+    [2, "Bob", "2021-01-11T09:00:00Z", 1, 1],
+    [3, "Cid", "2021-01-11T15:00:00Z", 2, 2],
+    [4, "Dee", "2021-01-20T09:00:00Z", 1, 2],
+    [5, "Eve", "2020-12-30T09:00:00Z", 2, 2],
+]
+
+URL = "/api/v1/gold/metrics/timeseries"
+
+# Test the merge extends dim_date to whole years around the merged hires
+def test_merge_covers_hire_years(dimensions):
+    merge_employees(EMPLOYEES)
+    db = session_local()
+    try:
+        bounds = db.execute(text("SELECT MIN(date), MAX(date), COUNT(*) FROM dim_date")).fetchone()
+    finally:
+        db.close()
+    assert (str(bounds[0]), str(bounds[1]), bounds[2]) == ("2020-01-01", "2021-12-31", 366 + 365)
+
+# Test a daily series is gap-filled and its rolling window reaches before the start
+def test_daily_series(dimensions):
+    merge_employees(EMPLOYEES)
+    response = client.get(URL, params={
+        "start_date": "2021-01-09", "end_date": "2021-01-21", "rolling_periods": 3
+    })
+    assert response.status_code == 200
+    series = response.json()
+    assert len(series) == 13
+    assert [row["hired"] for row in series] == [0, 1, 2, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0]
+    assert series[0] == {
+        "period": "2021-01-09", "hired": 0, "rolling_hired": 0,
+        "rolling_average": 0.0, "cumulative_hired": 0
+    }
+    assert series[2] == {
+        "period": "2021-01-11", "hired": 2, "rolling_hired": 3,
+        "rolling_average": 1.0, "cumulative_hired": 3
+    }
+    assert series[-1]["cumulative_hired"] == 4
+
+    # Eve (2020-12-30) falls in the rolling window of January 1st, not in its running total
+    first = client.get(URL, params={"start_date": "2021-01-01", "end_date": "2021-01-01", "rolling_periods": 3})
+    assert first.json() == [{
+        "period": "2021-01-01", "hired": 0, "rolling_hired": 1,
+        "rolling_average": 0.3333, "cumulative_hired": 0
+    }]
+
+# Test weekly buckets are labelled by their Monday, span years and honour filters
+def test_weekly_series(dimensions):
+    merge_employees(EMPLOYEES)
+    response = client.get(URL, params={
+        "grain": "week", "rolling_periods": 2, "job_id": 2,
+        "start_date": "2020-12-30", "end_date": "2021-01-20"
+    })
+    assert response.status_code == 200
+    assert response.json() == [
+        {"period": "2020-12-28", "hired": 1, "rolling_hired": 1, "rolling_average": 0.5, "cumulative_hired": 1},
+        {"period": "2021-01-04", "hired": 0, "rolling_hired": 1, "rolling_average": 0.5, "cumulative_hired": 1},
+        {"period": "2021-01-11", "hired": 1, "rolling_hired": 1, "rolling_average": 0.5, "cumulative_hired": 2},
+        {"period": "2021-01-18", "hired": 1, "rolling_hired": 2, "rolling_average": 1.0, "cumulative_hired": 3},
+    ]
+
+# Test invalid grains and rolling windows are rejected
+def test_invalid_series(dimensions):
+    assert client.get(URL, params={"grain": "month"}).status_code == 422
+    assert client.get(URL, params={"rolling_periods": 0}).status_code == 422
+
+# Test windows, or rolling lookbacks, reaching days missing from dim_date are rejected
+def test_series_outside_calendar(dimensions):
+    merge_employees(EMPLOYEES)
+    assert client.get(URL, params={"year": 1950}).status_code == 400
+    response = client.get(URL, params={"start_date": "2020-01-01", "end_date": "2020-01-31", "rolling_periods": 3})
+    assert response.status_code == 400
+    assert "2019-12-30" in response.json()["detail"]
+    assert client.get(URL, params={"start_date": "2020-01-03", "end_date": "2020-01-31", "rolling_periods": 3}).status_code == 200
+
+# Test the database-rendered body matches the model-rendered one
+def test_series_database_json_renderer(dimensions, monkeypatch):
+    merge_employees(EMPLOYEES)
+    results = []
+    for renderer in ("model", "database"):
+        monkeypatch.setattr(settings, "gold_json_renderer", renderer)
+        gold_cache.clear()
+        response = client.get(URL, params={"grain": "week", "rolling_periods": 5, "year": 2021})
+        assert response.status_code == 200
+        results.append(response.json())
+    assert results[0] == results[1]
+    # 2021 widened to whole ISO weeks starts on Monday 2020-12-28, which includes Eve
+    assert results[0][0]["period"] == "2020-12-28"
+    assert sum(row["hired"] for row in results[0]) == 5
@@ -0,0 +1,49 @@
+"""
+Helpers shared by the route tests: the test client, and loading rows through
+the bronze upload and silver merge endpoints.
+"""
+
+from fastapi.testclient import TestClient
+from io import BytesIO, StringIO
+import csv
+
+from app.main import app
+
+client = TestClient(app)
+
+def create_test_csv(data: list) -> StringIO:
+    """Create a CSV file in memory from test data."""
+    output = StringIO()
+    writer = csv.writer(output)
+    for row in data:
+        writer.writerow(row)
+    output.seek(0)
+    return output
+
+def upload(table: str, data: list):
+    """Load rows into a staging table through its bronze endpoint."""
+    csv_file = create_test_csv(data)
+    response = client.post(
+        f"/api/v1/bronze/upload/{table}_csv/",
+        files={"file": ("test.csv", csv_file.getvalue(), "text/csv")}
+    )
+    assert response.status_code == 201
+    return response
+
+def upload_file(name: str, body: bytes):
+    """Send a raw CSV file to the bronze endpoint of name, whatever the outcome."""
+    return client.post(f"/api/v1/bronze/upload/{name}_csv/", files={"file": (f"{name}.csv", BytesIO(body), "text/csv")})
+
+def merge_dimensions():
+    """Load and merge the departments and jobs referenced by the test employees."""
+    upload("departments", [[1, "Sales"], [2, "Marketing"]])
+    upload("jobs", [[1, "Recruiter"], [2, "Manager"]])
+    client.post("/api/v1/silver/merge/dim_departments/merge")
+    client.post("/api/v1/silver/merge/dim_jobs/merge")
+
+def merge_employees(data: list):
+    """Load and merge hired employees into the fact table."""
+    upload("hired_employees", data)
+    response = client.post("/api/v1/silver/merge/fact_hired_employees/merge")
+    assert response.status_code == 200
+    return response.json()["statistics"]
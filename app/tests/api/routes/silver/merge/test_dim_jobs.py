@@ -0,0 +1,63 @@
+"""
+Tests for the jobs merge endpoint.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from io import StringIO
+import csv
+
+from app.main import app
+from app.core.database import base, engine
+
+client = TestClient(app)
+
+@pytest.fixture(scope="function")
+def test_db():
+    """Create test database tables before each test and drop them after."""
+    base.metadata.create_all(bind=engine)
+    yield
+    base.metadata.drop_all(bind=engine)
+
+def create_test_csv(data: list) -> StringIO:
+    """Create a CSV file in memory from test data."""
+    output = StringIO()
+    writer = csv.writer(output)
+    for row in data:
+        writer.writerow(row)
+    output.seek(0)
+    return output
+
+def upload_jobs(data: list):
+    """Load jobs into the staging table through the bronze endpoint."""
+    csv_file = create_test_csv(data)
+    response = client.post(
+        "/api/v1/bronze/upload/jobs_csv/",
+        files={"file": ("test.csv", csv_file.getvalue(), "text/csv")}
+    )
+    assert response.status_code == 201
+
+# Test first merge inserts every staging row
+def test_merge_inserts_new_rows(test_db):
+    upload_jobs([[1, "Recruiter"], [2, "Manager"], [3, "Analyst"]])
+    response = client.post("/api/v1/silver/merge/dim_jobs/merge")
+    assert response.status_code == 200
+    stats = response.json()["statistics"]
+    assert stats == {"total_processed": 3, "inserted": 3, "updated": 0, "unchanged": 0}
+
+# Test re-running the merge reports rows as unchanged, not updated
+def test_merge_is_idempotent(test_db):
+    upload_jobs([[1, "Recruiter"], [2, "Manager"]])
+    client.post("/api/v1/silver/merge/dim_jobs/merge")
+    response = client.post("/api/v1/silver/merge/dim_jobs/merge")
+    stats = response.json()["statistics"]
+    assert stats == {"total_processed": 2, "inserted": 0, "updated": 0, "unchanged": 2}
+
+# Test only rows whose name changed are counted as updated
+def test_merge_counts_changed_rows(test_db):
+    upload_jobs([[1, "Recruiter"], [2, "Manager"]])
+    client.post("/api/v1/silver/merge/dim_jobs/merge")
+    upload_jobs([[1, "Recruiter"], [2, "Director"], [3, "Designer"]])
+    response = client.post("/api/v1/silver/merge/dim_jobs/merge")
+    stats = response.json()["statistics"]
+    assert stats == {"total_processed": 3, "inserted": 1, "updated": 1, "unchanged": 1}
@@ -0,0 +1,150 @@
+"""
+Tests for the hired employees merge endpoint.
+"""
+
+from sqlalchemy import text
+
+from app.core.database import engine, session_local
+from app.api.services.gold_aggregates import rebuild_gold_aggregates
+from app.api.routes.silver.merge.fact_hired_employees import DEDUP_RULES
+from app.tests.api.routes.helpers import client, upload
+
+def fact_names() -> dict:
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT id_employee, name FROM fact_hired_employees"))
+        return {row.id_employee: row.name for row in rows}
+
+# Test ids that resolve to the same employee are merged in a single pass
+def test_merge_resolves_duplicate_ids(dimensions):
+    upload("hired_employees", [
+        [7, "First Seen", "2021-01-01T00:00:00Z", 1, 1],
+        [8, "Other", "2021-02-01T00:00:00Z", 2, 2],
+        ["07", "Last Seen", "2021-03-01T00:00:00Z", 2, 1],
+    ])
+    response = client.post("/api/v1/silver/merge/fact_hired_employees/merge")
+    assert response.status_code == 200
+    stats = response.json()["statistics"]
+    assert stats["duplicate_records"] == 1
+    assert stats["dedup_rule"] == "last_loaded"
+    assert fact_names() == {7: "Last Seen", 8: "Other"}
+
+# Test the dedup rule can be overridden per request
+def test_merge_first_loaded_rule(dimensions):
+    upload("hired_employees", [
+        [7, "First Seen", "2021-03-01T00:00:00Z", 1, 1],
+        ["07", "Last Seen", "2021-01-01T00:00:00Z", 2, 1],
+    ])
+    response = client.post(
+        "/api/v1/silver/merge/fact_hired_employees/merge",
+        params={"dedup_rule": "first_loaded"}
+    )
+    assert response.status_code == 200
+    assert fact_names() == {7: "First Seen"}
+
+# Test an id repeated verbatim in one upload keeps its last row in staging, whatever the dedup rule
+def test_merge_exact_duplicate_id(dimensions):
+    for rule in DEDUP_RULES:
+        upload("hired_employees", [
+            [7, "First Seen", "2021-03-01T00:00:00Z", 1, 1],
+            [7, "Last Seen", "2021-01-01T00:00:00Z", 2, 1],
+        ])
+        response = client.post(
+            "/api/v1/silver/merge/fact_hired_employees/merge",
+            params={"dedup_rule": rule}
+        )
+        assert response.status_code == 200
+        assert response.json()["statistics"]["duplicate_records"] == 0
+        assert fact_names() == {7: "Last Seen"}
+
+# Test unknown dedup rules are rejected before touching the database
+def test_merge_unknown_rule(dimensions):
+    response = client.post(
+        "/api/v1/silver/merge/fact_hired_employees/merge",
+        params={"dedup_rule": "random"}
+    )
+    assert response.status_code == 400
+
+def fact_partitions() -> dict:
+    """Employee id -> partition holding its row."""
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT id_employee, tableoid::regclass::text AS partition FROM fact_hired_employees"))
+        return {row.id_employee: row.partition for row in rows}
+
+def rollup_rows() -> list:
+    with engine.connect() as conn:
+        return conn.execute(text("""
+            SELECT id_department, id_job, year, month, hired
+            FROM agg_hires_dept_job_period ORDER BY 1, 2, 3, 4
+        """)).fetchall()
+
+# Test the merge creates hire year partitions and moves updated rows between them
+def test_merge_moves_rows_across_year_partitions(dimensions):
+    upload("hired_employees", [
+        [1, "Ann", "2020-06-01T00:00:00Z", 1, 1],
+        [2, "Bob", "2021-06-01T00:00:00Z", 1, 1],
+    ])
+    assert client.post("/api/v1/silver/merge/fact_hired_employees/merge").status_code == 200
+    upload("hired_employees", [[1, "Ann", "2022-02-01T00:00:00Z", 2, 2]])
+    assert client.post("/api/v1/silver/merge/fact_hired_employees/merge").status_code == 200
+    assert fact_partitions() == {1: "fact_hired_employees_y2022", 2: "fact_hired_employees_y2021"}
+
+# Test a hire year is swapped for the staging rows of that year
+def test_replace_year(dimensions):
+    upload("hired_employees", [
+        [1, "Ann", "2020-06-01T00:00:00Z", 1, 1],
+        [2, "Bob", "2021-06-01T00:00:00Z", 1, 1],
+        [3, "Cid", "2021-07-01T00:00:00Z", 2, 2],
+    ])
+    assert client.post("/api/v1/silver/merge/fact_hired_employees/merge").status_code == 200
+    upload("hired_employees", [
+        [1, "Ann Moved", "2021-02-01T00:00:00Z", 1, 2],
+        [3, "Cid Reloaded", "2021-08-01T00:00:00Z", 2, 1],
+        [4, "Dee", "2021-09-01T00:00:00Z", 2, 2],
+        [5, "Eve", "2019-01-01T00:00:00Z", 1, 1],
+    ])
+    response = client.post(
+        "/api/v1/silver/merge/fact_hired_employees/replace_year", params={"year": 2021}
+    )
+    assert response.status_code == 200
+    stats = response.json()["statistics"]
+    assert (stats["loaded_records"], stats["replaced_records"], stats["moved_records"]) == (3, 2, 1)
+    assert stats["other_year_records"] == 1
+    assert fact_names() == {1: "Ann Moved", 3: "Cid Reloaded", 4: "Dee"}
+    assert set(fact_partitions().values()) == {"fact_hired_employees_y2021"}
+    # Analyzed before the swap, the statistics carried over to the attached partition
+    with engine.connect() as conn:
+        assert conn.execute(text(
+            "SELECT reltuples FROM pg_class WHERE relname = 'fact_hired_employees_y2021'"
+        )).scalar() == 3
+
+    # The cube deltas match a full rebuild
+    maintained = rollup_rows()
+    db = session_local()
+    try:
+        rebuild_gold_aggregates(db)
+        db.commit()
+    finally:
+        db.close()
+    assert rollup_rows() == maintained
+
+    # The swapped partition is indexed like the fact and a second swap works
+    upload("hired_employees", [[6, "Fay", "2021-03-01T00:00:00Z", 1, 1]])
+    response = client.post(
+        "/api/v1/silver/merge/fact_hired_employees/replace_year", params={"year": 2021}
+    )
+    assert response.json()["statistics"]["replaced_records"] == 3
+    assert fact_names() == {6: "Fay"}
+
+# Test the merge reports its count, MERGE and stats stages separately on request
+def test_merge_timings(dimensions):
+    upload("hired_employees", [[1, "Ann", "2021-06-01T00:00:00Z", 1, 1]])
+    response = client.post("/api/v1/silver/merge/fact_hired_employees/merge")
+    assert "timings" not in response.json()
+
+    response = client.post(
+        "/api/v1/silver/merge/fact_hired_employees/merge", params={"timings": True}
+    )
+    assert response.status_code == 200
+    stages = response.json()["timings"]["stages_ms"]
+    assert {"stage", "count", "partitions", "gold_deltas", "merge", "stats", "commit"} <= set(stages)
+    assert all(duration >= 0 for duration in stages.values())
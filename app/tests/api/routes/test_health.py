@@ -0,0 +1,56 @@
+"""
+Tests for the health and connection pool monitoring endpoints.
+"""
+
+import pytest
+from collections import Counter
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.database import engines
+from app.tests.api.routes.helpers import client, upload
+
+@pytest.fixture(scope="function")
+def checkouts():
+    """Count connection checkouts per workload pool."""
+    counts = Counter()
+    listeners = []
+    for name, pool_engine in engines.items():
+        def on_checkout(dbapi_connection, connection_record, connection_proxy, name=name):
+            counts[name] += 1
+        event.listen(pool_engine, "checkout", on_checkout)
+        listeners.append((pool_engine, on_checkout))
+    yield counts
+    for pool_engine, on_checkout in listeners:
+        event.remove(pool_engine, "checkout", on_checkout)
+
+# Test the liveness endpoint
+def test_health():
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json() == {"status": "healthy", "version": "1.0.0"}
+
+# Test every workload pool is reported with its configured sizing
+def test_health_pools():
+    response = client.get("/health/pools")
+    assert response.status_code == 200
+    pools = response.json()
+    assert set(pools) == {"ingest", "merge", "read"}
+    assert pools["read"]["size"] == settings.read_pool_size
+    assert pools["read"]["max_overflow"] == settings.read_pool_max_overflow
+    assert pools["ingest"]["timeout_seconds"] == settings.ingest_pool_timeout_seconds
+    assert all(pool["checked_out"] == 0 for pool in pools.values())
+
+# Test uploads, merges and gold reads each check out from their own pool
+def test_routes_use_workload_pools(test_db, checkouts):
+    upload("departments", [[1, "Sales"]])
+    assert set(checkouts) == {"ingest"}
+
+    checkouts.clear()
+    assert client.post("/api/v1/silver/merge/dim_departments/merge").status_code == 200
+    assert set(checkouts) == {"merge"}
+
+    checkouts.clear()
+    assert client.get("/api/v1/gold/metrics/departments_above_mean").status_code == 200
+    assert client.get("/api/v1/silver/export/dim_departments").status_code == 200
+    assert set(checkouts) == {"read"}
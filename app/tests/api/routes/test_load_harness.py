@@ -0,0 +1,44 @@
+"""
+Tests for the mixed traffic load harness, run in process over the ASGI app.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.main import app
+from app.core.cache import gold_cache
+from app.core.config import settings
+from benchmarks import load
+
+async def replay(mix: str, rate: float, duration: float) -> dict:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        await load.setup(client)
+        return await load.run_load(client, load.parse_mix(mix), rate, duration, concurrency=4)
+
+# Test the mix is parsed into weights and unknown scenarios are refused
+def test_parse_mix():
+    assert load.parse_mix("upload=1, gold=3,merge") == {"upload": 1.0, "gold": 3.0, "merge": 1.0}
+    with pytest.raises(ValueError):
+        load.parse_mix("delete=1")
+    with pytest.raises(ValueError):
+        load.parse_mix("gold=0")
+
+# Test a mixed run reports every endpoint it hit, with percentiles and no errors
+def test_mixed_run_report(test_db, monkeypatch):
+    gold_cache.clear()
+    # Queue overlapping uploads behind each other instead of rejecting them
+    monkeypatch.setattr(settings, "upload_lock_wait_seconds", 60)
+    report = asyncio.run(replay("upload=1,merge=1,gold=2", rate=40, duration=1))
+
+    total = report.pop("total")
+    assert total["requests"] == 40
+    assert total["target_rps"] == 40
+    assert sum(summary["requests"] for summary in report.values()) == 40
+    assert "POST /api/v1/bronze/upload/hired_employees_csv/" in report
+    assert any(endpoint.startswith("GET /api/v1/gold/metrics/") for endpoint in report)
+    for summary in report.values():
+        assert summary["error_rate"] == 0
+        assert summary["p50_ms"] <= summary["p90_ms"] <= summary["p99_ms"] <= summary["max_ms"]
+        assert set(summary["statuses"]) <= {"200", "201"}
@@ -0,0 +1,92 @@
+"""
+Tests for the Prometheus metrics endpoint.
+"""
+
+import pytest
+import re
+
+from app.core.cache import gold_cache
+from app.core.metrics import Counter, Histogram, Registry
+from app.tests.api.routes.helpers import client, upload
+
+def scrape() -> dict:
+    """Fetch /metrics and parse it into sample (name and labels) -> value."""
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples = {}
+    for line in response.text.splitlines():
+        if line and not line.startswith("#"):
+            sample, value = line.rsplit(" ", 1)
+            samples[sample] = float(value)
+    return samples
+
+def delta(before: dict, after: dict, sample: str) -> float:
+    return after.get(sample, 0) - before.get(sample, 0)
+
+# Test the exposition format of counters and cumulative histogram buckets
+def test_registry_render():
+    registry = Registry()
+    counter = registry.register(Counter("jobs_total", "Jobs", ("kind",)))
+    histogram = registry.register(Histogram("job_seconds", "Job time", (), buckets=(0.1, 1)))
+    counter.inc(2, kind='say "hi"')
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+
+    assert registry.render().splitlines() == [
+        "# HELP jobs_total Jobs",
+        "# TYPE jobs_total counter",
+        'jobs_total{kind="say \\"hi\\""} 2',
+        "# HELP job_seconds Job time",
+        "# TYPE job_seconds histogram",
+        'job_seconds_bucket{le="0.1"} 1',
+        'job_seconds_bucket{le="1"} 2',
+        'job_seconds_bucket{le="+Inf"} 3',
+        "job_seconds_sum 5.55",
+        "job_seconds_count 3",
+    ]
+    with pytest.raises(ValueError):
+        counter.inc(-1, kind="x")
+
+# Test bronze rows are counted per stage, and requests per route template
+def test_bronze_rows_and_request_latency(test_db):
+    before = scrape()
+    response = upload("departments", [[1, "Sales"], [2, "Marketing"], [3]])
+    assert response.status_code == 201
+    after = scrape()
+
+    table = 'table="stg_departments"'
+    assert delta(before, after, f'bronze_rows_total{{{table},stage="parsed"}}') == 3
+    assert delta(before, after, f'bronze_rows_total{{{table},stage="validated"}}') == 2
+    assert delta(before, after, f'bronze_rows_total{{{table},stage="written"}}') == 2
+    assert delta(before, after, f'bronze_rows_total{{{table},stage="rejected"}}') == 1
+    route = 'method="POST",route="/api/v1/bronze/upload/departments_csv/",status="201"'
+    assert delta(before, after, f"http_request_duration_seconds_count{{{route}}}") == 1
+
+    client.get("/no/such/route")
+    unmatched = 'method="GET",route="unmatched",status="404"'
+    assert scrape()[f"http_request_duration_seconds_count{{{unmatched}}}"] >= 1
+
+# Test merges, gold queries, cache hits and pool checkouts are recorded
+def test_merge_gold_and_pool_metrics(test_db):
+    upload("departments", [[1, "Sales"], [2, "Marketing"]])
+    before = scrape()
+    assert client.post("/api/v1/silver/merge/dim_departments/merge").status_code == 200
+    gold_cache.clear()
+    assert client.get("/api/v1/gold/metrics/hired_by_quarter").status_code == 200
+    assert client.get("/api/v1/gold/metrics/hired_by_quarter").status_code == 200
+    after = scrape()
+
+    merge = 'table="dim_departments",operation="merge"'
+    assert delta(before, after, f"silver_merge_duration_seconds_count{{{merge}}}") == 1
+    assert delta(before, after, f"silver_merge_rows_total{{{merge}}}") == 2
+    gold = 'endpoint="hired_by_quarter"'
+    assert delta(before, after, f"gold_query_duration_seconds_count{{{gold}}}") == 1
+    assert delta(before, after, "gold_cache_hits_total") == 1
+    assert delta(before, after, "gold_cache_misses_total") == 1
+    assert 0 < after["gold_cache_hit_ratio"] <= 1
+    for pool in ("merge", "read"):
+        assert delta(before, after, f'db_pool_checkout_wait_seconds_count{{pool="{pool}"}}') >= 1
+        assert after[f'db_pool_checked_out{{pool="{pool}"}}'] == 0
+    assert all(re.fullmatch(r"[a-z_]+(\{.*\})?", sample) for sample in after)
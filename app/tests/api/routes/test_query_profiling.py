@@ -0,0 +1,91 @@
+"""
+Tests for the SQL profiling hook: per-request statement counts, the slow
+query log and EXPLAIN capture into query_diagnostics.
+"""
+
+import pytest
+import json
+import logging
+from datetime import datetime
+from sqlalchemy import text
+
+from app.core.cache import gold_cache
+from app.core.config import settings
+from app.core.database import engine
+from app.core.profiling import parameters_shape
+from app.tests.api.routes.helpers import client, upload
+
+@pytest.fixture(scope="function")
+def slow_queries(monkeypatch, caplog):
+    """Treat every statement as slow and capture the app.queries log lines."""
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 0)
+    logger = logging.getLogger("app.queries")
+    logger.addHandler(caplog.handler)
+    yield caplog
+    logger.removeHandler(caplog.handler)
+
+def employees(count: int) -> list:
+    return [[i, f"Employee {i}", "2021-03-01T00:00:00Z", 1, 1] for i in range(1, count + 1)]
+
+# Test parameters are described by name and type only
+def test_parameters_shape():
+    assert parameters_shape({"start": datetime(2021, 1, 1), "ids": [1, 2], "name": "Ann"}) == {
+        "start": "datetime", "ids": "list[2]", "name": "str"
+    }
+    assert parameters_shape(("a", 1)) == ["str", "int"]
+    assert parameters_shape([{"id": 1}, {"id": 2}], executemany=True) == {
+        "executions": 2, "each": {"id": "int"}
+    }
+
+# Test the statement count of an upload grows with its rows (one lookup per row)
+def test_statement_count_exposes_per_row_queries(test_db):
+    gold_cache.clear()
+    small = int(upload("hired_employees", employees(2)).headers["x-db-statements"])
+    large = int(upload("hired_employees", employees(6)).headers["x-db-statements"])
+    assert large - small >= 4
+
+    response = client.get("/api/v1/gold/metrics/hired_by_quarter")
+    assert int(response.headers["x-db-statements"]) >= 1
+    assert response.headers["server-timing"].startswith("db;dur=")
+    metrics = client.get("/metrics").text
+    assert 'http_request_db_statements_count{route="/api/v1/bronze/upload/hired_employees_csv/"}' in metrics
+
+# Test slow statements are logged with their parameter shape, not their values
+def test_slow_query_log(test_db, slow_queries):
+    gold_cache.clear()
+    client.get("/api/v1/gold/metrics/hired_by_quarter", params={"year": 2021})
+
+    lines = [json.loads(record.getMessage()) for record in slow_queries.records if record.getMessage().startswith("{")]
+    gold = [line for line in lines if line["route"] == "/api/v1/gold/metrics/hired_by_quarter"]
+    assert gold
+    assert all(line["event"] == "slow_query" and line["duration_ms"] >= 0 for line in gold)
+    shapes = [line["parameters"] for line in gold if line["parameters"]]
+    assert {"start_year": "int", "end_year": "int"}.items() <= shapes[0].items()
+    assert "2021" not in json.dumps(shapes)
+
+# Test plans of slow gold and merge statements are captured and the merge is not applied twice
+def test_explain_capture(test_db, slow_queries, monkeypatch):
+    monkeypatch.setattr(settings, "slow_query_explain", True)
+    upload("departments", [[1, "Sales"]])
+    upload("jobs", [[1, "Recruiter"]])
+    upload("hired_employees", employees(3))
+    for table in ("dim_departments", "dim_jobs", "fact_hired_employees"):
+        assert client.post(f"/api/v1/silver/merge/{table}/merge").status_code == 200
+    gold_cache.clear()
+    assert client.get("/api/v1/gold/metrics/hired_by_quarter").json()[0]["q1"] == 3
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM fact_hired_employees")).scalar() == 3
+        assert conn.execute(text("SELECT version FROM silver_data_version")).scalar() == 3
+        captured = conn.execute(text("""
+            SELECT route, statement, plan FROM query_diagnostics ORDER BY id
+        """)).fetchall()
+    routes = {row.route for row in captured}
+    assert "/api/v1/silver/merge/fact_hired_employees/merge" in routes
+    assert "/api/v1/gold/metrics/hired_by_quarter" in routes
+    assert not any(route.startswith("/api/v1/bronze/") for route in routes)
+    merge = next(row for row in captured if row.statement.lstrip().startswith("MERGE"))
+    # Stored parsed, or as text where the server's JSON for a partitioned MERGE is malformed
+    plan = merge.plan if isinstance(merge.plan, str) else json.dumps(merge.plan)
+    assert '"Node Type": "ModifyTable"' in plan
+    assert '"Execution Time"' in plan
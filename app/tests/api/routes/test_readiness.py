@@ -0,0 +1,65 @@
+"""
+Tests for the startup warm-up and the readiness endpoint.
+"""
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.cache import gold_cache
+from app.core.config import settings
+from app.core.database import engines, pool_status
+from app.core.warmup import warmup_state
+
+@pytest.fixture(scope="function")
+def fresh_worker():
+    """Start from an empty gold cache and a worker that never warmed up."""
+    gold_cache.clear()
+    warmup_state.reset()
+    yield
+    warmup_state.reset()
+
+# Test a worker is not ready before its startup has run
+def test_not_ready_before_startup(fresh_worker):
+    response = TestClient(app).get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "warming"
+
+# Test the startup warms the pools and the gold cache before the worker is ready
+def test_startup_warms_pools_and_gold_cache(test_db, fresh_worker):
+    for pool_engine in engines.values():
+        pool_engine.dispose()
+    with TestClient(app) as client:
+        response = client.get("/ready")
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "ready" and body["attempts"] == 1
+        assert set(body["timings"]["stages_ms"]) == {"pools", "dimensions", "gold"}
+
+        assert len(gold_cache) == len(settings.warmup_gold_paths)
+        hits = gold_cache.hits
+        assert client.get(settings.warmup_gold_paths[0]).status_code == 200
+        assert gold_cache.hits == hits + 1
+        pools = pool_status()
+        for name in ("ingest", "merge", "read"):
+            assert pools[name]["checked_in"] >= settings.warmup_pool_connections
+
+# Test a failed warm-up starts the worker not ready and is retried until it succeeds
+def test_failed_warm_up_is_retried(test_db, fresh_worker, monkeypatch):
+    monkeypatch.setattr(settings, "warmup_retry_seconds", 0.05)
+    monkeypatch.setattr(settings, "warmup_gold_paths", ["/api/v1/gold/metrics/no_such_metric"])
+    with TestClient(app) as client:
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert "404" in response.json()["error"]
+        assert client.get("/health").status_code == 200
+
+        monkeypatch.setattr(settings, "warmup_gold_paths", ["/api/v1/gold/metrics/hired_by_quarter"])
+        deadline = time.monotonic() + 5
+        while client.get("/ready").status_code != 200:
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+        assert warmup_state.attempts >= 2
+        assert warmup_state.error is None
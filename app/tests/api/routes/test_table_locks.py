@@ -0,0 +1,98 @@
+"""
+Tests for the staging table advisory locks of uploads and merges.
+"""
+
+import threading
+import time
+
+import pytest
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import engine, engines
+from app.core.table_locks import LOCK_NAMESPACE, lock_key, lock_conflicts
+from app.tests.api.routes.helpers import client, upload_file
+
+@pytest.fixture(scope="function")
+def hold_lock():
+    """Take the advisory lock of a staging table as another worker would; release it on exit."""
+    connection = engine.connect()
+
+    def take(table: str):
+        connection.execute(text("SELECT pg_advisory_lock(:namespace, :key)"), {"namespace": LOCK_NAMESPACE, "key": lock_key(table)})
+        connection.commit()
+        return lambda: connection.execute(text("SELECT pg_advisory_unlock_all()"))
+
+    yield take
+    connection.execute(text("SELECT pg_advisory_unlock_all()"))
+    connection.close()
+
+# Test lock keys are stable signed 32-bit integers, distinct per staging table
+def test_lock_key():
+    keys = {lock_key(table) for table in ("stg_departments", "stg_jobs", "stg_hired_employees")}
+    assert len(keys) == 3
+    assert all(-2**31 <= key < 2**31 for key in keys)
+    assert lock_key("stg_jobs") == lock_key("stg_jobs")
+
+# Test an upload to a locked staging table is rejected at once, while other tables still load
+def test_upload_conflict_rejected(test_db, hold_lock):
+    hold_lock("stg_departments")
+    rejected = lock_conflicts.value(table="stg_departments", operation="upload")
+
+    response = upload_file("departments", b"1,Sales\n")
+    assert response.status_code == 409
+    assert response.headers["retry-after"] == str(settings.table_lock_retry_after_seconds)
+    assert "stg_departments" in response.json()["detail"]["message"]
+    assert lock_conflicts.value(table="stg_departments", operation="upload") == rejected + 1
+
+    assert upload_file("jobs", b"1,Engineer\n").status_code == 201
+
+# Test the lock is released after a load, so the next load of the table goes through
+def test_lock_released_after_upload(test_db):
+    assert upload_file("departments", b"1,Sales\n").status_code == 201
+    assert upload_file("departments", b"2,Marketing\n").status_code == 201
+    with engine.connect() as connection:
+        held = connection.execute(
+            text("SELECT count(*) FROM pg_locks WHERE locktype = 'advisory' AND classid = :namespace"),
+            {"namespace": LOCK_NAMESPACE}
+        ).scalar()
+    assert held == 0
+
+# Test a merge waits for the running load of its source table, then merges its rows
+def test_merge_waits_for_load(test_db, hold_lock):
+    assert upload_file("departments", b"1,Sales\n").status_code == 201
+    release = hold_lock("stg_departments")
+    timer = threading.Timer(0.5, release)
+    timer.start()
+    started = time.monotonic()
+    response = client.post("/api/v1/silver/merge/dim_departments/merge")
+    timer.join()
+    assert response.status_code == 200
+    assert time.monotonic() - started >= 0.5
+
+# Test a queued merge does not hold a merge pool connection between its attempts
+def test_merge_wait_releases_pool_connection(test_db, hold_lock):
+    assert upload_file("departments", b"1,Sales\n").status_code == 201
+    release = hold_lock("stg_departments")
+    checked_out = []
+
+    def sample_then_release():
+        for _ in range(5):
+            time.sleep(0.05)
+            checked_out.append(engines["merge"].pool.checkedout())
+        release()
+
+    sampler = threading.Thread(target=sample_then_release)
+    sampler.start()
+    response = client.post("/api/v1/silver/merge/dim_departments/merge")
+    sampler.join()
+    assert response.status_code == 200
+    assert 0 in checked_out
+
+# Test a merge still blocked after its wait is rejected with Retry-After
+def test_merge_wait_exhausted(test_db, hold_lock, monkeypatch):
+    monkeypatch.setattr(settings, "merge_lock_wait_seconds", 0.2)
+    hold_lock("stg_jobs")
+    response = client.post("/api/v1/silver/merge/dim_jobs/merge")
+    assert response.status_code == 409
+    assert "retry-after" in response.headers
@@ -0,0 +1,63 @@
+"""
+Tests for the synthetic data generator and benchmark baselines, through the
+bronze upload and silver merge endpoints.
+"""
+
+import pytest
+
+from app.core.database import base, engine
+from app.tests.api.routes.helpers import client
+from benchmarks.pipeline import percentile, regressions
+from benchmarks.synthetic import generate
+
+@pytest.fixture(scope="function")
+def test_db():
+    """Create test database tables before each test and drop them after."""
+    base.metadata.create_all(bind=engine)
+    yield
+    base.metadata.drop_all(bind=engine)
+
+def upload(dataset, name: str):
+    with open(dataset.path(name), "rb") as csv_file:
+        response = client.post(
+            f"/api/v1/bronze/upload/{name}_csv/",
+            files={"file": (f"{name}.csv", csv_file, "text/csv")}
+        )
+    assert response.status_code == 201
+    return response.json()
+
+# Test the same seed writes the same files, in chunks or not
+def test_generate_is_deterministic(tmp_path):
+    first = generate(str(tmp_path / "first"), 2500, error_rate=0.1, seed=7)
+    second = generate(str(tmp_path / "second"), 2500, error_rate=0.1, seed=7, chunk_size=1000)
+    assert first.errors["departments"] == second.errors["departments"]
+    with open(first.path("departments")) as a, open(second.path("departments")) as b:
+        assert a.read() == b.read()
+    with open(first.path("hired_employees")) as hires:
+        assert sum(1 for _ in hires) == 2500
+    assert 150 < sum(first.errors["hired_employees"].values()) < 350
+
+# Test bronze rejects and silver skips exactly the rows generated as invalid
+def test_error_rate_matches_rejections(test_db, tmp_path):
+    dataset = generate(str(tmp_path), 2000, error_rate=0.05, seed=1)
+    for name in ("departments", "jobs", "hired_employees"):
+        assert len(upload(dataset, name)["errors"]) == dataset.bronze_rejected(name)
+    assert dataset.bronze_rejected("hired_employees") > 0
+
+    for table in ("dim_departments", "dim_jobs", "fact_hired_employees"):
+        response = client.post(f"/api/v1/silver/merge/{table}/merge")
+        assert response.status_code == 200
+    statistics = response.json()["statistics"]
+    assert statistics["final_count"] == dataset.silver_valid_hires()
+    assert statistics["invalid_records"] == (
+        dataset.errors["hired_employees"]["unknown_department"] + dataset.errors["hired_employees"]["unknown_job"]
+    )
+
+# Test rates regress when they drop and durations when they grow
+def test_regressions():
+    baseline = {"bronze.jobs.rows_per_second": 1000, "silver.dim_jobs.seconds": 1.0, "gold.x.p99_ms": 10}
+    current = {"bronze.jobs.rows_per_second": 700, "silver.dim_jobs.seconds": 0.5, "gold.x.p99_ms": 12, "new": 1}
+    found = regressions(baseline, current, tolerance=0.25)
+    assert len(found) == 1 and found[0].startswith("bronze.jobs.rows_per_second")
+    assert percentile([5, 1, 4, 2, 3], 50) == 3
+    assert percentile([5, 1, 4, 2, 3], 99) == 5
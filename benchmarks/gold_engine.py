@@ -0,0 +1,152 @@
+"""
+Benchmark of the gold engines: SQL queries vs the in-process columnar engine.
+
+Loads N synthetic hires into a scratch schema (gold_bench) of the configured
+database, then times both gold metrics for a whole year (served by the
+rollup cube in SQL) and for a partial date range (served by the fact
+table in SQL). For the columnar engine the one-off load time is reported
+separately from the per-query times.
+
+Usage:
+    python -m benchmarks.gold_engine --rows 1000000 10000000
+
+The gold_bench schema is dropped and recreated on every run; the application
+tables in the default schema are not touched.
+"""
+
+import argparse
+import io
+import statistics
+import time
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import base
+from app.api.models import *  # noqa: F401,F403 - register every table on base.metadata
+from app.api.routes.gold.metrics import (
+    MetricWindow, rollup_params,
+    HIRED_BY_QUARTER_AGG_SQL, HIRED_BY_QUARTER_RANGE_SQL,
+    DEPARTMENTS_ABOVE_MEAN_AGG_SQL, DEPARTMENTS_ABOVE_MEAN_RANGE_SQL
+)
+from app.api.services.columnar import ColumnarGoldEngine
+from app.api.services.fact_partitions import create_fact_partition
+from app.api.services.gold_aggregates import rebuild_gold_aggregates
+
+SCHEMA = "gold_bench"
+DEPARTMENTS = 12
+JOBS = 180
+FIRST_YEAR, LAST_YEAR = 2015, 2024
+COPY_BATCH_SIZE = 1000000
+
+WHOLE_YEAR = (datetime(2021, 1, 1), datetime(2022, 1, 1))
+DATE_RANGE = (datetime(2021, 3, 15), datetime(2021, 9, 15))
+
+def bench_engine(database_url: str):
+    """Engine whose connections resolve unqualified table names in the scratch schema."""
+    return create_engine(database_url, connect_args={"options": f"-csearch_path={SCHEMA}"})
+
+def load(engine, rows: int, seed: int = 0) -> None:
+    """Recreate the scratch schema and COPY rows synthetic hires into it."""
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    base.metadata.create_all(bind=engine)
+    with Session(bind=engine) as db:
+        for year in range(FIRST_YEAR, LAST_YEAR + 1):
+            create_fact_partition(db, year)
+        db.commit()
+
+    rng = np.random.default_rng(seed)
+    first = int(datetime(FIRST_YEAR, 1, 1).timestamp())
+    last = int(datetime(LAST_YEAR + 1, 1, 1).timestamp())
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.copy_expert(
+            "COPY dim_departments (id_department, department) FROM STDIN",
+            io.StringIO("".join(f"{i}\tDepartment {i}\n" for i in range(1, DEPARTMENTS + 1)))
+        )
+        cursor.copy_expert(
+            "COPY dim_jobs (id_job, job) FROM STDIN",
+            io.StringIO("".join(f"{i}\tJob {i}\n" for i in range(1, JOBS + 1)))
+        )
+        for offset in range(0, rows, COPY_BATCH_SIZE):
+            size = min(COPY_BATCH_SIZE, rows - offset)
+            hire = rng.integers(first, last, size).astype("datetime64[s]").astype(str)
+            department = rng.integers(1, DEPARTMENTS + 1, size)
+            job = rng.integers(1, JOBS + 1, size)
+            ids = np.arange(offset + 1, offset + size + 1)
+            lines = (
+                f"{i}\tEmployee {i}\t{h}\t{d}\t{j}\n"
+                for i, h, d, j in zip(ids.tolist(), hire.tolist(), department.tolist(), job.tolist())
+            )
+            cursor.copy_expert(
+                "COPY fact_hired_employees (id_employee, name, hire_datetime, id_department, id_job) FROM STDIN",
+                io.StringIO("".join(lines))
+            )
+        raw.commit()
+    finally:
+        raw.close()
+
+    with Session(bind=engine) as db:
+        rebuild_gold_aggregates(db)
+        db.commit()
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM ANALYZE"))
+
+def timed(function, repeat: int) -> float:
+    """Median wall time of function() in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+def run(engine, rows: int, repeat: int) -> None:
+    print(f"\n{rows:,} fact rows")
+    with Session(bind=engine) as db:
+        columnar = ColumnarGoldEngine()
+        load_ms = timed(lambda: columnar.load(db), 1)
+        print(f"  columnar load: {load_ms:,.0f} ms")
+
+        year = rollup_params(MetricWindow(WHOLE_YEAR[0].year, *WHOLE_YEAR))
+        window = {"start": DATE_RANGE[0], "end": DATE_RANGE[1]}
+        cases = [
+            ("hired_by_quarter, whole year", HIRED_BY_QUARTER_AGG_SQL, year,
+             lambda: columnar.hired_by_quarter(db, *WHOLE_YEAR)),
+            ("hired_by_quarter, date range", HIRED_BY_QUARTER_RANGE_SQL, window,
+             lambda: columnar.hired_by_quarter(db, *DATE_RANGE)),
+            ("departments_above_mean, whole year", DEPARTMENTS_ABOVE_MEAN_AGG_SQL, year,
+             lambda: columnar.departments_above_mean(db, *WHOLE_YEAR)),
+            ("departments_above_mean, date range", DEPARTMENTS_ABOVE_MEAN_RANGE_SQL, window,
+             lambda: columnar.departments_above_mean(db, *DATE_RANGE)),
+        ]
+        print(f"  {'query':<38}{'sql ms':>10}{'columnar ms':>14}")
+        for name, sql, params, columnar_query in cases:
+            sql_ms = timed(lambda: db.execute(text(sql), params).fetchall(), repeat)
+            columnar_ms = timed(columnar_query, repeat)
+            print(f"  {name:<38}{sql_ms:>10,.1f}{columnar_ms:>14,.1f}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000000, 10000000])
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query; the median is reported")
+    parser.add_argument("--database-url", default=settings.database_url)
+    args = parser.parse_args()
+
+    engine = bench_engine(args.database_url)
+    try:
+        for rows in args.rows:
+            load(engine, rows)
+            run(engine, rows, args.repeat)
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Load test of mixed read and write traffic against a running API.
+
+Replays a weighted mix of bronze uploads, silver merges and gold GETs at a
+target request rate with httpx's async client, then reports per endpoint
+the throughput, the error rate and the latency percentiles.
+
+Arrivals are open loop: requests are started on schedule whether or not
+earlier ones have finished, as dashboards and loaders do. Latency is
+measured from the scheduled start, so time spent waiting for a free
+connection (--concurrency) counts, and a slow server cannot hide its
+queueing by slowing the harness down.
+
+Scenarios:
+    upload  POST a hired employees CSV of --upload-rows rows to bronze
+    merge   POST the hired employees silver merge
+    gold    GET hired_by_quarter or departments_above_mean for a random year
+
+Usage:
+    python -m benchmarks.load --base-url http://localhost:8000 \\
+        --rate 50 --duration 60 --mix upload=1,merge=1,gold=18
+
+--setup first loads and merges departments and jobs, so the hires uploaded
+and merged by the run have valid foreign keys, and stages a first hires
+file, so merges started before any upload of the run find rows. Uploads
+and merges of the hires staging table take its advisory lock: overlapping
+uploads are answered 409 unless the server queues them
+(upload_lock_wait_seconds), and merges wait for the running upload.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import random
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.pipeline import percentile
+from benchmarks.synthetic import DEPARTMENTS, FIRST_YEAR, JOBS, LAST_YEAR
+
+DEFAULT_MIX = "upload=1,merge=1,gold=18"
+GOLD_PATHS = ("/api/v1/gold/metrics/hired_by_quarter", "/api/v1/gold/metrics/departments_above_mean")
+
+
+@dataclass
+class EndpointStats:
+    """
+    Outcome of the requests of one endpoint.
+
+    Attributes:
+        latencies_ms (List[float]): Scheduled start to response, per completed request
+        statuses (Dict[str, int]): Status code (or exception name) -> requests
+    """
+    latencies_ms: List[float] = field(default_factory=list)
+    statuses: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+
+    @property
+    def errors(self) -> int:
+        """Requests answered with a 4xx/5xx status or failed without a response."""
+        return sum(count for status, count in self.statuses.items() if not status.isdigit() or int(status) >= 400)
+
+    def summary(self, seconds: float) -> Dict[str, float]:
+        """Requests, throughput, error rate and latency percentiles over a run of seconds."""
+        requests = sum(self.statuses.values())
+        latencies = self.latencies_ms or [0.0]
+        return {
+            "requests": requests,
+            "throughput_rps": requests / seconds if seconds else 0.0,
+            "error_rate": self.errors / requests if requests else 0.0,
+            "p50_ms": percentile(latencies, 50),
+            "p90_ms": percentile(latencies, 90),
+            "p99_ms": percentile(latencies, 99),
+            "max_ms": max(latencies),
+            "statuses": dict(self.statuses),
+        }
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """Parse "upload=1,merge=1,gold=18" into scenario -> weight."""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario '{name}', use {', '.join(SCENARIOS)}")
+        weights[name] = float(weight or 1)
+    if not any(weights.values()):
+        raise ValueError("The mix needs at least one positive weight")
+    return weights
+
+
+def hires_csv(rows: int, rng: random.Random) -> bytes:
+    """A valid hired employees CSV of rows hires with random ids."""
+    first = rng.randint(1, 10000000)
+    return "".join(
+        f"{i},Employee {i},{rng.randint(FIRST_YEAR, LAST_YEAR)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T"
+        f"{rng.randint(0, 23):02d}:00:00Z,{rng.randint(1, DEPARTMENTS)},{rng.randint(1, JOBS)}\n"
+        for i in range(first, first + rows)
+    ).encode()
+
+
+async def upload(client: httpx.AsyncClient, rng: random.Random, options: argparse.Namespace):
+    body = hires_csv(options.upload_rows, rng)
+    return "POST /api/v1/bronze/upload/hired_employees_csv/", await client.post(
+        "/api/v1/bronze/upload/hired_employees_csv/",
+        files={"file": ("hired_employees.csv", io.BytesIO(body), "text/csv")},
+    )
+
+
+async def merge(client: httpx.AsyncClient, rng: random.Random, options: argparse.Namespace):
+    return "POST /api/v1/silver/merge/fact_hired_employees/merge", await client.post(
+        "/api/v1/silver/merge/fact_hired_employees/merge"
+    )
+
+
+async def gold(client: httpx.AsyncClient, rng: random.Random, options: argparse.Namespace):
+    path = rng.choice(GOLD_PATHS)
+    return f"GET {path}", await client.get(path, params={"year": rng.randint(FIRST_YEAR, LAST_YEAR)})
+
+
+SCENARIOS: Dict[str, Callable] = {"upload": upload, "merge": merge, "gold": gold}
+
+
+async def setup(client: httpx.AsyncClient) -> None:
+    """Load and merge every department and job id the generated hires use, and stage some hires."""
+    for name, label, count in (("departments", "Department", DEPARTMENTS), ("jobs", "Job", JOBS)):
+        body = "".join(f"{i},{label} {i}\n" for i in range(1, count + 1)).encode()
+        response = await client.post(
+            f"/api/v1/bronze/upload/{name}_csv/", files={"file": (f"{name}.csv", io.BytesIO(body), "text/csv")}
+        )
+        response.raise_for_status()
+        response = await client.post(f"/api/v1/silver/merge/dim_{name}/merge")
+        response.raise_for_status()
+    _, response = await upload(client, random.Random(), argparse.Namespace(upload_rows=100))
+    response.raise_for_status()
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    mix: Dict[str, float],
+    rate: float,
+    duration: float,
+    concurrency: int,
+    options: Optional[argparse.Namespace] = None,
+    seed: int = 0,
+) -> Dict[str, dict]:
+    """
+    Start requests of the mix at rate per second for duration seconds.
+
+    Args:
+        client: Client of the API, with its base URL (or ASGI transport) set
+        mix: Scenario -> weight, see parse_mix
+        rate: Requests started per second
+        duration: Seconds during which requests are started
+        concurrency: Requests in flight at most; later ones wait for a slot
+        options: Scenario options (upload_rows)
+        seed: Random seed of the scenario choice and request parameters
+
+    Returns:
+        Endpoint -> summary (see EndpointStats.summary), plus "total"
+    """
+    options = options or argparse.Namespace(upload_rows=1000)
+    rng = random.Random(seed)
+    names, weights = zip(*mix.items())
+    slots = asyncio.Semaphore(concurrency)
+    stats: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+    total = EndpointStats()
+
+    async def send(scenario: Callable, scheduled: float, request_rng: random.Random) -> None:
+        async with slots:
+            try:
+                endpoint, response = await scenario(client, request_rng, options)
+                status = str(response.status_code)
+            except httpx.HTTPError as exc:
+                endpoint, status = scenario.__name__, type(exc).__name__
+            latency = (time.perf_counter() - scheduled) * 1000
+        for target in (stats[endpoint], total):
+            target.statuses[status] += 1
+            target.latencies_ms.append(latency)
+
+    started = time.perf_counter()
+    tasks = []
+    for index in range(int(rate * duration)):
+        scheduled = started + index / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        scenario = SCENARIOS[rng.choices(names, weights)[0]]
+        tasks.append(asyncio.create_task(send(scenario, scheduled, random.Random(rng.random()))))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    report = {endpoint: endpoint_stats.summary(elapsed) for endpoint, endpoint_stats in sorted(stats.items())}
+    report["total"] = total.summary(elapsed)
+    report["total"]["target_rps"] = rate
+    report["total"]["seconds"] = elapsed
+    return report
+
+
+def print_report(report: Dict[str, dict]) -> None:
+    print(f"{'endpoint':<58}{'requests':>9}{'rps':>8}{'errors':>8}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for endpoint, summary in report.items():
+        print(
+            f"{endpoint:<58}{summary['requests']:>9}{summary['throughput_rps']:>8.1f}"
+            f"{summary['error_rate']:>8.1%}{summary['p50_ms']:>9.1f}{summary['p90_ms']:>9.1f}"
+            f"{summary['p99_ms']:>9.1f}{summary['max_ms']:>9.1f}"
+        )
+    for endpoint, summary in report.items():
+        failed = {status: count for status, count in summary["statuses"].items() if status not in ("200", "201", "304")}
+        if failed and endpoint != "total":
+            print(f"  {endpoint}: {failed}")
+
+
+async def main_async(args: argparse.Namespace) -> Dict[str, dict]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        if args.setup:
+            await setup(client)
+        return await run_load(client, parse_mix(args.mix), args.rate, args.duration, args.concurrency, args, args.seed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Scenario weights, e.g. upload=1,merge=1,gold=18")
+    parser.add_argument("--rate", type=float, default=20, help="Requests started per second")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds during which requests are started")
+    parser.add_argument("--concurrency", type=int, default=64, help="Requests in flight at most")
+    parser.add_argument("--upload-rows", type=int, default=1000, help="Hires per uploaded CSV")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds before a request fails")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--setup", action="store_true", help="Load departments and jobs first")
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as target:
+            json.dump(report, target, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Synthetic data generator for the bronze CSV uploads.
+
+Writes departments.csv, jobs.csv and hired_employees.csv in the format of
+the files in data/ (no header), at any scale, with a controllable share of
+invalid rows. Hires are generated and written in chunks, so 50M rows need
+no more memory than one chunk.
+
+Invalid hire rows are spread uniformly over the error kinds:
+
+    missing_value       an empty department id, as in data/ (bronze rejects it)
+    invalid_datetime    a date without time or zone (bronze rejects it)
+    column_count        a row missing its last column (bronze rejects it)
+    unknown_department  a department id absent from departments.csv (silver skips it)
+    unknown_job         a job id absent from jobs.csv (silver skips it)
+
+Invalid department and job rows (column_count) are extra lines with a third
+column, so every id 1..n of the dimensions still exists for the hires.
+
+Usage:
+    python -m benchmarks.synthetic --rows 1000000 --error-rate 0.02 --out /tmp/synthetic
+
+The same seed always produces the same files.
+"""
+
+import argparse
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict
+
+import numpy as np
+
+DEPARTMENTS = 12
+JOBS = 180
+FIRST_YEAR, LAST_YEAR = 2015, 2024
+CHUNK_SIZE = 1000000
+
+HIRE_ERRORS = ("missing_value", "invalid_datetime", "column_count", "unknown_department", "unknown_job")
+BRONZE_ERRORS = ("missing_value", "invalid_datetime", "column_count")
+
+
+@dataclass
+class SyntheticDataset:
+    """
+    Files written by generate() and what they contain.
+
+    Attributes:
+        directory (str): Directory holding the three CSV files
+        departments (int): Department ids, 1..departments
+        jobs (int): Job ids, 1..jobs
+        hires (int): Rows of hired_employees.csv, invalid ones included
+        errors (Dict[str, Dict[str, int]]): File name -> error kind -> invalid rows
+    """
+    directory: str
+    departments: int
+    jobs: int
+    hires: int
+    errors: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    def path(self, name: str) -> str:
+        """Path of the CSV file of a table, e.g. "hired_employees"."""
+        return os.path.join(self.directory, f"{name}.csv")
+
+    def bronze_rejected(self, name: str) -> int:
+        """Rows of a file the bronze upload rejects."""
+        return sum(count for kind, count in self.errors.get(name, {}).items() if kind in BRONZE_ERRORS)
+
+    def silver_valid_hires(self) -> int:
+        """Hires that reach fact_hired_employees (employee ids are unique)."""
+        return self.hires - sum(self.errors.get("hired_employees", {}).values())
+
+
+def _error_kinds(rng: np.random.Generator, size: int, error_rate: float, kinds: tuple) -> np.ndarray:
+    """Per row, -1 for a valid row or the index of its error kind in kinds."""
+    invalid = rng.random(size) < error_rate
+    return np.where(invalid, rng.integers(0, len(kinds), size), -1)
+
+
+def _write_dimension(path: str, label: str, size: int, error_rate: float, rng: np.random.Generator) -> int:
+    """Write ids 1..size named "<label> <id>" plus invalid lines; return the invalid lines written."""
+    kinds = _error_kinds(rng, size, error_rate, ("column_count",))
+    with open(path, "w", newline="") as output:
+        output.write("".join(
+            f"{i},{label} {i}\n" + (f"{i},{label} {i},unexpected\n" if kind >= 0 else "")
+            for i, kind in zip(range(1, size + 1), kinds.tolist())
+        ))
+    return int((kinds >= 0).sum())
+
+
+def generate(
+    directory: str,
+    rows: int,
+    error_rate: float = 0.0,
+    departments: int = DEPARTMENTS,
+    jobs: int = JOBS,
+    seed: int = 0,
+    chunk_size: int = CHUNK_SIZE,
+) -> SyntheticDataset:
+    """
+    Write the three CSV files of a synthetic load into directory.
+
+    Args:
+        directory: Output directory, created if missing
+        rows: Rows of hired_employees.csv
+        error_rate: Share of invalid rows in every file, between 0 and 1
+        departments: Department ids
+        jobs: Job ids
+        seed: Random seed
+        chunk_size: Hire rows generated and written at a time
+
+    Returns:
+        SyntheticDataset: The files and their invalid row counts
+    """
+    if not 0 <= error_rate <= 1:
+        raise ValueError("error_rate must be between 0 and 1")
+    os.makedirs(directory, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    dataset = SyntheticDataset(directory, departments, jobs, rows)
+
+    dataset.errors["departments"] = {
+        "column_count": _write_dimension(dataset.path("departments"), "Department", departments, error_rate, rng)
+    }
+    dataset.errors["jobs"] = {
+        "column_count": _write_dimension(dataset.path("jobs"), "Job", jobs, error_rate, rng)
+    }
+
+    first = int(datetime(FIRST_YEAR, 1, 1).timestamp())
+    last = int(datetime(LAST_YEAR + 1, 1, 1).timestamp())
+    counts = np.zeros(len(HIRE_ERRORS), dtype=np.int64)
+    with open(dataset.path("hired_employees"), "w", newline="") as output:
+        for offset in range(0, rows, chunk_size):
+            size = min(chunk_size, rows - offset)
+            ids = np.arange(offset + 1, offset + size + 1)
+            hires = np.char.add(rng.integers(first, last, size).astype("datetime64[s]").astype(str), "Z")
+            department = rng.integers(1, departments + 1, size).astype(str)
+            job = rng.integers(1, jobs + 1, size).astype(str)
+            kinds = _error_kinds(rng, size, error_rate, HIRE_ERRORS)
+            counts += np.bincount(kinds[kinds >= 0], minlength=len(HIRE_ERRORS))
+
+            department[kinds == HIRE_ERRORS.index("missing_value")] = ""
+            undated = kinds == HIRE_ERRORS.index("invalid_datetime")
+            hires[undated] = hires[undated].astype("U10")
+            department[kinds == HIRE_ERRORS.index("unknown_department")] = str(departments + 1)
+            job[kinds == HIRE_ERRORS.index("unknown_job")] = str(jobs + 1)
+            truncated = kinds == HIRE_ERRORS.index("column_count")
+
+            output.write("".join(
+                f"{i},Employee {i},{h},{d}\n" if short else f"{i},Employee {i},{h},{d},{j}\n"
+                for i, h, d, j, short in zip(
+                    ids.tolist(), hires.tolist(), department.tolist(), job.tolist(), truncated.tolist()
+                )
+            ))
+    dataset.errors["hired_employees"] = dict(zip(HIRE_ERRORS, counts.tolist()))
+    return dataset
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=10000, help="Rows of hired_employees.csv")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--departments", type=int, default=DEPARTMENTS, help="Department ids")
+    parser.add_argument("--jobs", type=int, default=JOBS, help="Job ids")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="Output directory")
+    args = parser.parse_args()
+
+    dataset = generate(args.out, args.rows, args.error_rate, args.departments, args.jobs, args.seed)
+    for name in ("departments", "jobs", "hired_employees"):
+        print(f"{dataset.path(name)}: {dataset.errors[name]}")
+
+
+if __name__ == "__main__":
+    main()
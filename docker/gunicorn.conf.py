@@ -0,0 +1,38 @@
+"""
+Gunicorn configuration of the production server.
+
+Runs the app in preforked Uvicorn workers, one event loop per process, so
+the API uses every core. Each worker imports the app after the fork and
+runs its lifespan startup, which warms the worker's pools and gold cache
+(app.core.warmup), before it accepts connections.
+
+SIGHUP is not a warm rolling restart: Gunicorn stops the old workers as
+soon as it has forked the new ones, before they are warm. Roll out at the
+container level instead: start the new container, send it traffic once
+GET /ready answers 200 (the image's HEALTHCHECK), then stop the old one.
+On SIGTERM its workers stop accepting connections and finish their
+requests for up to graceful_timeout.
+
+Settings come from the environment:
+    WEB_CONCURRENCY: Number of workers (default: one per CPU core)
+    PORT: Listening port (default: 8000)
+    WORKER_TIMEOUT: Seconds a worker may stay unresponsive before it is
+        restarted (default: 600, uploads and merges block the event loop)
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Engines, caches and metrics are per worker; nothing is created before the fork
+preload_app = False
+
+timeout = int(os.environ.get("WORKER_TIMEOUT", "600"))
+graceful_timeout = 60
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"